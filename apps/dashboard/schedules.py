@@ -0,0 +1,9 @@
+from datetime import timedelta
+
+from apps.jobs.scheduler import periodic
+from .stats import get_user_stats
+
+
+@periodic(every=timedelta(minutes=5))
+def refresh_dashboard_stats():
+    get_user_stats(refresh=True)
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth
+from django.utils import timezone
+
+from apps.user.models import User
+from apps.utils.metrics import record_cache_lookup
+
+
+USER_STATS_CACHE_KEY = 'dashboard:user_stats'
+
+
+def compute_user_stats():
+    now = timezone.now()
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    totals = User.objects.aggregate(
+        total_users=Count('id'),
+        current_month_signups=Count('id', filter=Q(created_at__gte=start_of_month)),
+        admins=Count('id', filter=Q(is_staff=True)),
+        supper_admins=Count('id', filter=Q(is_superuser=True)),
+    )
+    per_month = dict(
+        User.objects.filter(created_at__year=now.year)
+        .annotate(month=ExtractMonth('created_at'))
+        .values('month')
+        .annotate(count=Count('id'))
+        .values_list('month', 'count')
+        .order_by()
+    )
+    totals['data'] = [per_month.get(m, 0) for m in range(1, 13)]
+    return totals
+
+
+def get_user_stats(refresh=False):
+    """
+    User counts for the admin dashboard. The `refresh_dashboard_stats`
+    periodic task recomputes them, so page loads normally hit the cache.
+    """
+    stats = None if refresh else cache.get(USER_STATS_CACHE_KEY)
+    if not refresh:
+        record_cache_lookup("dashboard_user_stats", stats is not None)
+    if stats is None:
+        stats = compute_user_stats()
+        cache.set(USER_STATS_CACHE_KEY, stats, timeout=900)
+    return stats
@@ -0,0 +1,26 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from .models import Job, ScheduledTask
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    list_display = ("id", "name", "status", "priority", "attempts", "max_attempts", "run_at", "locked_by", "updated_at")
+    list_display_links = ("id", "name")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    # What a job runs is fixed by the code that queued it; staff can only
+    # reschedule, reprioritise or delete it.
+    readonly_fields = ("name", "args", "kwargs", "attempts", "locked_until", "locked_by", "last_error", "created_at", "updated_at")
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ScheduledTask)
+class ScheduledTaskAdmin(ModelAdmin):
+    list_display = ("name", "enabled", "interval_seconds", "last_started_at", "last_duration_ms", "last_status", "next_run_at")
+    list_filter = ("enabled", "last_status")
+    list_editable = ("enabled",)
+    search_fields = ("name", "last_error")
+    readonly_fields = ("name", "interval_seconds", "last_started_at", "last_duration_ms", "last_status", "last_error")
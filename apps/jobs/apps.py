@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.jobs'
+
+    def ready(self):
+        from .queue import discover_tasks
+        discover_tasks()
@@ -0,0 +1,36 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.jobs.scheduler import Scheduler, discover, run_due_tasks, sync_schedule
+
+
+class Command(BaseCommand):
+    help = "Run periodic tasks declared in each app's schedules.py."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tick", type=float, default=None, help="Seconds between checks for due tasks.")
+        parser.add_argument("--once", action="store_true", help="Run the tasks that are due now, then exit.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            discover()
+            sync_schedule()
+            ran = run_due_tasks()
+            self.stdout.write(self.style.SUCCESS(f"Ran {len(ran)} scheduled tasks."))
+            return
+
+        stop_event = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write("Stopping scheduler...")
+            stop_event.set()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, shutdown)
+            signal.signal(signal.SIGTERM, shutdown)
+
+        self.stdout.write(self.style.SUCCESS("Scheduler started."))
+        Scheduler(stop_event, tick=options["tick"] or settings.SCHEDULER_TICK).run()
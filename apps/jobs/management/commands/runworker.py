@@ -0,0 +1,53 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import Worker
+from apps.jobs.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = "Run background job workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Number of worker threads.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--visibility-timeout", type=int, default=None, help="Seconds before a running job may be reclaimed.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+        parser.add_argument("--with-scheduler", action="store_true", help="Also run periodic tasks in this process.")
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write("Stopping workers after their current job...")
+            stop_event.set()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, shutdown)
+            signal.signal(signal.SIGTERM, shutdown)
+
+        threads = []
+        for index in range(options["concurrency"]):
+            worker = Worker(
+                stop_event,
+                poll_interval=options["poll_interval"],
+                visibility_timeout=options["visibility_timeout"],
+                index=index,
+                exit_when_idle=options["once"],
+            )
+            thread = threading.Thread(target=worker.run, name=worker.name)
+            thread.start()
+            threads.append(thread)
+
+        if options["with_scheduler"] and not options["once"]:
+            scheduler = Scheduler(stop_event, tick=settings.SCHEDULER_TICK)
+            thread = threading.Thread(target=scheduler.run, name="scheduler")
+            thread.start()
+            threads.append(thread)
+
+        self.stdout.write(self.style.SUCCESS(f"Started {options['concurrency']} workers."))
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('interval_seconds', models.PositiveIntegerField()),
+                ('enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], max_length=20, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    # Registered task to call (see apps.jobs.queue.task), e.g. "apps.user.tasks.email_otp".
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.IntegerField(default=0, help_text='Higher runs first.')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    locked_by = models.CharField(max_length=255, blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_claim_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_visibility_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class ScheduledTask(models.Model):
+    """
+    Schedule and last-run record of a periodic task declared with
+    `apps.jobs.scheduler.periodic`. Rows are created by the scheduler.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=255, unique=True)
+    interval_seconds = models.PositiveIntegerField()
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    last_started_at = models.DateTimeField(blank=True, null=True)
+    last_duration_ms = models.PositiveIntegerField(blank=True, null=True)
+    last_status = models.CharField(max_length=20, choices=Status.choices, blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,224 @@
+"""
+DB-backed job queue. Jobs are rows in `Job`; workers claim them with
+SELECT ... FOR UPDATE SKIP LOCKED where the database supports it (PostgreSQL)
+and fall back to a conditional UPDATE on SQLite.
+
+Only functions registered with the `task` decorator can be queued or run.
+Apps declare them in a `tasks.py` module, which is discovered at startup.
+"""
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from apps.utils.db import use_primary
+from apps.utils.slow_queries import flush_slow_queries
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+# Names of tasks that send email, counted by the email_queue_depth metric.
+EMAIL_TASKS = set()
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def _job_name(func):
+    if isinstance(func, str):
+        return func
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def task(func=None, *, name=None, email=False):
+    """
+    Register the decorated function as a job the queue may run, under its
+    dotted path or `name`. Mark tasks that send email with `email=True`.
+    """
+    def decorator(func):
+        task_name = name or _job_name(func)
+        TASKS[task_name] = func
+        if email:
+            EMAIL_TASKS.add(task_name)
+        return func
+    return decorator(func) if func is not None else decorator
+
+
+def discover_tasks():
+    autodiscover_modules('tasks')
+    return TASKS
+
+
+def enqueue(func, *args, priority=0, run_at=None, max_attempts=None, unique=False, **kwargs):
+    """
+    Queue `func(*args, **kwargs)`. Arguments must be JSON serialisable.
+    Inside a transaction the job only becomes visible when it commits.
+
+    With `unique`, an identical job that is still queued or running is
+    returned instead of queueing another.
+    """
+    name = _job_name(func)
+    if name not in TASKS:
+        raise UnknownTask(f"{name} is not a registered task.")
+    if unique:
+        pending = Job.objects.filter(
+            name=name, args=list(args), kwargs=kwargs, status__in=[Job.Status.QUEUED, Job.Status.RUNNING],
+        ).first()
+        if pending is not None:
+            return pending
+    return Job.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def fail_exhausted_jobs(now=None):
+    """
+    Mark running jobs whose visibility timeout expired on their last
+    attempt as failed. Such a job most likely killed its worker (OOM,
+    SIGKILL), so running it again would only do that again.
+    """
+    now = now or timezone.now()
+    failed = Job.objects.filter(
+        status=Job.Status.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.Status.FAILED, locked_until=None,
+        last_error="Visibility timeout expired on the last attempt; the worker died or overran.",
+        updated_at=now,
+    )
+    if failed:
+        logger.error("Failed %s job(s) that timed out on their last attempt", failed)
+    return failed
+
+
+def claim_job(worker_name, visibility_timeout=None):
+    """
+    Lock the next runnable job for this worker, or return None.
+
+    Runnable means queued and due, or running with an expired visibility
+    timeout (its worker died or overran) and attempts left.
+    """
+    now = timezone.now()
+    visibility_timeout = visibility_timeout or settings.JOBS_VISIBILITY_TIMEOUT
+    fail_exhausted_jobs(now)
+    runnable = Q(status=Job.Status.QUEUED, run_at__lte=now) | Q(
+        status=Job.Status.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts'),
+    )
+
+    with transaction.atomic():
+        queryset = Job.objects.filter(runnable).order_by('-priority', 'run_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        job = queryset.first()
+        if job is None:
+            return None
+
+        # The status/attempts guard makes the claim safe without row locks.
+        claimed = Job.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts).update(
+            status=Job.Status.RUNNING,
+            attempts=job.attempts + 1,
+            locked_by=worker_name,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            updated_at=now,
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff with jitter: base * 2^(attempts-1), capped.
+    """
+    delay = min(settings.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def run_job(job):
+    """
+    Execute a claimed job and record the outcome. Returns True on success.
+    """
+    func = TASKS.get(job.name)
+    if func is None:
+        # Never retried: the row names something that isn't a task.
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.FAILED, locked_until=None, last_error=f"{job.name} is not a registered task.",
+            updated_at=timezone.now(),
+        )
+        logger.error("Job %s names unregistered task %s", job.pk, job.name)
+        return False
+
+    try:
+        func(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.QUEUED, run_at=run_at, locked_until=None, locked_by=None,
+                last_error=error, updated_at=timezone.now(),
+            )
+            logger.warning("Job %s (%s) failed, retry %s/%s at %s", job.pk, job.name, job.attempts, job.max_attempts, run_at)
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.FAILED, locked_until=None, last_error=error, updated_at=timezone.now(),
+            )
+            logger.error("Job %s (%s) failed permanently:\n%s", job.pk, job.name, error)
+        return False
+
+    # Arguments can hold secrets such as OTP codes, so finished rows are
+    # deleted unless JOBS_KEEP_SUCCEEDED is set.
+    if settings.JOBS_KEEP_SUCCEEDED:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.SUCCEEDED, args=[], kwargs={}, locked_until=None, updated_at=timezone.now(),
+        )
+    else:
+        Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+class Worker:
+    """
+    Claims and runs jobs until `stop_event` is set. One per thread.
+    """
+
+    def __init__(self, stop_event, poll_interval=1.0, visibility_timeout=None, index=0, exit_when_idle=False):
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.exit_when_idle = exit_when_idle
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def run(self):
+        # Jobs act on rows they were just handed; replica lag would hide them.
+        try:
+            with use_primary():
+                while not self.stop_event.is_set():
+                    job = claim_job(self.name, self.visibility_timeout)
+                    if job is None:
+                        if self.exit_when_idle:
+                            return
+                        self.stop_event.wait(self.poll_interval)
+                        continue
+                    run_job(job)
+                    flush_slow_queries()
+        finally:
+            connections.close_all()
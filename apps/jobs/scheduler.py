@@ -0,0 +1,163 @@
+"""
+Periodic maintenance scheduler.
+
+Apps declare tasks in a `schedules.py` module with the `periodic` decorator.
+Each due run is claimed with a conditional UPDATE on `ScheduledTask`, and on
+PostgreSQL the run is also guarded by a session advisory lock, so only one
+node executes a task at a time however many schedulers are running.
+"""
+import hashlib
+import logging
+import random
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import connection, connections
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from apps.utils.db import use_primary
+
+from .models import ScheduledTask
+
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+
+
+@dataclass
+class PeriodicTask:
+    name: str
+    func: callable
+    every: timedelta
+    jitter: timedelta
+
+    def next_run(self, now):
+        return now + self.every + timedelta(seconds=random.uniform(0, self.jitter.total_seconds()))
+
+
+def periodic(every, jitter=None, name=None):
+    """
+    Register the decorated function to run every `every`. Each run is
+    pushed back by up to `jitter` (default 10% of the interval) so tasks
+    declared with the same interval don't fire together.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        REGISTRY[task_name] = PeriodicTask(task_name, func, every, jitter if jitter is not None else every / 10)
+        return func
+    return decorator
+
+
+def discover():
+    autodiscover_modules('schedules')
+    return REGISTRY
+
+
+@contextmanager
+def advisory_lock(name):
+    """
+    Non-blocking PostgreSQL advisory lock; always granted on other backends.
+    """
+    if connection.vendor != 'postgresql':
+        yield True
+        return
+
+    key = int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'big', signed=True)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+
+def sync_schedule():
+    """
+    Create rows for newly declared tasks with a jittered first run, and
+    keep intervals in step with the code.
+    """
+    now = timezone.now()
+    existing = {row.name: row for row in ScheduledTask.objects.filter(name__in=REGISTRY)}
+    for task in REGISTRY.values():
+        interval = int(task.every.total_seconds())
+        row = existing.get(task.name)
+        if row is None:
+            ScheduledTask.objects.create(
+                name=task.name,
+                interval_seconds=interval,
+                next_run_at=now + timedelta(seconds=random.uniform(0, task.jitter.total_seconds())),
+            )
+        elif row.interval_seconds != interval:
+            ScheduledTask.objects.filter(pk=row.pk).update(interval_seconds=interval)
+
+
+def run_task(task):
+    started = timezone.now()
+    start = time.perf_counter()
+    status, error = ScheduledTask.Status.SUCCEEDED, None
+    try:
+        task.func()
+    except Exception:
+        status, error = ScheduledTask.Status.FAILED, traceback.format_exc()
+        logger.error("Scheduled task %s failed:\n%s", task.name, error)
+
+    ScheduledTask.objects.filter(name=task.name).update(
+        last_started_at=started,
+        last_duration_ms=int((time.perf_counter() - start) * 1000),
+        last_status=status,
+        last_error=error,
+    )
+    return status
+
+
+def run_due_tasks():
+    """
+    Run every registered task that is due and not claimed elsewhere.
+    Returns the names of the tasks this node ran.
+    """
+    with use_primary():
+        return _run_due_tasks()
+
+
+def _run_due_tasks():
+    now = timezone.now()
+    due = ScheduledTask.objects.filter(enabled=True, next_run_at__lte=now, name__in=REGISTRY).values_list('name', flat=True)
+
+    ran = []
+    for name in due:
+        task = REGISTRY[name]
+        with advisory_lock(f"scheduler:{name}") as acquired:
+            if not acquired:
+                continue
+            claimed = ScheduledTask.objects.filter(name=name, enabled=True, next_run_at__lte=now).update(
+                next_run_at=task.next_run(now),
+                last_status=ScheduledTask.Status.RUNNING,
+            )
+            if claimed:
+                run_task(task)
+                ran.append(name)
+    return ran
+
+
+class Scheduler:
+    def __init__(self, stop_event, tick=5.0):
+        self.stop_event = stop_event
+        self.tick = tick
+
+    def run(self):
+        discover()
+        sync_schedule()
+        try:
+            while not self.stop_event.is_set():
+                run_due_tasks()
+                self.stop_event.wait(self.tick)
+        finally:
+            connections.close_all()
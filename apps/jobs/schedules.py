@@ -0,0 +1,13 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+from .scheduler import periodic
+
+
+@periodic(every=timedelta(hours=6))
+def purge_finished_jobs():
+    cutoff = timezone.now() - timedelta(days=settings.JOBS_FAILED_RETENTION_DAYS)
+    Job.objects.filter(status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED], updated_at__lt=cutoff).delete()
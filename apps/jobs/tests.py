@@ -0,0 +1,175 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.jobs import scheduler
+from apps.jobs.models import Job, ScheduledTask
+from apps.jobs.queue import UnknownTask, claim_job, enqueue, run_job, task
+from apps.system_setting.models import AboutSystem, SystemColor
+from apps.user.models import User
+from apps.utils.metrics import queued_emails
+
+CALLS = []
+
+
+@task
+def record(value):
+    CALLS.append(value)
+
+
+@task
+def explode():
+    raise RuntimeError("boom")
+
+
+@task(email=True)
+def notify(user_id):
+    pass
+
+
+@task
+def purge_mailbox_exports():
+    pass
+
+
+class RunWorkerCommandTests(TransactionTestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_drains_due_jobs_by_priority(self):
+        enqueue(record, "low")
+        enqueue(record, "high", priority=10)
+        enqueue(record, "later", run_at=timezone.now() + timedelta(hours=1))
+
+        call_command("runworker", concurrency=1, once=True, stdout=StringIO())
+
+        self.assertEqual(CALLS, ["high", "low"])
+        self.assertEqual(list(Job.objects.values_list("args", flat=True)), [["later"]])
+
+
+@override_settings(JOBS_RETRY_BASE_DELAY=10, JOBS_RETRY_MAX_DELAY=60, JOBS_KEEP_SUCCEEDED=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_failed_job_backs_off_then_fails(self):
+        job = enqueue(explode, max_attempts=2)
+
+        self.assertFalse(run_job(claim_job("w")))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=4))
+        self.assertIn("boom", job.last_error)
+        self.assertIsNone(claim_job("w"))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.assertFalse(run_job(claim_job("w")))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_expired_visibility_timeout_is_reclaimed(self):
+        job = enqueue(record, "x")
+        self.assertEqual(claim_job("dead-worker").pk, job.pk)
+        self.assertIsNone(claim_job("other"))
+
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_job("other")
+        self.assertEqual(reclaimed.locked_by, "other")
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_expired_job_on_last_attempt_is_failed_not_reclaimed(self):
+        job = enqueue(record, "x", max_attempts=1)
+        self.assertEqual(claim_job("dead-worker").pk, job.pk)
+
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(claim_job("other"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("Visibility timeout expired", job.last_error)
+
+    def test_email_queue_depth_counts_tasks_marked_email(self):
+        enqueue(notify, 1)
+        enqueue(purge_mailbox_exports)
+
+        self.assertEqual(queued_emails(), {(): 1})
+
+    def test_only_registered_tasks_run(self):
+        with self.assertRaises(UnknownTask):
+            enqueue("os.system", "true")
+
+        job = Job.objects.create(name="os.system", args=["true"])
+        self.assertFalse(run_job(claim_job("w")))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("not a registered task", job.last_error)
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+        self.registry = dict(scheduler.REGISTRY)
+        scheduler.REGISTRY.clear()
+        scheduler.periodic(every=timedelta(minutes=10), jitter=timedelta(minutes=1), name="record")(lambda: record("tick"))
+        scheduler.periodic(every=timedelta(minutes=10), name="explode")(explode)
+        scheduler.sync_schedule()
+
+    def tearDown(self):
+        scheduler.REGISTRY.clear()
+        scheduler.REGISTRY.update(self.registry)
+
+    def test_first_run_is_jittered_within_window(self):
+        task = ScheduledTask.objects.get(name="record")
+        self.assertEqual(task.interval_seconds, 600)
+        self.assertLessEqual(task.next_run_at, timezone.now() + timedelta(minutes=1))
+
+    def test_due_task_runs_once_and_records_outcome(self):
+        ScheduledTask.objects.update(next_run_at=timezone.now())
+
+        self.assertCountEqual(scheduler.run_due_tasks(), ["record", "explode"])
+        self.assertEqual(scheduler.run_due_tasks(), [])
+        self.assertEqual(CALLS, ["tick"])
+
+        ok = ScheduledTask.objects.get(name="record")
+        self.assertEqual(ok.last_status, ScheduledTask.Status.SUCCEEDED)
+        self.assertIsNotNone(ok.last_duration_ms)
+        self.assertGreaterEqual(ok.next_run_at, timezone.now() + timedelta(minutes=9))
+        failed = ScheduledTask.objects.get(name="explode")
+        self.assertEqual(failed.last_status, ScheduledTask.Status.FAILED)
+        self.assertIn("boom", failed.last_error)
+
+    def test_disabled_task_is_skipped(self):
+        ScheduledTask.objects.update(next_run_at=timezone.now())
+        ScheduledTask.objects.filter(name="explode").update(enabled=False)
+
+        self.assertEqual(scheduler.run_due_tasks(), ["record"])
+
+    def test_apps_declare_schedules(self):
+        scheduler.REGISTRY.update(self.registry)
+        names = scheduler.discover()
+        self.assertIn("apps.user.schedules.purge_expired_otps", names)
+        self.assertIn("apps.dashboard.schedules.refresh_dashboard_stats", names)
+        self.assertIn("apps.system_setting.schedules.warm_about_system", names)
+
+
+class JobAdminTests(TestCase):
+    def test_sidebar_links_to_jobs_and_schedules(self):
+        # The admin's title and colours come from these settings.
+        AboutSystem.objects.create(name="Starter", title="Starter", email="info@example.com", copyright="Starter", description="Starter kit")
+        SystemColor.objects.create(name="Blue", code="#0000ff")
+        self.addCleanup(cache.clear)
+        admin = User.objects.create_superuser(email="admin@example.com", password="password123", term_and_condition_accepted=True)
+        self.client.force_login(admin)
+
+        page = self.client.get(reverse("admin:index")).content.decode()
+
+        self.assertIn(reverse("admin:jobs_job_changelist"), page)
+        self.assertIn(reverse("admin:jobs_scheduledtask_changelist"), page)
+        self.assertEqual(self.client.get(reverse("admin:jobs_scheduledtask_changelist")).status_code, 200)
@@ -0,0 +1,142 @@
+"""
+Local verification of Google ID tokens against an in-process JWKS cache.
+"""
+import logging
+import re
+import threading
+import time
+
+import jwt
+import requests
+from django.conf import settings
+
+from apps.utils.http_client import get_http_client
+
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ['https://accounts.google.com', 'accounts.google.com']
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+class GoogleTokenError(Exception):
+    pass
+
+
+class JWKSCache:
+    """
+    Signing keys keyed by `kid`.
+
+    Keys live for the endpoint's Cache-Control max-age. Once inside
+    `refresh_margin` seconds of expiry, a background thread refetches them
+    while lookups keep using the current set. An unknown `kid` forces one
+    synchronous refetch, rate limited to `min_refetch_interval`. Synchronous
+    fetches are serialized, so concurrent lookups that find the keys expired
+    wait for a single request instead of each fetching.
+    """
+
+    def __init__(self, url, refresh_margin=300, default_max_age=3600, min_refetch_interval=60):
+        self.url = url
+        self.refresh_margin = refresh_margin
+        self.default_max_age = default_max_age
+        self.min_refetch_interval = min_refetch_interval
+        self.keys = {}
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self.lock = threading.Lock()
+        self.fetch_lock = threading.Lock()
+        self.refreshing = False
+
+    def load_keys(self, jwks, max_age=None):
+        """
+        Replace the key set, e.g. from the endpoint or a local fixture.
+        """
+        keys = {}
+        for data in jwks.get('keys', []):
+            try:
+                keys[data['kid']] = jwt.PyJWK(data)
+            except (KeyError, jwt.PyJWKError):
+                logger.warning('Skipping unusable JWK %s', data.get('kid'))
+        now = time.monotonic()
+        with self.lock:
+            self.keys = keys
+            self.fetched_at = now
+            self.expires_at = now + (self.default_max_age if max_age is None else max_age)
+
+    def fetch(self):
+        response = get_http_client().get(self.url)
+        response.raise_for_status()
+        match = MAX_AGE_PATTERN.search(response.headers.get('Cache-Control', ''))
+        self.load_keys(response.json(), int(match.group(1)) if match else None)
+
+    def refetch(self, needed):
+        """
+        Fetch unless another thread already did while this one waited.
+        """
+        with self.fetch_lock:
+            if needed():
+                self.fetch()
+
+    def _background_refresh(self):
+        try:
+            with self.fetch_lock:
+                self.fetch()
+        except (requests.RequestException, ValueError):
+            logger.warning('Background JWKS refresh from %s failed', self.url, exc_info=True)
+        finally:
+            self.refreshing = False
+
+    def get_key(self, kid):
+        now = time.monotonic()
+
+        if now >= self.expires_at:
+            self.refetch(lambda: time.monotonic() >= self.expires_at)
+        elif now >= self.expires_at - self.refresh_margin:
+            with self.lock:
+                start = not self.refreshing
+                self.refreshing = True
+            if start:
+                threading.Thread(target=self._background_refresh, daemon=True).start()
+
+        key = self.keys.get(kid)
+        if key is None and now - self.fetched_at >= self.min_refetch_interval:
+            # Google rotated keys before our copy expired.
+            self.refetch(lambda: kid not in self.keys and time.monotonic() - self.fetched_at >= self.min_refetch_interval)
+            key = self.keys.get(kid)
+        if key is None:
+            raise GoogleTokenError('Unknown signing key.')
+        return key
+
+
+_jwks_cache = None
+
+
+def get_jwks_cache():
+    global _jwks_cache
+    if _jwks_cache is None:
+        _jwks_cache = JWKSCache(settings.GOOGLE_JWKS_URL, refresh_margin=settings.GOOGLE_JWKS_REFRESH_MARGIN)
+    return _jwks_cache
+
+
+def verify_google_id_token(id_token):
+    """
+    Verify signature, audience, issuer and expiry locally and return the claims.
+    Network errors while loading keys propagate as requests.RequestException.
+    """
+    try:
+        header = jwt.get_unverified_header(id_token)
+        key = get_jwks_cache().get_key(header.get('kid'))
+        claims = jwt.decode(
+            id_token,
+            key.key,
+            algorithms=['RS256'],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            options={'require': ['exp', 'iat', 'iss', 'aud', 'sub']},
+        )
+    except jwt.PyJWTError as e:
+        raise GoogleTokenError(f'Invalid Google ID token: {e}')
+
+    if not claims.get('email_verified'):
+        raise GoogleTokenError('Google account email is not verified.')
+    return claims
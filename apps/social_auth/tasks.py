@@ -0,0 +1,63 @@
+import logging
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+
+from apps.jobs.queue import task
+from apps.user.models import User
+from apps.utils.http_client import get_http_client
+
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarTooLarge(Exception):
+    pass
+
+
+def download_limited(url, max_bytes):
+    """
+    Stream `url` into memory, giving up as soon as it exceeds max_bytes.
+    """
+    with get_http_client().get(url, stream=True) as response:
+        response.raise_for_status()
+        if int(response.headers.get('Content-Length') or 0) > max_bytes:
+            raise AvatarTooLarge(url)
+
+        chunks, size = [], 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise AvatarTooLarge(url)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+
+@task
+def import_google_avatar(user_id, picture_url):
+    """
+    Import a Google profile picture through the avatar pipeline.
+
+    Skipped when the user uploaded their own avatar or when the picture
+    URL is the one already imported.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    if user.avatar and (not user.avatar_source or user.avatar_source == picture_url):
+        return
+
+    try:
+        content = download_limited(picture_url, settings.SOCIAL_AVATAR_MAX_BYTES)
+    except (requests.RequestException, AvatarTooLarge):
+        logger.warning("Could not import Google avatar for user %s", user_id, exc_info=True)
+        return
+
+    user.avatar = ContentFile(content, name='google.jpg')
+    user.avatar_source = picture_url
+    try:
+        user.save(update_fields=['avatar', 'avatar_source'])
+    except ValidationError:
+        logger.warning("Google avatar for user %s is not a usable image", user_id)
@@ -1,3 +1,262 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+import jwt
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+import io
+import shutil
+import tempfile
+
+from PIL import Image
+
+from apps.jobs.models import Job
+from apps.user.models import User
+from apps.social_auth.tasks import import_google_avatar
+from apps.utils.http_client import CircuitOpenError, HTTPClient
+from apps.social_auth.google import GoogleTokenError, JWKSCache, get_jwks_cache
+
+
+SIGNING_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+JWKS = {'keys': [{**json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(SIGNING_KEY.public_key())), 'kid': 'test-key', 'alg': 'RS256', 'use': 'sig'}]}
+
+
+def make_id_token(**claims):
+    now = int(time.time())
+    payload = {
+        'iss': 'https://accounts.google.com',
+        'aud': 'test-client-id',
+        'sub': '1234567890',
+        'email': 'google@example.com',
+        'email_verified': True,
+        'iat': now,
+        'exp': now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, SIGNING_KEY, algorithm='RS256', headers={'kid': 'test-key'})
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        if self.path == '/slow':
+            time.sleep(0.5)
+        if self.path == '/error':
+            return self.reply(500, {})
+        if self.path.startswith('/picture'):
+            self.server.picture_requests += 1
+            buffer = io.BytesIO()
+            size = 1000 if self.path == '/picture-huge' else 300
+            Image.new('RGB', (size, size), 'blue').save(buffer, format='PNG' if size < 1000 else 'BMP')
+            return self.reply_bytes(200, buffer.getvalue(), 'image/png')
+        if self.path.startswith('/certs'):
+            self.server.certs_requests += 1
+            if self.path == '/certs-slow':
+                time.sleep(0.2)
+            return self.reply(200, JWKS, {'Cache-Control': 'public, max-age=600'})
+        if self.path == '/userinfo':
+            if self.headers.get('Authorization') != 'Bearer good-token':
+                return self.reply(401, {})
+            return self.reply(200, {'email': 'google@example.com', 'name': 'Google User'})
+        self.reply(200, {'ok': True})
+
+    def reply(self, code, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_bytes(self, code, body, content_type):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that time out close the socket before the stub replies.
+        pass
+
+
+class StubServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubServer(('127.0.0.1', 0), StubHandler)
+        cls.server.client_ports = set()
+        cls.server.picture_requests = 0
+        cls.server.certs_requests = 0
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+
+class HTTPClientTests(StubServerMixin, SimpleTestCase):
+    def setUp(self):
+        self.server.client_ports.clear()
+
+    def test_connections_are_reused(self):
+        client = HTTPClient()
+        for _ in range(5):
+            self.assertEqual(client.get(f'{self.base_url}/ok').status_code, 200)
+
+        self.assertEqual(len(self.server.client_ports), 1)
+        self.assertEqual(client.get_stats()[self.base_url[7:]]['requests'], 5)
+
+    def test_read_timeout(self):
+        client = HTTPClient(read_timeout=0.1)
+        with self.assertRaises(requests.Timeout):
+            client.get(f'{self.base_url}/slow')
+
+    def test_circuit_opens_after_failures(self):
+        client = HTTPClient(failure_threshold=2, reset_timeout=60)
+        client.get(f'{self.base_url}/error')
+        client.get(f'{self.base_url}/error')
+
+        with self.assertRaises(CircuitOpenError):
+            client.get(f'{self.base_url}/ok')
+        self.assertEqual(client.get_stats()[self.base_url[7:]]['rejected'], 1)
+
+
+class GoogleAuthViewTests(StubServerMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='google@example.com', password='x', term_and_condition_accepted=True)
+        self.url = reverse('google-auth')
+
+    def test_existing_user_signs_in(self):
+        with override_settings(GOOGLE_USERINFO_URL=f'{self.base_url}/userinfo'):
+            response = self.client.post(self.url, {'access_token': 'good-token'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['user']['email'], 'google@example.com')
+
+    def test_rejected_token(self):
+        with override_settings(GOOGLE_USERINFO_URL=f'{self.base_url}/userinfo'):
+            response = self.client.post(self.url, {'access_token': 'bad-token'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JWKSCacheTests(StubServerMixin, SimpleTestCase):
+    def test_keys_expire_per_cache_control(self):
+        cache = JWKSCache(f'{self.base_url}/certs', refresh_margin=60)
+        self.assertIsNotNone(cache.get_key('test-key'))
+        self.assertAlmostEqual(cache.expires_at - cache.fetched_at, 600, delta=1)
+
+    def test_unknown_kid_is_rejected_without_refetch_storm(self):
+        cache = JWKSCache(f'{self.base_url}/certs')
+        cache.load_keys(JWKS, max_age=600)
+        with self.assertRaises(GoogleTokenError):
+            cache.get_key('other-key')
+
+    def test_expired_keys_are_fetched_once_by_concurrent_lookups(self):
+        cache = JWKSCache(f'{self.base_url}/certs-slow')
+        cache.load_keys(JWKS, max_age=0)
+        self.server.certs_requests = 0
+        threads = [threading.Thread(target=cache.get_key, args=('test-key',)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.server.certs_requests, 1)
+
+
+@override_settings(GOOGLE_CLIENT_ID='test-client-id')
+class GoogleIDTokenTests(APITestCase):
+    def setUp(self):
+        # Keys come from the local fixture, so no request leaves the process.
+        get_jwks_cache().load_keys(JWKS, max_age=3600)
+        self.user = User.objects.create_user(email='google@example.com', password='x', term_and_condition_accepted=True)
+        self.url = reverse('google-auth')
+
+    def test_valid_id_token_signs_in(self):
+        response = self.client.post(self.url, {'id_token': make_id_token()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['user']['email'], 'google@example.com')
+
+    def test_new_user_is_created_and_avatar_import_queued(self):
+        token = make_id_token(email='new@example.com', name='New User', picture='https://example.com/p.jpg')
+        response = self.client.post(self.url, {'id_token': token})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = User.objects.get(email='new@example.com')
+        self.assertEqual(user.full_name, 'New User')
+        self.assertTrue(hasattr(user, 'user_profile'))
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'apps.social_auth.tasks.import_google_avatar')
+        self.assertEqual(job.args, [user.id, 'https://example.com/p.jpg'])
+
+        # Signing in again before the worker ran queues nothing new.
+        self.client.post(self.url, {'id_token': token})
+        self.assertEqual(Job.objects.get().pk, job.pk)
+
+    def test_wrong_audience_is_rejected(self):
+        response = self.client.post(self.url, {'id_token': make_id_token(aud='someone-else')})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token_is_rejected(self):
+        response = self.client.post(self.url, {'id_token': make_id_token(exp=int(time.time()) - 10)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SOCIAL_AVATAR_MAX_BYTES=1024 * 1024)
+class ImportGoogleAvatarTests(StubServerMixin, TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.server.picture_requests = 0
+        self.user = User.objects.create_user(email='google@example.com', password='x', term_and_condition_accepted=False)
+
+    def test_imports_through_avatar_pipeline_once_per_url(self):
+        url = f'{self.base_url}/picture'
+        import_google_avatar(self.user.id, url)
+        import_google_avatar(self.user.id, url)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar_source, url)
+        self.assertEqual(set(self.user.avatar_variants), {'48', '128', '512'})
+        self.assertEqual(self.server.picture_requests, 1)
+
+    def test_oversized_download_is_dropped(self):
+        import_google_avatar(self.user.id, f'{self.base_url}/picture-huge')
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.avatar)
+
+    def test_own_upload_is_kept(self):
+        User.objects.filter(pk=self.user.pk).update(avatar='avatars/own.png')
+        import_google_avatar(self.user.id, f'{self.base_url}/picture')
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.avatar.name, 'avatars/own.png')
+        self.assertEqual(self.server.picture_requests, 0)
@@ -1,39 +1,56 @@
 import requests
-from django.core.files.base import ContentFile
+from django.conf import settings
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.user.models import User, UserProfile
 from apps.utils.helpers import error
-from uuid import uuid4
+from apps.jobs.queue import enqueue
 import secrets
 
 from apps.user.serializers import CustomRefreshToken
 from apps.user.utils import get_user_agent_hash, create_hybrid_auth_response
+from apps.utils.http_client import get_http_client
+from apps.utils.query_budget import query_budget
+from .google import GoogleTokenError, verify_google_id_token
+from .tasks import import_google_avatar
 
+@query_budget(7)
 class GoogleAuthView(APIView):
     permission_classes = [AllowAny]  
 
     def post(self, request):
+        id_token = request.data.get('id_token')
         access_token = request.data.get('access_token')
-        if not access_token:
-            return error("Access token is required", status_code=status.HTTP_400_BAD_REQUEST)
+        if not id_token and not access_token:
+            return error("ID token or access token is required", status_code=status.HTTP_400_BAD_REQUEST)
 
-        user_info_url = "https://www.googleapis.com/oauth2/v3/userinfo"
-        response = requests.get(
-            user_info_url,
-            headers={'Authorization': f'Bearer {access_token}'}
-        )
+        if id_token:
+            # Verified locally against cached Google signing keys, no round trip.
+            try:
+                user_info = verify_google_id_token(id_token)
+            except GoogleTokenError as e:
+                return error(str(e), status_code=status.HTTP_400_BAD_REQUEST)
+            except requests.RequestException:
+                return error("Google is unavailable, please try again.", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        else:
+            try:
+                response = get_http_client().get(
+                    settings.GOOGLE_USERINFO_URL,
+                    headers={'Authorization': f'Bearer {access_token}'}
+                )
+            except requests.RequestException:
+                return error("Google is unavailable, please try again.", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+            if response.status_code != 200:
+                return error("Failed to fetch user info from Google", status_code=status.HTTP_400_BAD_REQUEST)
 
-        if response.status_code != 200:
-            return error("Failed to fetch user info from Google", status_code=status.HTTP_400_BAD_REQUEST)
+            user_info = response.json()
 
-        user_info = response.json()
         email = user_info.get('email')
         name = user_info.get('name')
-        given_name = user_info.get('given_name')  
-        family_name = user_info.get('family_name')  
         picture = user_info.get('picture') 
 
         if not email:
@@ -45,22 +62,20 @@ class GoogleAuthView(APIView):
         except User.DoesNotExist:
             # Generate secure random password for social auth users
             random_password = secrets.token_urlsafe(32)
-            user = User.objects.create_user(
-                email=email,
-                password=random_password
-            )
-            if picture:
-                image_response = requests.get(picture)
-                if image_response.status_code == 200:
-                    file_name = f"profile_{uuid4().hex}.jpg"  
-                    if hasattr(user, 'avatar'):
-                        user.avatar.save(file_name, ContentFile(image_response.content))
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=email,
+                    password=random_password,
+                    full_name=name,
+                    term_and_condition_accepted=False,
+                )
+                UserProfile.objects.create(user=user)
 
-            UserProfile.objects.create(
-                user=user,
-                first_name=given_name,
-                last_name=family_name
-            )
+        # The picture is fetched and resized off the login path, and only
+        # when it is new: own uploads and unchanged URLs are left alone, and
+        # logins before the worker gets to it don't queue it again.
+        if picture and (not user.avatar or (user.avatar_source and user.avatar_source != picture)):
+            enqueue(import_google_avatar, user.id, picture, unique=True)
         
         # Get user agent hash for token binding (security feature)
         user_agent_hash = get_user_agent_hash(request)
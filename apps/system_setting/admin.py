@@ -1,8 +1,12 @@
 from django import forms
 from django.contrib import admin
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
-from .models import AboutSystem, DynamicPages, SMTPSetting, SocialMedia, SystemColor
+from apps.utils.profiler import render_stats
+from .models import AboutSystem, DynamicPages, ProfilerSetting, RequestProfile, SlowQuery, SMTPSetting, SocialMedia, SystemColor
 @admin.register(AboutSystem)
 
 class AboutSystemAdmin(ModelAdmin):
@@ -79,3 +83,101 @@ class SystemColorAdmin(ModelAdmin):
     list_display_links = ("id", "name", "code",)
 
 
+@admin.register(ProfilerSetting)
+class ProfilerSettingAdmin(ModelAdmin):
+    list_display = ("id", "enabled", "sample_percent", "path_prefix",)
+    list_display_links = ("id",)
+    list_editable = ("enabled", "sample_percent", "path_prefix",)
+
+    def has_add_permission(self, request):
+        # Asked more than once per admin page (app list and sidebar).
+        if not hasattr(request, "_profiler_setting_exists"):
+            request._profiler_setting_exists = ProfilerSetting.objects.exists()
+        return not request._profiler_setting_exists
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(ModelAdmin):
+    list_display = ("created_at", "method", "path", "status_code", "duration_ms", "trigger", "size", "download_link",)
+    list_display_links = ("created_at", "path",)
+    list_filter = ("trigger", "method", "view_name",)
+    search_fields = ("path", "view_name",)
+    readonly_fields = ("method", "path", "view_name", "status_code", "duration_ms", "trigger", "size", "created_at", "download_link", "top_functions",)
+    exclude = ("file",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path("<int:pk>/download/", self.admin_site.admin_view(self.download_view), name="system_setting_requestprofile_download"),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        return FileResponse(profile.file.open("rb"), as_attachment=True, filename=f"profile-{profile.pk}.prof")
+
+    def delete_queryset(self, request, queryset):
+        # One by one, so each profile's file is removed too.
+        for profile in queryset:
+            profile.delete()
+
+    @admin.display(description="Profile")
+    def download_link(self, obj):
+        return format_html('<a href="{}">Download .prof</a>', reverse("admin:system_setting_requestprofile_download", args=[obj.pk]))
+
+    @admin.display(description="Top functions (cumulative)")
+    def top_functions(self, obj):
+        try:
+            return format_html("<pre>{}</pre>", render_stats(obj.file))
+        except (OSError, ValueError, EOFError):
+            return "Profile file is missing or unreadable."
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(ModelAdmin):
+    list_display = ("short_sql", "calls", "total_ms", "avg_ms_display", "max_ms", "alias", "last_seen", "has_plan",)
+    list_display_links = ("short_sql",)
+    list_filter = ("alias",)
+    search_fields = ("normalized_sql", "call_site", "fingerprint",)
+    ordering = ("-total_ms",)
+    fields = ("fingerprint", "alias", "calls", "total_ms", "max_ms", "last_ms", "first_seen", "last_seen", "params_fingerprint",
+              "normalized_sql_pre", "example_sql_pre", "call_site_pre", "explain_pre", "explained_at",)
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Query")
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+
+    @admin.display(description="Avg ms", ordering="total_ms")
+    def avg_ms_display(self, obj):
+        return round(obj.avg_ms, 1)
+
+    @admin.display(description="Plan", boolean=True)
+    def has_plan(self, obj):
+        return bool(obj.explain)
+
+    @admin.display(description="Normalized SQL")
+    def normalized_sql_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.normalized_sql)
+
+    @admin.display(description="Last SQL")
+    def example_sql_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.example_sql)
+
+    @admin.display(description="Call site")
+    def call_site_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.call_site)
+
+    @admin.display(description="EXPLAIN")
+    def explain_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.explain or "No plan sampled yet.")
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class SystemSettingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.system_setting'
+
+    def ready(self):
+        # Connect the connection_created hooks (connection stats, statement
+        # timeouts, query timing, slow-query capture) before the first
+        # connection is opened.
+        from apps.utils import db, slow_queries, timing  # noqa: F401
@@ -0,0 +1,40 @@
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from apps.utils.benchmark import benchmark
+from apps.utils.custom_exception import custom_exception_handler
+from apps.utils.helpers import error, success
+
+
+PROFILE = {"user_id": 1, "email": "bench@example.invalid", "full_name": "Bench User", "avatar": None, "phone": "0123456789", "dob": None}
+
+
+@benchmark("envelope.success")
+def success_envelope():
+    renderer = JSONRenderer()
+    return lambda: renderer.render(success(data=PROFILE, message="Profile get successfully.").data)
+
+
+@benchmark("envelope.error")
+def error_envelope():
+    renderer = JSONRenderer()
+    errors = {"email": ["This field is required."], "password": ["This field is required."]}
+    return lambda: renderer.render(error(message="Signup failed.", errors=errors).data)
+
+
+@benchmark("exception_handler.validation")
+def validation_error():
+    context = {"view": None, "request": None}
+    return lambda: custom_exception_handler(ValidationError({"email": ["This field is required."]}), context)
+
+
+@benchmark("exception_handler.not_authenticated")
+def not_authenticated():
+    context = {"view": None, "request": None}
+    return lambda: custom_exception_handler(NotAuthenticated(), context)
+
+
+@benchmark("exception_handler.unhandled")
+def unhandled_error():
+    context = {"view": None, "request": None}
+    return lambda: custom_exception_handler(ValueError("boom"), context)
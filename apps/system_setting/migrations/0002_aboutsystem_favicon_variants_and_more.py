@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:26
+
+import apps.utils.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_setting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutsystem',
+            name='favicon_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='aboutsystem',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='aboutsystem',
+            name='favicon',
+            field=models.ImageField(blank=True, null=True, upload_to='about_system/favicon/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='aboutsystem',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, upload_to='about_system/logo/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:13
+
+import apps.system_setting.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_setting', '0002_aboutsystem_favicon_variants_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilerSetting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enabled', models.BooleanField(default=False)),
+                ('sample_percent', models.DecimalField(decimal_places=2, default=1, help_text='Share of matching requests to profile, 0-100.', max_digits=5)),
+                ('path_prefix', models.CharField(blank=True, help_text='Only profile paths starting with this, e.g. /api/signin/.', max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=2048)),
+                ('view_name', models.CharField(blank=True, max_length=255)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('trigger', models.CharField(choices=[('header', 'Signed header'), ('sampled', 'Sampled')], max_length=10)),
+                ('file', models.FileField(storage=apps.system_setting.models.profile_storage, upload_to='%Y/%m/%d/')),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
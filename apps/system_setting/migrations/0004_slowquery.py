@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_setting', '0003_profilersetting_requestprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=16, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('alias', models.CharField(max_length=100)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('last_ms', models.FloatField(default=0)),
+                ('example_sql', models.TextField(blank=True)),
+                ('params_fingerprint', models.CharField(blank=True, max_length=12)),
+                ('call_site', models.TextField(blank=True)),
+                ('explain', models.TextField(blank=True)),
+                ('explained_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
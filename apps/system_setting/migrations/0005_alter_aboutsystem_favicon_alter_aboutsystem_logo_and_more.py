@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:03
+
+import apps.utils.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_setting', '0004_slowquery'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aboutsystem',
+            name='favicon',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='about_system/favicon/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='aboutsystem',
+            name='logo',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='about_system/logo/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='socialmedia',
+            name='icon',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='about_system/social_media/'),
+        ),
+    ]
@@ -1,19 +1,77 @@
 from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from apps.utils.images import build_image_variants, replacing_image_variants, validate_image_pixels
+from apps.utils.metrics import record_cache_lookup
 
 # Create your models here.
 
+ABOUT_SYSTEM_CACHE_KEY = 'system_setting:about_system'
+
+
 class AboutSystem(models.Model):
     name = models.CharField(max_length=255)
     title = models.CharField(max_length=255)
     email = models.EmailField()
     copyright = models.CharField(max_length=255)
-    logo = models.ImageField(upload_to='about_system/logo/', blank=True, null=True)
-    favicon = models.ImageField(upload_to='about_system/favicon/', blank=True, null=True)
+    logo = models.ImageField(upload_to='about_system/logo/', max_length=255, blank=True, null=True, validators=[validate_image_pixels])
+    favicon = models.ImageField(upload_to='about_system/favicon/', max_length=255, blank=True, null=True, validators=[validate_image_pixels])
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
+    favicon_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField()
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        replaced = {}
+        if self.logo and not self.logo._committed:
+            replaced['logo'] = self.logo_variants
+            self.logo_variants = build_image_variants(self.logo, settings.LOGO_VARIANT_SIZES)
+        elif not self.logo:
+            replaced['logo'], self.logo_variants = self.logo_variants, {}
+
+        # Favicons stay PNG for the widest browser support.
+        if self.favicon and not self.favicon._committed:
+            replaced['favicon'] = self.favicon_variants
+            self.favicon_variants = build_image_variants(self.favicon, settings.FAVICON_VARIANT_SIZES, image_format='PNG')
+        elif not self.favicon:
+            replaced['favicon'], self.favicon_variants = self.favicon_variants, {}
+        with replacing_image_variants(self, replaced):
+            super().save(*args, **kwargs)
+        cache.delete(ABOUT_SYSTEM_CACHE_KEY)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(ABOUT_SYSTEM_CACHE_KEY)
+        return result
+
+    @classmethod
+    def get_cached(cls, refresh=False):
+        """
+        The site's AboutSystem row, read on every admin page and OTP email.
+        Kept warm by the `warm_about_system` periodic task; the timeout only
+        bounds staleness after bulk updates that bypass save().
+        """
+        about_system = None if refresh else cache.get(ABOUT_SYSTEM_CACHE_KEY)
+        if not refresh:
+            record_cache_lookup("about_system", about_system is not None)
+        if about_system is None:
+            about_system = cls.objects.first()
+            if about_system is not None:
+                cache.set(ABOUT_SYSTEM_CACHE_KEY, about_system, timeout=900)
+        return about_system
+
+    @classmethod
+    async def aget_cached(cls):
+        about_system = await cache.aget(ABOUT_SYSTEM_CACHE_KEY)
+        record_cache_lookup("about_system", about_system is not None)
+        if about_system is None:
+            about_system = await cls.objects.afirst()
+            if about_system is not None:
+                await cache.aset(ABOUT_SYSTEM_CACHE_KEY, about_system, timeout=900)
+        return about_system
+
 class DynamicPages(models.Model):
     title = models.CharField(max_length=255)
     content = models.TextField()
@@ -55,7 +113,7 @@ class SMTPSetting(models.Model):
 class SocialMedia(models.Model):
     name = models.CharField(max_length=255)
     url = models.URLField()
-    icon = models.ImageField(upload_to='about_system/social_media/', blank=True, null=True)
+    icon = models.ImageField(upload_to='about_system/social_media/', max_length=255, blank=True, null=True)
 
 
 class SystemColor(models.Model):
@@ -64,4 +122,96 @@ class SystemColor(models.Model):
     is_active = models.BooleanField(default=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+PROFILER_SETTING_CACHE_KEY = 'system_setting:profiler_setting'
+
+
+class ProfilerSetting(models.Model):
+    """
+    Admin switch for sampling request profiles (apps/utils/profiler.py).
+    """
+    enabled = models.BooleanField(default=False)
+    sample_percent = models.DecimalField(max_digits=5, decimal_places=2, default=1,
+                                         help_text="Share of matching requests to profile, 0-100.")
+    path_prefix = models.CharField(max_length=255, blank=True,
+                                   help_text="Only profile paths starting with this, e.g. /api/signin/.")
+
+    def __str__(self):
+        return "Profiler"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(PROFILER_SETTING_CACHE_KEY)
+
+    @classmethod
+    def get_cached(cls):
+        setting = cache.get(PROFILER_SETTING_CACHE_KEY)
+        if setting is None:
+            setting = cls.objects.first() or cls()
+            cache.set(PROFILER_SETTING_CACHE_KEY, setting, timeout=300)
+        return setting
+
+
+def profile_storage():
+    from apps.utils.profiler import ProfileStorage
+    return ProfileStorage()
+
+
+class RequestProfile(models.Model):
+    class Trigger(models.TextChoices):
+        HEADER = 'header', 'Signed header'
+        SAMPLED = 'sampled', 'Sampled'
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    trigger = models.CharField(max_length=10, choices=Trigger.choices)
+    file = models.FileField(upload_to='%Y/%m/%d/', storage=profile_storage)
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.file.delete(save=False)
+        return result
+
+
+class SlowQuery(models.Model):
+    """
+    Queries slower than SLOW_QUERY_THRESHOLD_MS, aggregated by normalized
+    SQL (apps/utils/slow_queries.py).
+    """
+    fingerprint = models.CharField(max_length=16, unique=True)
+    normalized_sql = models.TextField()
+    alias = models.CharField(max_length=100)
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_ms = models.FloatField(default=0)
+    example_sql = models.TextField(blank=True)
+    params_fingerprint = models.CharField(max_length=12, blank=True)
+    call_site = models.TextField(blank=True)
+    explain = models.TextField(blank=True)
+    explained_at = models.DateTimeField(null=True, blank=True)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-total_ms']
+        verbose_name_plural = 'slow queries'
+
+    def __str__(self):
+        return self.normalized_sql[:80]
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
@@ -0,0 +1,15 @@
+from datetime import timedelta
+
+from apps.jobs.scheduler import periodic
+from apps.utils.profiler import prune_profiles
+from .models import AboutSystem
+
+
+@periodic(every=timedelta(minutes=10))
+def warm_about_system():
+    AboutSystem.get_cached(refresh=True)
+
+
+@periodic(every=timedelta(hours=1))
+def prune_request_profiles():
+    prune_profiles()
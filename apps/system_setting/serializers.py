@@ -1,7 +1,17 @@
 from rest_framework import serializers
 from .models import AboutSystem
+from apps.utils.images import image_variant_urls
 
 class AboutSystemSerializer(serializers.ModelSerializer):
+    logo_variants = serializers.SerializerMethodField()
+    favicon_variants = serializers.SerializerMethodField()
+
+    def get_logo_variants(self, obj):
+        return image_variant_urls(obj.logo, obj.logo_variants)
+
+    def get_favicon_variants(self, obj):
+        return image_variant_urls(obj.favicon, obj.favicon_variants)
+
     class Meta:
         model = AboutSystem
         fields = "__all__"
\ No newline at end of file
@@ -0,0 +1,196 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from PIL import Image
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import override_settings
+from django.urls import URLResolver, get_resolver, resolve, reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.system_setting.models import AboutSystem, SystemColor
+from apps.user.models import OTP, User, UserProfile
+from apps.utils import slow_queries
+from apps.utils.query_budget import QueryBudget, QueryBudgetExceeded, QueryRecorder, budget_for, check_budget
+
+MEDIA_ROOT = tempfile.mkdtemp()
+NEW_PASSWORD = "a much longer passphrase 42"
+
+
+def app_url_names():
+    """
+    Every named route included from an `apps.*.urls` module.
+    """
+    names = set()
+    for pattern in get_resolver().url_patterns:
+        module = getattr(pattern, "urlconf_module", None)
+        if isinstance(pattern, URLResolver) and getattr(module, "__name__", "").startswith("apps."):
+            prefix = f"{pattern.namespace}:" if pattern.namespace else ""
+            names |= {f"{prefix}{p.name}" for p in pattern.url_patterns if getattr(p, "name", None)}
+    return names
+
+
+# Slow-query capture is off so its flushes are not counted against routes.
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, SLOW_QUERY_THRESHOLD_MS=0)
+class QueryBudgetTests(APITestCase):
+    """
+    Requests every app route, and the admin dashboard, with working fixtures
+    and holds each to its query budget. A new route needs a fixture in
+    ROUTES and a budget (apps.utils.query_budget) before this passes.
+    """
+
+    # URL name: (fixture method, expected status)
+    ROUTES = {
+        "signup": ("signup", status.HTTP_201_CREATED),
+        "signin": ("signin", status.HTTP_200_OK),
+        "signout": ("signout", status.HTTP_200_OK),
+        "change-password": ("change_password", status.HTTP_200_OK),
+        "send-otp": ("send_otp", status.HTTP_200_OK),
+        "resend-otp": ("send_otp", status.HTTP_200_OK),
+        "verify-otp": ("verify_otp", status.HTTP_200_OK),
+        "reset-password": ("reset_password", status.HTTP_200_OK),
+        "avatar-update": ("update_avatar", status.HTTP_200_OK),
+        "profile-update": ("update_profile", status.HTTP_200_OK),
+        "get-profile": ("get_as_user", status.HTTP_200_OK),
+        "token_refresh": ("refresh_token", status.HTTP_200_OK),
+        "token_verify": ("verify_token", status.HTTP_200_OK),
+        "google-auth": ("google_auth", status.HTTP_200_OK),
+        "about_system": ("get_anonymous", status.HTTP_200_OK),
+        "db_stats": ("get_as_admin", status.HTTP_200_OK),
+        "admin:index": ("get_admin_page", status.HTTP_200_OK),
+    }
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        slow_queries._buffer.clear()
+        AboutSystem.objects.create(name="Starter", title="Starter", email="info@example.com", copyright="Starter", description="Starter kit")
+        SystemColor.objects.create(name="Blue", code="#0000ff")
+        self.user = User.objects.create_user(email="budget@example.com", password="password123", full_name="Budget User", term_and_condition_accepted=True)
+        UserProfile.objects.create(user=self.user, phone="0123456789")
+        self.admin = User.objects.create_superuser(email="admin@example.com", password="password123", term_and_condition_accepted=True)
+        for i in range(5):
+            user = User.objects.create_user(email=f"member{i}@example.com", password="password123", term_and_condition_accepted=True)
+            UserProfile.objects.create(user=user)
+
+    # Fixtures prepare the database and client, then return the request
+    # as (client method, kwargs); only the request itself is measured.
+
+    def bearer(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}", HTTP_X_CLIENT_TYPE="mobile")
+
+    def make_otp(self, verified=False):
+        OTP.objects.create(user=self.user, otp=make_password("123456"), purpose="reset_password", is_verify=verified, expires_at=timezone.now() + timedelta(minutes=3))
+
+    def signup(self):
+        return "post", {"data": {"email": "new@example.com", "password": "password123", "full_name": "New User", "purpose": "create_account", "term_and_condition_accepted": True}}
+
+    def signin(self):
+        return "post", {"data": {"email": self.user.email, "password": "password123"}, "format": "json"}
+
+    def signout(self):
+        self.bearer(self.user)
+        return "post", {"data": {"refresh_token": str(RefreshToken.for_user(self.user))}, "format": "json"}
+
+    def change_password(self):
+        self.bearer(self.user)
+        return "post", {"data": {"old_password": "password123", "new_password": NEW_PASSWORD, "confirm_password": NEW_PASSWORD}, "format": "json"}
+
+    def send_otp(self):
+        return "post", {"data": {"email": self.user.email, "purpose": "reset_password"}, "format": "json"}
+
+    def verify_otp(self):
+        self.make_otp()
+        return "post", {"data": {"email": self.user.email, "otp": "123456", "purpose": "reset_password"}, "format": "json"}
+
+    def reset_password(self):
+        self.make_otp(verified=True)
+        return "post", {"data": {"email": self.user.email, "otp": "123456", "purpose": "reset_password", "new_password": NEW_PASSWORD, "confirm_password": NEW_PASSWORD}, "format": "json"}
+
+    def update_avatar(self):
+        self.bearer(self.user)
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 64), "red").save(buffer, format="PNG")
+        return "post", {"data": {"avatar": SimpleUploadedFile("avatar.png", buffer.getvalue(), content_type="image/png")}, "format": "multipart"}
+
+    def update_profile(self):
+        self.bearer(self.user)
+        return "put", {"data": {"full_name": "New Name"}, "format": "json"}
+
+    def get_as_user(self):
+        self.bearer(self.user)
+        return "get", {}
+
+    def refresh_token(self):
+        return "post", {"data": {"refresh": str(RefreshToken.for_user(self.user))}, "format": "json"}
+
+    def verify_token(self):
+        return "post", {"data": {"token": str(RefreshToken.for_user(self.user).access_token)}, "format": "json"}
+
+    def google_auth(self):
+        user_info = {"email": "google@example.com", "name": "Google User"}
+        self.enterContext(mock.patch("apps.social_auth.views.verify_google_id_token", return_value=user_info))
+        return "post", {"data": {"id_token": "token"}, "format": "json"}
+
+    def get_anonymous(self):
+        return "get", {}
+
+    def get_as_admin(self):
+        self.client.force_authenticate(self.admin)
+        return "get", {}
+
+    def get_admin_page(self):
+        self.client.force_login(self.admin)
+        return "get", {}
+
+    def request_route(self, name):
+        fixture, expected_status = self.ROUTES[name]
+        url = reverse(name)
+        method, kwargs = getattr(self, fixture)()
+        with QueryRecorder() as recorder:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertEqual(response.status_code, expected_status, getattr(response, "data", None))
+        return recorder
+
+    def test_every_route_has_a_fixture_and_a_budget(self):
+        routes = app_url_names() | {"admin:index"}
+
+        self.assertEqual(routes - set(self.ROUTES), set(), "routes without a fixture in ROUTES")
+        self.assertEqual({name for name in routes if budget_for(resolve(reverse(name))) is None}, set(), "routes without a query budget")
+
+    def test_routes_stay_within_budget(self):
+        for name in self.ROUTES:
+            with self.subTest(route=name):
+                cache.clear()
+                self.client = self.client_class()
+                # Each route sees the setUp data only.
+                with transaction.atomic():
+                    recorder = self.request_route(name)
+                    transaction.set_rollback(True)
+                check_budget(name, budget_for(resolve(reverse(name))), recorder)
+
+    def test_report_lists_duplicate_stacks(self):
+        with QueryRecorder() as recorder:
+            User.objects.count()
+            for user in User.objects.all():
+                UserProfile.objects.filter(user=user).first()
+
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            check_budget("loop", QueryBudget(3, 0), recorder)
+        report = str(ctx.exception)
+        self.assertIn("loop: 9 queries (budget 3), 6 duplicates (budget 0).", report)
+        self.assertIn("Run 7 times on default", report)
+        self.assertIn("UserProfile.objects.filter(user=user).first()", report)
+
+        check_budget("loop", QueryBudget(9, 6), recorder)
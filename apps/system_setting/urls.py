@@ -1,12 +1,14 @@
 from django.urls import path
 from django.conf.urls.static import static
-from project import settings
+from django.conf import settings
 
 from .views import (
     AboutSystemAPIView,
+    DatabaseStatsAPIView,
 )
 
 urlpatterns = [
     path("about-system/", AboutSystemAPIView.as_view(), name="about_system"),
+    path("system/db-stats/", DatabaseStatsAPIView.as_view(), name="db_stats"),
 ]
 
@@ -1,16 +1,50 @@
-from apps.system_setting.models import AboutSystem
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
+from apps.system_setting.models import AboutSystem
+from apps.utils.async_views import AsyncAPIView
 from apps.system_setting.serializers import AboutSystemSerializer
+from apps.utils.db import get_database_stats
 from apps.utils.helpers import success, error
+from apps.utils.metrics import REGISTRY
+from apps.utils.query_budget import query_budget
 # Create your views here.   
 
-class AboutSystemAPIView(APIView):
+@query_budget(2)
+class AboutSystemAPIView(AsyncAPIView):
     permission_classes = []
-    def get(self, request):
+    async def get(self, request):
 
-        about_system = AboutSystem.objects.first()
+        about_system = await AboutSystem.aget_cached()
    
         if about_system:
             serializer = AboutSystemSerializer(about_system)
             return success(serializer.data, "About system retrieved successfully.",200)
         return error(message="About system not found.", errors=None, status_code=404)
+
+
+@query_budget(1)
+class DatabaseStatsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return success(get_database_stats(), "Database connection stats retrieved successfully.", 200)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape target, for staff sessions and scrapers sending
+    `Authorization: Bearer <METRICS_TOKEN>`. The peer address is not
+    trusted: behind a same-host proxy every request comes from 127.0.0.1.
+    """
+    user = getattr(request, "user", None)
+    scheme, _, token = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    has_token = bool(settings.METRICS_TOKEN) and scheme.lower() == "bearer" and secrets.compare_digest(token, settings.METRICS_TOKEN)
+    if not has_token and not (user and user.is_staff):
+        return HttpResponseForbidden()
+    # Brings this worker's pool gauges up to date before they are read.
+    get_database_stats()
+    return HttpResponse(REGISTRY.expose(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -2,6 +2,7 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin
 from .models import User, UserProfile
 from django.utils.html import format_html
+from apps.utils.images import image_variant_url
 
 @admin.register(User)
 class CustomAdminClass(ModelAdmin):
@@ -16,7 +17,7 @@ class CustomAdminClass(ModelAdmin):
 
     def preview_user_image(self, obj):
         if obj.avatar:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.avatar.url)
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', image_variant_url(obj.avatar, obj.avatar_variants, 48))
         return "No Image"
     
     def check_is_superuser(self, obj):
@@ -1,8 +1,19 @@
+import logging
+
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 from rest_framework.authentication import CSRFCheck
 from rest_framework import exceptions
 from django.conf import settings
 
+from apps.utils.timing import span
+
+
+logger = logging.getLogger(__name__)
+
+
 def enforce_csrf(request):
     """
     Enforce CSRF protection for cookie-based authentication.
@@ -17,7 +28,7 @@ def enforce_csrf(request):
 
 class HybridJWTAuthentication(JWTAuthentication):
 
-    def authenticate(self, request):
+    def get_validated_request_token(self, request):
         # Detect client type (set by ClientTypeMiddleware)
         is_mobile = getattr(request, 'is_mobile_client', False)
         
@@ -57,12 +68,49 @@ class HybridJWTAuthentication(JWTAuthentication):
             self._validate_user_agent(request, validated_token)
         
         # SECURITY: CSRF protection for cookie-based auth
-        # Only enforce for web clients using cookies
+        # Only enforce for web clients using cookies, when ENABLE_CSRF_FOR_COOKIES is set
         if not is_mobile and 'access_token' in request.COOKIES:
-            if getattr(settings, 'ENABLE_CSRF_FOR_COOKIES', False):
+            if settings.ENABLE_CSRF_FOR_COOKIES:
                 enforce_csrf(request)
         
-        return self.get_user(validated_token), validated_token
+        return validated_token
+
+    def authenticate(self, request):
+        with span("auth"):
+            validated_token = self.get_validated_request_token(request)
+            if validated_token is None:
+                return None
+            return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        with span("auth"):
+            validated_token = self.get_validated_request_token(request)
+            if validated_token is None:
+                return None
+            return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """
+        Async twin of JWTAuthentication.get_user for AsyncAPIViewMixin views.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('User not found', code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise exceptions.AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise exceptions.AuthenticationFailed("The user's password has been changed.", code='password_changed')
+
+        return user
     
     def _validate_user_agent(self, request, validated_token):
         """
@@ -76,7 +124,7 @@ class HybridJWTAuthentication(JWTAuthentication):
         
         if token_ua_hash and token_ua_hash != current_ua_hash:
             # Log for security monitoring
-            print(f"SECURITY WARNING: User-Agent Mismatch! Token UA: {token_ua_hash}, Request UA: {current_ua_hash}")
+            logger.debug("User-Agent mismatch: token UA %s, request UA %s", token_ua_hash, current_ua_hash)
             raise exceptions.AuthenticationFailed('Token is invalid (User-Agent Mismatch).')
 
 
@@ -0,0 +1,85 @@
+from django.http import HttpResponse
+from rest_framework.test import APIRequestFactory
+
+from apps.utils.benchmark import benchmark
+
+from .authentication import HybridJWTAuthentication
+from .models import User
+from .serializers import CustomRefreshToken
+from .utils import create_hybrid_auth_response, get_user_agent_hash, set_auth_cookies
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+
+def bench_user():
+    user = User.objects.filter(email="bench-auth@example.invalid").first()
+    return user or User.objects.create_user(email="bench-auth@example.invalid", password="bench-password-123", full_name="Bench User", term_and_condition_accepted=True)
+
+
+def client_request(mobile, **extra):
+    """
+    A GET as ClientTypeMiddleware leaves it for a mobile or web client.
+    """
+    request = APIRequestFactory().get("/api/get-profile/", HTTP_USER_AGENT=USER_AGENT, **extra)
+    request.is_mobile_client = mobile
+    request.is_web_client = not mobile
+    return request
+
+
+def tokens_for(user, request):
+    refresh = CustomRefreshToken.for_user(user, user_agent_hash=get_user_agent_hash(request))
+    return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
+@benchmark("auth.authenticate.header")
+def authenticate_header():
+    user = bench_user()
+    access = tokens_for(user, client_request(True))["access"]
+    request = client_request(True, HTTP_AUTHORIZATION=f"Bearer {access}")
+    authentication = HybridJWTAuthentication()
+    return lambda: authentication.authenticate(request)
+
+
+@benchmark("auth.authenticate.cookie")
+def authenticate_cookie():
+    user = bench_user()
+    request = client_request(False)
+    request.COOKIES["access_token"] = tokens_for(user, request)["access"]
+    authentication = HybridJWTAuthentication()
+    return lambda: authentication.authenticate(request)
+
+
+@benchmark("auth.user_agent_hash")
+def user_agent_hash():
+    request = client_request(False)
+    return lambda: get_user_agent_hash(request)
+
+
+@benchmark("auth.refresh_token.for_user")
+def refresh_token_for_user():
+    user = bench_user()
+    user_agent_hash = get_user_agent_hash(client_request(False))
+    return lambda: CustomRefreshToken.for_user(user, user_agent_hash=user_agent_hash)
+
+
+@benchmark("auth.response.web")
+def auth_response_web():
+    request = client_request(False)
+    tokens = tokens_for(bench_user(), request)
+    data = {"id": 1, "email": "bench-auth@example.invalid", "full_name": "Bench User"}
+    return lambda: create_hybrid_auth_response(data, tokens, request)
+
+
+@benchmark("auth.response.mobile")
+def auth_response_mobile():
+    request = client_request(True)
+    tokens = tokens_for(bench_user(), request)
+    data = {"id": 1, "email": "bench-auth@example.invalid", "full_name": "Bench User"}
+    return lambda: create_hybrid_auth_response(data, tokens, request)
+
+
+@benchmark("auth.set_auth_cookies")
+def auth_cookies():
+    tokens = tokens_for(bench_user(), client_request(False))
+    return lambda: set_auth_cookies(HttpResponse(), tokens["access"], tokens["refresh"])
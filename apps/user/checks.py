@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core import checks
+from django.utils.module_loading import import_string
+
+
+@checks.register(checks.Tags.compatibility, deploy=True)
+def check_async_middleware(app_configs, **kwargs):
+    """
+    Under ASGI every sync-only middleware makes Django hop between the
+    event loop and a thread on each request. List the ones left. Only
+    run by `check --deploy`, so everyday commands stay quiet.
+    """
+    messages = []
+    for setting in ('MIDDLEWARE', 'API_MIDDLEWARE'):
+        for path in getattr(settings, setting, []):
+            try:
+                middleware = import_string(path)
+            except ImportError:
+                continue
+            if not getattr(middleware, 'async_capable', False):
+                messages.append(checks.Info(
+                    f"{path} in {setting} is sync-only and forces sync adaptation under ASGI.",
+                    hint="Give it sync_capable/async_capable and an async __call__, or drop it from the ASGI stack.",
+                    obj=path,
+                    id='user.I001',
+                ))
+    return messages
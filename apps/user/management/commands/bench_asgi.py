@@ -0,0 +1,132 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.user.authentication import CookieJWTAuthentication
+from apps.user.models import User, UserProfile
+from apps.user.views import GetProfileView
+from apps.utils.helpers import success
+from apps.utils.images import image_variant_urls
+
+
+class SyncGetProfileView(APIView):
+    """
+    The previous sync GetProfileView, kept here as the baseline.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+
+    def get(self, request):
+        user = request.user
+        profile = user.user_profile
+        data = {
+            'user_id': user.id,
+            'email': user.email,
+            'full_name': user.full_name,
+            'avatar': image_variant_urls(user.avatar, user.avatar_variants),
+            'phone': profile.phone,
+            'dob': profile.dob,
+        }
+        return success(data=data, message="Profile get successfully.", status_code=status.HTTP_200_OK)
+
+
+urlpatterns = [
+    path("sync/", SyncGetProfileView.as_view()),
+    path("async/", GetProfileView.as_view()),
+    path("", include("project.urls")),
+]
+
+
+async def asgi_get(application, path, headers):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    sent_body = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    status_code = None
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return status_code
+
+
+class Command(BaseCommand):
+    help = "Compare get-profile requests/second in one ASGI worker: sync vs async view, full vs API middleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=20, help="In-flight requests on the event loop.")
+
+    def handle(self, *args, **options):
+        email = f"bench-{uuid4().hex[:8]}@example.invalid"
+        user = User.objects.create_user(email=email, password="bench-password-123", term_and_condition_accepted=True)
+        UserProfile.objects.create(user=user)
+        token = str(RefreshToken.for_user(user).access_token)
+        headers = [
+            (b"host", b"localhost"),
+            (b"authorization", f"Bearer {token}".encode()),
+            (b"x-client-type", b"mobile"),
+        ]
+
+        cases = [
+            ("sync GetProfileView", "/sync/", {}),
+            ("async GetProfileView", "/async/", {}),
+            ("get-profile/, full MIDDLEWARE", "/api/get-profile/", {"API_PATH_PREFIXES": []}),
+            ("get-profile/, API_MIDDLEWARE", "/api/get-profile/", {}),
+        ]
+        try:
+            for label, url, overrides in cases:
+                with override_settings(ROOT_URLCONF=__name__, **overrides):
+                    application = ASGIHandler()
+                    rate = asyncio.run(self.measure(application, url, headers, options["requests"], options["concurrency"]))
+                self.stdout.write(f"{label:<32} {rate:>8.0f} req/s  {1000 / rate:>6.3f} ms/req")
+        finally:
+            User.objects.filter(email=email).delete()
+
+    async def measure(self, application, url, headers, count, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                code = await asgi_get(application, url, headers)
+                if code != 200:
+                    raise RuntimeError(f"{url} returned {code}")
+
+        await asyncio.gather(*(one() for _ in range(min(concurrency, count))))  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(count)))
+        return count / (time.perf_counter() - start)
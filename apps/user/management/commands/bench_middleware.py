@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import path
+
+from apps.user.middleware import ClientTypeMiddleware
+
+from .bench_asgi import asgi_get
+
+
+class SyncOnlyClientTypeMiddleware(ClientTypeMiddleware):
+    """
+    ClientTypeMiddleware as it was before it became async-capable.
+    """
+    async_capable = False
+
+
+async def ping(request):
+    return HttpResponse(request.client_type)
+
+
+urlpatterns = [
+    path("ping/", ping),
+]
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request cost of a sync-only middleware under ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        dual_mode = "apps.user.middleware.ClientTypeMiddleware"
+        sync_only = f"{__name__}.SyncOnlyClientTypeMiddleware"
+        headers = [(b"host", b"localhost"), (b"x-client-type", b"mobile")]
+
+        for label, middleware in [
+            ("ClientTypeMiddleware only, sync-only", [sync_only]),
+            ("ClientTypeMiddleware only, dual-mode", [dual_mode]),
+            ("settings.MIDDLEWARE, sync-only", [sync_only if m == dual_mode else m for m in settings.MIDDLEWARE]),
+            ("settings.MIDDLEWARE, dual-mode", list(settings.MIDDLEWARE)),
+        ]:
+            with override_settings(ROOT_URLCONF=__name__, MIDDLEWARE=middleware):
+                application = ASGIHandler()
+                rate = asyncio.run(self.measure(application, headers, options["requests"], options["concurrency"]))
+            self.stdout.write(f"{label:<40} {rate:>8.0f} req/s  {1000 / rate:>6.3f} ms/req")
+
+    async def measure(self, application, headers, count, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                code = await asgi_get(application, "/ping/", headers)
+                if code != 200:
+                    raise RuntimeError(f"/ping/ returned {code}")
+
+        await asyncio.gather(*(one() for _ in range(concurrency)))  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(count)))
+        return count / (time.perf_counter() - start)
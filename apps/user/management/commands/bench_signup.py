@@ -0,0 +1,64 @@
+import time
+from uuid import uuid4
+
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.user.models import User
+from apps.user.views import SignUpView
+
+
+class SlowEmailBackend(EmailBackend):
+    """
+    In-memory mail backend that sleeps like a slow SMTP server.
+    """
+    latency = 0.0
+
+    def send_messages(self, messages):
+        time.sleep(self.latency)
+        return super().send_messages(messages)
+
+
+class Command(BaseCommand):
+    help = "Measure sign-ups per second through SignUpView."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=20, help="Number of sign-ups to run.")
+        parser.add_argument("--smtp-latency", type=float, default=0.0, help="Simulated SMTP latency in seconds.")
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        SlowEmailBackend.latency = options["smtp_latency"]
+
+        factory = APIRequestFactory()
+        view = SignUpView.as_view()
+        prefix = f"bench-{uuid4().hex[:8]}"
+        durations = []
+
+        backend = f"{SlowEmailBackend.__module__}.{SlowEmailBackend.__qualname__}"
+        with override_settings(EMAIL_BACKEND=backend):
+            try:
+                for i in range(count):
+                    request = factory.post("/api/signup/", {
+                        "email": f"{prefix}-{i}@example.invalid",
+                        "password": "bench-password-123",
+                        "purpose": "create_account",
+                        "term_and_condition_accepted": True,
+                    }, format="json")
+                    start = time.perf_counter()
+                    response = view(request)
+                    durations.append(time.perf_counter() - start)
+                    if response.status_code != 201:
+                        self.stderr.write(f"Sign-up {i} failed with {response.status_code}: {response.data}")
+                        return
+            finally:
+                User.objects.filter(email__startswith=prefix).delete()
+
+        total = sum(durations)
+        durations.sort()
+        self.stdout.write(f"sign-ups:        {count}")
+        self.stdout.write(f"sign-ups/second: {count / total:.2f}")
+        self.stdout.write(f"mean latency:    {total / count * 1000:.1f} ms")
+        self.stdout.write(f"p95 latency:     {durations[int(0.95 * (count - 1))] * 1000:.1f} ms")
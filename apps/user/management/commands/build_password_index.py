@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.user.password_validation import default_password_list_path, read_password_list, write_password_index
+
+
+class Command(BaseCommand):
+    help = "Precompile the common-password list into the memory-mappable index used by CompactCommonPasswordValidator."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", default=None, help="Password list (plain or gzipped). Defaults to Django's list.")
+        parser.add_argument("--output", default=None, help="Index path. Defaults to settings.COMMON_PASSWORD_INDEX.")
+
+    def handle(self, *args, **options):
+        source = options["source"] or default_password_list_path()
+        output = options["output"] or settings.COMMON_PASSWORD_INDEX
+        count = write_password_index(read_password_list(source), output)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} password hashes to {output}."))
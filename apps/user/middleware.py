@@ -2,6 +2,7 @@
 Hybrid Authentication Middleware
 Detects client type (Web/Mobile) and adds context to the request
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 
 class ClientTypeMiddleware:
@@ -12,12 +13,29 @@ class ClientTypeMiddleware:
     Mobile clients: Send 'X-Client-Type: mobile' header
     
     If no header is provided, defaults to 'web' for backward compatibility.
+
+    Works natively under both WSGI and ASGI, so Django never has to wrap
+    it in a thread under the async handler.
     """
-    
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
     
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return await self.get_response(request)
+
+    def process_request(self, request):
         # Detect client type from custom header
         client_type = request.headers.get('X-Client-Type', 'web').lower()
         
@@ -29,6 +47,3 @@ class ClientTypeMiddleware:
         request.client_type = client_type
         request.is_web_client = client_type == 'web'
         request.is_mobile_client = client_type == 'mobile'
-        
-        response = self.get_response(request)
-        return response
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:26
+
+import apps.utils.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_remove_userprofile_accepted_terms_alter_otp_purpose'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='avatars/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+    ]
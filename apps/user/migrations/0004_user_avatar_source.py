@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_user_avatar_variants_alter_user_avatar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_source',
+            field=models.URLField(blank=True, editable=False, max_length=1024, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:03
+
+import apps.utils.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_user_avatar_source'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='avatars/', validators=[apps.utils.images.validate_image_pixels]),
+        ),
+    ]
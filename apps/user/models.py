@@ -6,6 +6,8 @@ from datetime import timedelta
 from django.utils import timezone
 from .managers import UserManager
 from django.contrib.auth.hashers import check_password
+from django.conf import settings
+from apps.utils.images import build_image_variants, replacing_image_variants, validate_image_pixels
 
 
 
@@ -15,7 +17,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         USER = 'user', _('User')
 
     email = models.EmailField(_("email address"), unique=True)
-    avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
+    avatar = models.ImageField(upload_to='avatars/', max_length=255, blank=True, null=True, validators=[validate_image_pixels])
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
+    avatar_source = models.URLField(max_length=1024, blank=True, null=True, editable=False)
     full_name = models.CharField(max_length=255, blank=True, null=True)
     role = models.CharField(max_length=20, choices=Roles.choices, default=Roles.USER)
     is_staff = models.BooleanField(default=False)
@@ -34,6 +38,21 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        # Resize a freshly assigned upload once, before it is written to storage.
+        replaced = {}
+        if self.avatar and not self.avatar._committed:
+            replaced['avatar'] = self.avatar_variants
+            self.avatar_variants = build_image_variants(self.avatar, settings.AVATAR_VARIANT_SIZES)
+        elif not self.avatar:
+            replaced['avatar'], self.avatar_variants = self.avatar_variants, {}
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'avatar' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'avatar_variants'}
+        with replacing_image_variants(self, replaced):
+            super().save(*args, **kwargs)
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='user_profile')
     phone = models.CharField(max_length=20, blank=True, null=True)
@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"CPWIDX1\0"
+
+
+def default_password_list_path():
+    return Path(password_validation.__file__).resolve().parent / "common-passwords.txt.gz"
+
+
+def password_hash(password):
+    """
+    64-bit hash of a normalised password. With ~20k entries the chance of
+    a false "too common" is about 1 in 10^15.
+    """
+    digest = hashlib.blake2b(password.lower().strip().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def read_password_list(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [line.strip() for line in f]
+    except OSError:
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f]
+
+
+def build_password_index(passwords):
+    return array("Q", sorted({password_hash(password) for password in passwords if password}))
+
+
+def write_password_index(passwords, index_path):
+    """
+    Write the sorted hash array to `index_path` atomically. Returns the
+    number of entries.
+    """
+    hashes = build_password_index(passwords)
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_MAGIC)
+        hashes.tofile(f)
+    os.replace(tmp_path, index_path)
+    return len(hashes)
+
+
+class CompactCommonPasswordValidator(CommonPasswordValidator):
+    """
+    CommonPasswordValidator backed by a sorted array of 64-bit password
+    hashes, built at deploy time by `manage.py build_password_index`.
+
+    The index is memory-mapped read-only, so every worker on a host shares
+    the same page-cache pages, and a lookup is a binary search. Without an
+    index file the list is hashed in memory on first use, as before.
+    """
+
+    def __init__(self, index_path=None, password_list_path=None):
+        self.index_path = index_path or settings.COMMON_PASSWORD_INDEX
+        self.password_list_path = password_list_path or default_password_list_path()
+        self.hashes = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            logger.warning(
+                "Common-password index %s missing; run `manage.py build_password_index`. "
+                "Falling back to an in-memory index.", self.index_path,
+            )
+            return self.load_password_list()
+
+        try:
+            return self.map_hashes(mapped)
+        except ValueError as e:
+            mapped.close()
+            logger.error(
+                "%s Rebuild it with `manage.py build_password_index`. "
+                "Falling back to an in-memory index.", e,
+            )
+            return self.load_password_list()
+
+    def map_hashes(self, mapped):
+        if mapped[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a common-password index.")
+        if (len(mapped) - len(INDEX_MAGIC)) % array("Q").itemsize:
+            raise ValueError(f"Common-password index {self.index_path} is truncated.")
+        return memoryview(mapped)[len(INDEX_MAGIC):].cast("Q")
+
+    def load_password_list(self):
+        return build_password_index(read_password_list(self.password_list_path))
+
+    def validate(self, password, user=None):
+        value = password_hash(password)
+        position = bisect_left(self.hashes, value)
+        if position < len(self.hashes) and self.hashes[position] == value:
+            raise ValidationError(
+                self.get_error_message(),
+                code="password_too_common",
+            )
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from apps.jobs.scheduler import periodic
+from .models import OTP
+
+
+@periodic(every=timedelta(hours=1))
+def purge_expired_otps():
+    # Keep a day of expired codes so verification still reports "expired"
+    # rather than "not found" for recent ones.
+    OTP.objects.filter(expires_at__lt=timezone.now() - timedelta(days=1)).delete()
+
+
+@periodic(every=timedelta(hours=6))
+def flush_expired_tokens():
+    # Same as simplejwt's `flushexpiredtokens`; blacklist rows cascade.
+    OutstandingToken.objects.filter(expires_at__lte=timezone.now()).delete()
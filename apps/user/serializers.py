@@ -1,18 +1,20 @@
 
-from apps.system_setting.models import AboutSystem
 from .models import User, UserProfile, OTP
 from rest_framework import  serializers
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.hashers import make_password
 from django.utils.timezone import timedelta
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.conf import settings
-from .utils import generate_otp
 from django.utils import timezone
-from apps.utils.helpers import send_email, success, error
-from django.template.loader import render_to_string
-from .utils import get_user_agent_hash
+from apps.utils.helpers import success, error
+from apps.utils.images import image_variant_urls
+from apps.jobs.queue import enqueue
+from apps.utils.timing import span
+from .tasks import email_otp
+from .utils import derive_otp, get_user_agent_hash, get_client_ip, log_signup
 
 class CustomRefreshToken(RefreshToken):
 
@@ -41,12 +43,8 @@ class SignUpSerializer(serializers.ModelSerializer):
     term_and_condition_accepted = serializers.BooleanField(required=True)
 
     def validate(self, attrs):
-        email = attrs.get('email')
         term_and_condition_accepted = attrs.get('term_and_condition_accepted')
-        
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError({'email': 'User with this email already exists.'})
-        
+
         if term_and_condition_accepted is not True:
             raise serializers.ValidationError({'term_and_condition_accepted': 'You must accept the terms and conditions to proceed.'})
         
@@ -60,27 +58,31 @@ class SignUpSerializer(serializers.ModelSerializer):
         email = validated_data.pop('email')
         password = validated_data.pop('password')
         purpose = validated_data.pop('purpose')
-        
-        user = User.objects.create_user(email=email, password=password, **validated_data)
-        UserProfile.objects.create(user=user)
-        
-
-        otp_code = generate_otp()
-        otp_hashed = make_password(otp_code)
+        request = self.context.get('request')
+        ip_address = get_client_ip(request) if request else None
 
+        # Hash outside the transaction so the write window stays short.
+        user = User(email=User.objects.normalize_email(email), ip_address=ip_address, **validated_data)
         expires_at = timezone.now() + timedelta(minutes=3)
+        with span("password"):
+            user.set_password(password)
+            otp_hash = make_password(derive_otp(user.email, purpose, expires_at))
 
-        OTP.objects.update_or_create(user=user, defaults={'otp': otp_hashed, 'is_verify': False, 'purpose': purpose, 'created_at': timezone.now(), 'expires_at': expires_at})
-        
-        system_info = AboutSystem.objects.first()
-        html_content = render_to_string('email/otp_verification_template.html', {'otp_code': otp_code, 'system_info': system_info})
-        send_email(
-            subject='Verification OTP',
-            body=f'Your OTP is {otp_code}. Expire in 3 minutes.',
-            to_emails=[user.email,],
-            from_email=settings.EMAIL_HOST_USER,
-            html_body=html_content
-            )
+        # Duplicate emails are caught by the unique constraint instead of a pre-check.
+        try:
+            with transaction.atomic():
+                user.save()
+                UserProfile.objects.create(user=user)
+                OTP.objects.create(user=user, otp=otp_hash, is_verify=False, purpose=purpose, expires_at=expires_at)
+
+                # Queued in the same transaction; workers pick it up after commit.
+                enqueue(email_otp, user.id, purpose, priority=10, max_attempts=3)
+                transaction.on_commit(lambda: log_signup(user.id, ip_address), robust=True)
+        except IntegrityError:
+            # Only the unique email is a user error; anything else is a bug.
+            if User.objects.filter(email=user.email).exists():
+                raise serializers.ValidationError({'email': 'User with this email already exists.'})
+            raise
     
         return user
     
@@ -88,7 +90,9 @@ class SignUpSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         user_agent_hash = get_user_agent_hash(request) if request else None
 
-        refresh = CustomRefreshToken.for_user(instance, user_agent_hash=user_agent_hash)
+        with span("jwt"):
+            refresh = CustomRefreshToken.for_user(instance, user_agent_hash=user_agent_hash)
+            tokens = {'refresh': str(refresh), 'access': str(refresh.access_token)}
         
         return {
             'user': {
@@ -97,8 +101,7 @@ class SignUpSerializer(serializers.ModelSerializer):
                 'email': instance.email,
                 'role': instance.role,
             },
-            'refresh': str(refresh),
-            'access': str(refresh.access_token)
+            **tokens,
         }
 
 
@@ -116,7 +119,9 @@ class SignInSerializer(serializers.Serializer):
         user = User.objects.filter(email=attrs['email']).first()
         if not user:
            raise serializers.ValidationError({'email': 'User with this email does not exist.'})
-        if not user.check_password(password):
+        with span("password"):
+            password_ok = user.check_password(password)
+        if not password_ok:
             raise serializers.ValidationError({'password': 'Invalid password.'})
         self.user = user
         return attrs
@@ -129,11 +134,13 @@ class SignInSerializer(serializers.Serializer):
         remember_me = self.validated_data.get("remember_me", False)
         user_agent_hash = get_user_agent_hash(request) if request else None
 
-        refresh = CustomRefreshToken.for_user(
-            user,
-            remember_me=remember_me,
-            user_agent_hash=user_agent_hash
-        )
+        with span("jwt"):
+            refresh = CustomRefreshToken.for_user(
+                user,
+                remember_me=remember_me,
+                user_agent_hash=user_agent_hash
+            )
+            tokens = {'refresh': str(refresh), 'access': str(refresh.access_token)}
 
         return {
             'user': {
@@ -141,8 +148,7 @@ class SignInSerializer(serializers.Serializer):
                 'email': user.email,
                 'role': user.role,
             },
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            **tokens,
             'remember_me': remember_me
         }
         
@@ -198,7 +204,9 @@ class ChangePasswordSerializer(serializers.Serializer):
         if not user:
             raise ValidationError({'error': 'User not found.'})
         
-        if not user.check_password(old_password):
+        with span("password"):
+            password_ok = user.check_password(old_password)
+        if not password_ok:
             raise ValidationError({'error': 'Old password is incorrect.'})
         
         if new_password != confirm_password:
@@ -208,7 +216,8 @@ class ChangePasswordSerializer(serializers.Serializer):
             raise ValidationError({'error': 'The new password is not the same as the old password.'})
         
         try:
-            validate_password(new_password)
+            with span("password"):
+                validate_password(new_password)
         except Exception as e:
             raise ValidationError({'error': str(e.messages)})
         
@@ -232,27 +241,17 @@ class SendOTPSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError({'error': 'User not found.'})
 
-        otp_code = generate_otp()
-        otp_hashed = make_password(otp_code)
         purpose = attrs['purpose']
 
         expires_at = timezone.now() + timedelta(minutes=3)
 
-        OTP.objects.update_or_create(user=user, defaults={'otp': otp_hashed, 'is_verify': False, 'purpose': purpose, 'created_at': timezone.now(), 'expires_at': expires_at})
+        # Mailed by a worker: success here means the request was accepted,
+        # not that the email was delivered.
+        with span("password"):
+            otp_hash = make_password(derive_otp(user.email, purpose, expires_at))
+        OTP.objects.update_or_create(user=user, defaults={'otp': otp_hash, 'is_verify': False, 'purpose': purpose, 'created_at': timezone.now(), 'expires_at': expires_at})
         
-        system_info = AboutSystem.objects.first()
-        html_content = render_to_string('email/otp_verification_template.html', {'otp_code': otp_code, 'system_info': system_info})
-
-        try:
-          send_email(
-                subject='Verification OTP',
-                body=f'Your OTP is {otp_code}. Expire in 3 minutes.',
-                to_emails=[user.email,],
-                from_email=settings.EMAIL_HOST_USER,
-                html_body=html_content
-                )
-        except:
-            raise serializers.ValidationError("SMTP NOT VALID!")
+        enqueue(email_otp, user.id, purpose, priority=10, max_attempts=3)
         return attrs
 
 class ResendOTPSerializer(serializers.Serializer):
@@ -277,27 +276,17 @@ class ResendOTPSerializer(serializers.Serializer):
         except OTP.DoesNotExist:
             pass
 
-        otp_code = generate_otp()
-        otp_hashed = make_password(otp_code)
         purpose = attrs['purpose']
 
         expires_at = timezone.now() + timedelta(minutes=3)
 
-        OTP.objects.update_or_create(user=user, defaults={'otp': otp_hashed, 'is_verify': False, 'purpose': purpose, 'created_at': timezone.now(), 'expires_at': expires_at})
-
-        system_info = AboutSystem.objects.first()
-        html_content = render_to_string('email/otp_verification_template.html', {'otp_code': otp_code, 'system_info': system_info})
+        # Mailed by a worker: success here means the request was accepted,
+        # not that the email was delivered.
+        with span("password"):
+            otp_hash = make_password(derive_otp(user.email, purpose, expires_at))
+        OTP.objects.update_or_create(user=user, defaults={'otp': otp_hash, 'is_verify': False, 'purpose': purpose, 'created_at': timezone.now(), 'expires_at': expires_at})
 
-        try:
-          send_email(
-                subject='Verification OTP',
-                body=f'Your OTP is {otp_code}. Expire in 3 minutes.',
-                to_emails=[user.email,],
-                from_email=settings.EMAIL_HOST_USER,
-                html_body=html_content
-                )
-        except:
-            raise serializers.ValidationError("SMTP NOT VALID!")
+        enqueue(email_otp, user.id, purpose, priority=10, max_attempts=3)
         return attrs
 
 class VerifyOTPSerializer(serializers.Serializer):
@@ -378,7 +367,8 @@ class ResetPasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError({'error': "Passwords do not match."})
 
         try:
-            validate_password(new_password, user)
+            with span("password"):
+                validate_password(new_password, user)
         except serializers.ValidationError as e:
             raise serializers.ValidationError({'error': str(e.messages)})
 
@@ -401,6 +391,14 @@ class UpdataProfileAvatarSerializer(serializers.ModelSerializer):
             'avatar': { 'write_only': True },
         }
 
+    def update(self, instance, validated_data):
+        # An uploaded avatar replaces any picture imported from a social account.
+        instance.avatar_source = None
+        return super().update(instance, validated_data)
+
+    def to_representation(self, instance):
+        return {'avatar': image_variant_urls(instance.avatar, instance.avatar_variants)}
+
 
 
 
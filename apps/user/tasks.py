@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from apps.jobs.queue import task
+from apps.system_setting.models import AboutSystem
+from apps.utils.helpers import send_email
+from apps.utils.timing import span
+
+from .models import OTP
+from .utils import derive_otp
+
+
+def send_otp_email(email, otp_code):
+    """
+    Render and send the OTP verification email.
+    """
+    system_info = AboutSystem.get_cached()
+    with span("template"):
+        html_content = render_to_string('email/otp_verification_template.html', {'otp_code': otp_code, 'system_info': system_info})
+    send_email(
+        subject='Verification OTP',
+        body=f'Your OTP is {otp_code}. Expire in 3 minutes.',
+        to_emails=[email,],
+        from_email=settings.EMAIL_HOST_USER,
+        html_body=html_content
+        )
+
+
+@task(email=True)
+def email_otp(user_id, purpose):
+    """
+    Mail the code of the user's pending OTP for `purpose`.
+
+    The code was fixed when the OTP was issued, so a retry resends the same
+    one. An OTP that was verified, reissued or has expired in the meantime
+    is mailed as it now stands, or not at all.
+    """
+    otp = OTP.objects.select_related('user').filter(user_id=user_id, purpose=purpose, is_verify=False).first()
+    if otp is None or otp.is_expired():
+        return
+    send_otp_email(otp.user.email, derive_otp(otp.user.email, otp.purpose, otp.expires_at))
@@ -0,0 +1,93 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+from apps.user.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(width, height, image_format='PNG', color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, format=image_format)
+    return SimpleUploadedFile(f'avatar.{image_format.lower()}', buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AvatarUploadTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="avatar@example.com", password="password123", term_and_condition_accepted=True)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('avatar-update')
+
+    def test_upload_stores_resized_variants(self):
+        response = self.client.post(self.url, {'avatar': make_image(1200, 800)}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(set(self.user.avatar_variants), {'48', '128', '512'})
+        self.assertEqual(self.user.avatar.name, self.user.avatar_variants['512'])
+        for size, name in self.user.avatar_variants.items():
+            with self.user.avatar.storage.open(name) as f, Image.open(f) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertEqual(max(image.size), int(size))
+        self.assertEqual(set(response.data['data']['avatar']), {'48', '128', '512'})
+
+    @override_settings(IMAGE_MAX_PIXELS=100 * 100)
+    def test_upload_rejects_oversized_image(self):
+        response = self.client.post(self.url, {'avatar': make_image(200, 200)}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.avatar)
+
+    def stored(self, variants):
+        return {name: self.user.avatar.storage.exists(name) for name in variants.values()}
+
+    def test_replacing_avatar_deletes_previous_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {'avatar': make_image(600, 600)}, format='multipart')
+        self.user.refresh_from_db()
+        first = self.user.avatar_variants
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {'avatar': make_image(600, 600, color='blue')}, format='multipart')
+        self.user.refresh_from_db()
+
+        self.assertEqual(set(self.stored(first).values()), {False})
+        self.assertEqual(set(self.stored(self.user.avatar_variants).values()), {True})
+
+    def test_variants_shared_with_another_user_are_kept(self):
+        other = User.objects.create_user(email="twin@example.com", password="password123", term_and_condition_accepted=True)
+        other.avatar = make_image(600, 600)
+        other.save()
+        self.user.avatar = make_image(600, 600)
+        self.user.save()
+        self.assertEqual(self.user.avatar_variants, other.avatar_variants)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.avatar = None
+            self.user.save()
+
+        self.assertEqual(set(self.stored(other.avatar_variants).values()), {True})
+
+    def test_failed_save_deletes_new_variants(self):
+        self.user.avatar = make_image(600, 600, color='green')
+        with mock.patch('django.contrib.auth.base_user.AbstractBaseUser.save', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.user.save()
+
+        self.assertEqual(set(self.stored(self.user.avatar_variants).values()), {False})
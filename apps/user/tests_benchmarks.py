@@ -0,0 +1,48 @@
+from django.http import HttpResponse
+from django.test import TestCase
+from rest_framework.response import Response
+
+from apps.user import benchmarks
+from apps.utils.benchmark import discover, measure
+
+
+class AuthBenchmarkTests(TestCase):
+    """
+    Each auth hot-path benchmark still exercises what its name says, and
+    survives a (minimal) measuring run.
+    """
+
+    def run_case(self, name):
+        func = discover()[name]()
+        result = measure(func, rounds=2, min_time=0)
+        self.assertGreater(result.median, 0)
+        return func()
+
+    def test_authenticate(self):
+        for name in ["auth.authenticate.header", "auth.authenticate.cookie"]:
+            with self.subTest(name):
+                user, token = self.run_case(name)
+                self.assertEqual(user.email, "bench-auth@example.invalid")
+                self.assertEqual(token["user_id"], user.id)
+
+    def test_user_agent_hash(self):
+        self.assertEqual(len(self.run_case("auth.user_agent_hash")), 64)
+
+    def test_refresh_token(self):
+        token = self.run_case("auth.refresh_token.for_user")
+        self.assertEqual(token["user_id"], benchmarks.bench_user().id)
+        self.assertIsNotNone(token["uah"])
+
+    def test_auth_responses(self):
+        web = self.run_case("auth.response.web")
+        self.assertIsInstance(web, Response)
+        self.assertEqual(set(web.cookies), {"access_token", "refresh_token"})
+        self.assertNotIn("tokens", web.data["data"])
+
+        mobile = self.run_case("auth.response.mobile")
+        self.assertEqual(set(mobile.data["data"]["tokens"]), {"access", "refresh"})
+        self.assertEqual(len(mobile.cookies), 0)
+
+        cookies = self.run_case("auth.set_auth_cookies")
+        self.assertIsInstance(cookies, HttpResponse)
+        self.assertTrue(cookies.cookies["access_token"]["httponly"])
@@ -0,0 +1,99 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import AsyncToSync, async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core import checks
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import path
+
+from apps.user.checks import check_async_middleware
+from apps.user.management.commands.bench_asgi import asgi_get
+from apps.user.middleware import ClientTypeMiddleware
+from apps.utils.middleware import MiddlewareChain
+
+
+def probe(request):
+    return HttpResponse(f"{request.client_type} {hasattr(request, 'session')}")
+
+
+async def async_probe(request):
+    return HttpResponse("ok")
+
+
+urlpatterns = [
+    path("api/probe/", probe),
+    path("api/async-probe/", async_probe),
+    path("admin-probe/", probe),
+]
+
+
+class ClientTypeMiddlewareTests(SimpleTestCase):
+    def test_sync_chain(self):
+        middleware = ClientTypeMiddleware(lambda request: HttpResponse(request.client_type))
+        request = RequestFactory().get("/", HTTP_X_CLIENT_TYPE="Mobile")
+
+        self.assertFalse(iscoroutinefunction(middleware))
+        self.assertEqual(middleware(request).content, b"mobile")
+        self.assertTrue(request.is_mobile_client)
+
+    def test_async_chain(self):
+        async def view(request):
+            return HttpResponse(request.client_type)
+
+        middleware = ClientTypeMiddleware(view)
+        request = RequestFactory().get("/", HTTP_X_CLIENT_TYPE="desktop")
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual(async_to_sync(middleware)(request).content, b"web")
+
+    @override_settings(MIDDLEWARE=[
+        "django.middleware.security.SecurityMiddleware",
+        "apps.user.middleware.ClientTypeMiddleware",
+        "whitenoise.middleware.WhiteNoiseMiddleware",
+    ])
+    def test_check_reports_sync_only_middleware(self):
+        messages = check_async_middleware(None)
+
+        self.assertEqual([m.obj for m in messages], ["whitenoise.middleware.WhiteNoiseMiddleware"])
+
+    def test_check_only_runs_on_deploy(self):
+        self.assertNotIn(check_async_middleware, checks.registry.registry.get_checks())
+        self.assertIn(check_async_middleware, checks.registry.registry.get_checks(include_deployment_checks=True))
+
+
+@override_settings(ROOT_URLCONF=__name__, API_PATH_PREFIXES=["/api/"])
+class PathScopedMiddlewareTests(SimpleTestCase):
+    # ProfilerMiddleware in the full stack reads ProfilerSetting.
+    databases = {"default"}
+
+    def test_api_paths_use_slim_chain(self):
+        response = self.client.get("/api/probe/", HTTP_X_CLIENT_TYPE="mobile")
+
+        self.assertEqual(response.content, b"mobile False")
+        self.assertNotIn("X-Frame-Options", response)
+
+    def test_other_paths_use_full_chain(self):
+        response = self.client.get("/admin-probe/", HTTP_X_CLIENT_TYPE="mobile")
+
+        self.assertEqual(response.content, b"mobile True")
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+
+    def test_chain_is_built_without_touching_settings(self):
+        # Swapping settings.MIDDLEWARE would leak into concurrent readers.
+        with mock.patch.object(type(settings), "__setattr__", side_effect=AssertionError("settings modified")):
+            chain = MiddlewareChain(["apps.user.middleware.ClientTypeMiddleware"])
+
+        self.assertEqual(chain(RequestFactory().get("/api/probe/", HTTP_X_CLIENT_TYPE="mobile")).content, b"mobile False")
+
+    def test_api_chain_stays_on_the_event_loop_under_asgi(self):
+        # WhiteNoise in the full chain is sync-only; /api/ must not inherit that
+        # and reach the async view through async_to_sync in a worker thread.
+        application = ASGIHandler()
+        with mock.patch.object(AsyncToSync, "__call__", autospec=True, side_effect=AsyncToSync.__call__) as hops:
+            code = asyncio.run(asgi_get(application, "/api/async-probe/", []))
+
+        self.assertEqual(code, 200)
+        self.assertEqual(hops.call_count, 0)
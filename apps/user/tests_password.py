@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from apps.user.password_validation import CompactCommonPasswordValidator
+
+
+class CompactCommonPasswordValidatorTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.index_path = os.path.join(self.root, "var", "common-passwords.idx")
+        call_command("build_password_index", output=self.index_path, stdout=StringIO())
+
+    def test_common_passwords_are_rejected(self):
+        validator = CompactCommonPasswordValidator(index_path=self.index_path)
+
+        for password in ["password", "  Password123 ", "qwerty"]:
+            with self.assertRaises(ValidationError) as ctx:
+                validator.validate(password)
+            self.assertEqual(ctx.exception.code, "password_too_common")
+        validator.validate("correct horse battery staple 42!")
+
+    def test_missing_index_falls_back_to_password_list(self):
+        with self.assertLogs("apps.user.password_validation", "WARNING"):
+            validator = CompactCommonPasswordValidator(index_path=os.path.join(self.root, "missing.idx"))
+
+        with self.assertRaises(ValidationError):
+            validator.validate("password")
+
+    def test_foreign_file_falls_back_to_password_list(self):
+        path = os.path.join(self.root, "other.idx")
+        with open(path, "wb") as f:
+            f.write(b"not an index at all")
+
+        with self.assertLogs("apps.user.password_validation", "ERROR"):
+            validator = CompactCommonPasswordValidator(index_path=path)
+
+        with self.assertRaises(ValidationError):
+            validator.validate("password")
+        validator.validate("correct horse battery staple 42!")
+
+    def test_truncated_index_falls_back_to_password_list(self):
+        with open(self.index_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.index_path) - 3)
+
+        with self.assertLogs("apps.user.password_validation", "ERROR"):
+            validator = CompactCommonPasswordValidator(index_path=self.index_path)
+
+        with self.assertRaises(ValidationError):
+            validator.validate("password")
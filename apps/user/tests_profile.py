@@ -0,0 +1,49 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from apps.user.models import User, UserProfile
+
+
+class AsyncProfileViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="profile@example.com", password="password123", full_name="Old Name", term_and_condition_accepted=True)
+        UserProfile.objects.create(user=self.user, phone="0123456789")
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}", HTTP_X_CLIENT_TYPE="mobile")
+
+    def test_get_profile_with_bearer_token(self):
+        response = self.client.get(reverse('get-profile'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['email'], "profile@example.com")
+        self.assertEqual(response.data['data']['phone'], "0123456789")
+
+    def test_get_profile_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get(reverse('get-profile'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_profile_rejects_inactive_user(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(reverse('get-profile'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_profile(self):
+        response = self.client.put(reverse('profile-update'), {'full_name': "New Name"}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.full_name, "New Name")
+
+    def test_verify_and_refresh_tokens(self):
+        response = self.client.post(reverse('token_verify'), {'token': str(self.refresh.access_token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('token_verify'), {'token': "not-a-token"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,79 @@
+import re
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core import mail
+from django.db import IntegrityError
+from django.urls import reverse
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, run_job
+from apps.user.models import User, UserProfile, OTP
+from apps.user.tasks import email_otp
+from apps.utils.metrics import queued_emails
+
+
+class SignUpViewTests(APITestCase):
+    def setUp(self):
+        self.signup_url = reverse('signup')
+        self.data = {
+            "email": "new@example.com",
+            "password": "password123",
+            "full_name": "New User",
+            "purpose": "create_account",
+            "term_and_condition_accepted": True,
+        }
+
+    def test_signup_creates_rows_and_queues_otp_email(self):
+        response = self.client.post(self.signup_url, self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(email=self.data["email"])
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+        self.assertTrue(OTP.objects.filter(user=user, purpose="create_account").exists())
+        # Nothing is sent inside the request.
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(queued_emails(), {(): 1})
+
+        otp = OTP.objects.get(user=user)
+        job = claim_job("test-worker")
+        self.assertEqual(job.name, "apps.user.tasks.email_otp")
+        # Only who and what for is queued, never the code.
+        self.assertEqual(job.args, [user.id, "create_account"])
+        self.assertTrue(run_job(job))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.data["email"]])
+        code = re.search(r"Your OTP is (\d+)", mail.outbox[0].body).group(1)
+        otp.refresh_from_db()
+        self.assertTrue(otp.check_otp(code))
+
+    def test_retried_email_resends_the_same_code(self):
+        self.client.post(self.signup_url, self.data)
+        user = User.objects.get(email=self.data["email"])
+
+        email_otp(user.id, "create_account")
+        email_otp(user.id, "create_account")
+
+        codes = {re.search(r"Your OTP is (\d+)", message.body).group(1) for message in mail.outbox}
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(len(codes), 1)
+        self.assertTrue(OTP.objects.get(user=user).check_otp(codes.pop()))
+
+    def test_signup_duplicate_email(self):
+        self.client.post(self.signup_url, self.data)
+        Job.objects.all().delete()
+
+        response = self.client.post(self.signup_url, self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['field'], 'email')
+        self.assertEqual(User.objects.filter(email=self.data["email"]).count(), 1)
+        # The rolled back transaction took its queued email with it.
+        self.assertFalse(Job.objects.exists())
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        with mock.patch.object(UserProfile.objects, "create", side_effect=IntegrityError("NOT NULL constraint failed")):
+            with self.assertRaises(IntegrityError):
+                self.client.post(self.signup_url, self.data)
+
+        self.assertFalse(User.objects.filter(email=self.data["email"]).exists())
@@ -1,14 +1,31 @@
 import secrets
+import logging
 from django.core.mail import EmailMessage
 from django.conf import settings
+from django.utils.crypto import salted_hmac
 import hashlib
 from apps.utils.helpers import success
 
 
+logger = logging.getLogger(__name__)
+
+
 def generate_otp(length=6):
     digits = '0123456789'
     return ''.join(secrets.choice(digits) for _ in range(length))
 
+
+def derive_otp(email, purpose, expires_at, length=6):
+    """
+    The code of the OTP issued to `email` for `purpose` until `expires_at`,
+    keyed on SECRET_KEY. The request that issues the OTP stores its hash and
+    every attempt of the email job derives the same code, so the plaintext
+    is never stored or queued.
+    """
+    value = f"{email}:{purpose}:{expires_at.timestamp():.6f}"
+    digest = salted_hmac("apps.user.utils.derive_otp", value, algorithm="sha256").hexdigest()
+    return str(int(digest, 16) % 10 ** length).zfill(length)
+
 def send_normal_mail(data):
     email = EmailMessage(
         subject=data['subject'],
@@ -18,6 +35,13 @@ def send_normal_mail(data):
     )
     email.send()
 
+def log_signup(user_id, ip_address):
+    """
+    Audit record for a committed sign-up.
+    """
+    logger.info("signup user_id=%s ip=%s", user_id, ip_address)
+
+
 def get_client_ip(request):
     """
     Get the client authentication IP address from specific request object.
@@ -1,3 +1,5 @@
+from asgiref.sync import sync_to_async
+from django.utils import timezone
 from .models import User, UserProfile
 from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
@@ -26,10 +28,14 @@ from .serializers import (
     UpdataProfileAvatarSerializer,
 )
 
+from apps.utils.async_views import AsyncAPIView, AsyncAPIViewMixin
 from apps.utils.helpers import success, error
+from apps.utils.images import image_variant_urls
+from apps.utils.query_budget import query_budget
 
 
 # Create your views here.
+@query_budget(8)
 class SignUpView(APIView):
     permission_classes = []
 
@@ -58,6 +64,7 @@ class SignUpView(APIView):
             return response
         raise ValidationError(serializer.errors)
 
+@query_budget(3)
 class SignInView(APIView):
 
     permission_classes = []
@@ -87,6 +94,8 @@ class SignInView(APIView):
         raise ValidationError(serializer.errors)
 
 
+# simplejwt's blacklist() looks the user up again.
+@query_budget(9, max_duplicates=1)
 class SignOutView(APIView):
   
     
@@ -120,6 +129,7 @@ class SignOutView(APIView):
 
 
 
+@query_budget(3)
 class ChangePasswordView(APIView):
     
     permission_classes = [IsAuthenticated]
@@ -132,30 +142,33 @@ class ChangePasswordView(APIView):
             return success(data=[], message="Password change successfully.", status_code=status.HTTP_200_OK)
         raise ValidationError(serializer.errors)
 
+@query_budget(9)
 class SendOTPView(APIView):
     permission_classes = []
 
     def post(self, request):
         serializer = SendOTPSerializer(data=request.data)
         if serializer.is_valid():
-            return success(data=[], message="OTP send to mail successfully.", status_code=status.HTTP_200_OK)
+            return success(data=[], message="OTP will be sent to your email shortly.", status_code=status.HTTP_200_OK)
         errors = serializer.errors
         if "email" in errors:
             errors["error"] = errors.pop("email")
         raise ValidationError(errors)
 
+@query_budget(10)
 class ResendOTPView(APIView):
     permission_classes = []
 
     def post(self, request):
         serializer = ResendOTPSerializer(data=request.data)
         if serializer.is_valid():
-            return success(data=[], message="OTP send to mail successfully.", status_code=status.HTTP_200_OK)
+            return success(data=[], message="OTP will be sent to your email shortly.", status_code=status.HTTP_200_OK)
         errors = serializer.errors
         if "email" in errors:
             errors["error"] = errors.pop("email")
         raise ValidationError(errors)
 
+@query_budget(4)
 class VerifyOTPView(APIView):
     permission_classes = []
 
@@ -167,6 +180,7 @@ class VerifyOTPView(APIView):
         return error(message="OTP verify is failed.", status_code=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
 
 
+@query_budget(5)
 class ResetPasswordView(APIView):
     permission_classes = []
 
@@ -182,6 +196,9 @@ class ResetPasswordView(APIView):
 
 
 
+# Two of these are the savepoint the variant cleanup takes inside an
+# enclosing transaction (see apps.utils.images.replacing_image_variants).
+@query_budget(5)
 class UpdataProfileAvatarView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
@@ -196,33 +213,31 @@ class UpdataProfileAvatarView(APIView):
         return error(message="Profile avatar update failed.", status_code=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
 
 
-class UpdateProfileView(APIView):
+@query_budget(3)
+class UpdateProfileView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
 
-    def put(self, request):
+    async def put(self, request):
         user = request.user
 
-        try:
-            user = User.objects.get(id=user.id)
-            name = request.data.get('full_name', '')
-            user.full_name = name
-            user.save()
-            return success(data={'full_name': user.full_name}, message="Profile update successfully.", status_code=status.HTTP_200_OK)
-        except User.DoesNotExist:
+        name = request.data.get('full_name', '')
+        updated = await User.objects.filter(id=user.id).aupdate(full_name=name, updated_at=timezone.now())
+        if not updated:
             return error(message="Profile update failed.", status_code=status.HTTP_400_BAD_REQUEST, errors={"error": "User does not exist."})
+        return success(data={'full_name': name}, message="Profile update successfully.", status_code=status.HTTP_200_OK)
 
 
-class GetProfileView(APIView):
+@query_budget(3)
+class GetProfileView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
 
-        try:
-            profile = user.user_profile
-        except UserProfile.DoesNotExist:
+        profile = await UserProfile.objects.filter(user=user).afirst()
+        if profile is None:
             return success(
                 data={},
                 message="Profile not found.",
@@ -233,13 +248,15 @@ class GetProfileView(APIView):
             'user_id': user.id,
             'email': user.email,
             'full_name': user.full_name,
+            'avatar': image_variant_urls(user.avatar, user.avatar_variants),
             'phone': profile.phone,
             'dob': profile.dob,
         }
         return success(data=data, message="Profile get successfully.", status_code=status.HTTP_200_OK)
 
 
-class CookieTokenRefreshView(TokenRefreshView):
+@query_budget(3)
+class CookieTokenRefreshView(AsyncAPIViewMixin, TokenRefreshView):
     """
     Hybrid Token Refresh View
     
@@ -248,7 +265,7 @@ class CookieTokenRefreshView(TokenRefreshView):
     - Mobile: Reads refresh token from request body, returns new tokens in response body
     """
     
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         # Inject refresh token from cookie into data if not present (for web clients)
         data = request.data.copy()
         if 'refresh' not in data and 'refresh_token' in request.COOKIES:
@@ -256,8 +273,9 @@ class CookieTokenRefreshView(TokenRefreshView):
         
         serializer = self.get_serializer(data=data)
 
+        # Validation checks and updates the token blacklist, so it runs in a thread.
         try:
-            serializer.is_valid(raise_exception=True)
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
         except TokenError as e:
             raise InvalidToken(e.args[0])
 
@@ -281,7 +299,8 @@ class CookieTokenRefreshView(TokenRefreshView):
         return response
 
 
-class CookieTokenVerifyView(TokenVerifyView):
+@query_budget(1)
+class CookieTokenVerifyView(AsyncAPIViewMixin, TokenVerifyView):
     """
     Hybrid Token Verify View
     
@@ -290,7 +309,7 @@ class CookieTokenVerifyView(TokenVerifyView):
     - Mobile: Reads token from request body
     """
     
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         # Inject access token from cookie into data if not present (for web clients)
         data = request.data.copy()
         if 'token' not in data and 'access_token' in request.COOKIES:
@@ -298,13 +317,10 @@ class CookieTokenVerifyView(TokenVerifyView):
         
         serializer = self.get_serializer(data=data)
 
+        # Validation may look the token up in the blacklist, so it runs in a thread.
         try:
-            serializer.is_valid(raise_exception=True)
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
         except TokenError as e:
             raise InvalidToken(e.args[0])
         
         return success(data=[], message="Token is valid.", status_code=status.HTTP_200_OK)
-
-
-
-
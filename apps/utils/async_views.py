@@ -0,0 +1,81 @@
+# utils/async_views.py
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.views import APIView
+
+
+class AsyncAPIViewMixin:
+    """
+    Lets a DRF view declare `async def` handlers.
+
+    DRF only dispatches synchronously, so under ASGI every request would be
+    pushed to a worker thread. This dispatch stays on the event loop:
+    authenticators with an `aauthenticate` coroutine are awaited, any other
+    authenticator is run through `sync_to_async`, and handlers are awaited.
+    Blocking work inside a handler must be offloaded explicitly.
+    """
+
+    async def perform_aauthentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        # Resolve request.user here so the sync permission checks below
+        # never touch the database from the event loop.
+        await self.perform_aauthentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncAPIViewMixin, APIView):
+    pass
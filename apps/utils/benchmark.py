@@ -0,0 +1,114 @@
+# utils/benchmark.py
+
+"""
+Microbenchmarks for per-call hot paths.
+
+Apps declare cases in a `benchmarks.py` module with the `benchmark`
+decorator. A case is a setup function that builds its inputs and returns
+the zero-argument callable to time. `manage.py benchmark` runs them, and
+can save the results as a JSON baseline or compare against one.
+"""
+import json
+import os
+import platform
+import statistics
+import timeit
+from dataclasses import asdict, dataclass
+
+import django
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+
+REGISTRY = {}
+
+
+def benchmark(name=None):
+    def decorator(setup):
+        REGISTRY[name or f"{setup.__module__}.{setup.__qualname__}"] = setup
+        return setup
+    return decorator
+
+
+def discover():
+    autodiscover_modules("benchmarks")
+    return REGISTRY
+
+
+@dataclass
+class Result:
+    """
+    Seconds per call over `rounds` rounds of `number` calls each.
+    """
+    median: float
+    min: float
+    mean: float
+    stddev: float
+    rounds: int
+    number: int
+
+
+def measure(func, rounds=7, min_time=0.05):
+    """
+    Time `func` the way timeit does (gc off), with the calls per round
+    doubled until one round takes at least `min_time` seconds. The
+    calibration rounds double as warm-up.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    per_call = [timer.timeit(number) / number for _ in range(rounds)]
+    return Result(
+        median=statistics.median(per_call),
+        min=min(per_call),
+        mean=statistics.fmean(per_call),
+        stddev=statistics.stdev(per_call) if rounds > 1 else 0.0,
+        rounds=rounds,
+        number=number,
+    )
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "created_at": timezone.now().isoformat(),
+        "machine": machine_info(),
+        "benchmarks": {name: asdict(result) for name, result in results.items()},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    data["benchmarks"] = {name: Result(**values) for name, values in data["benchmarks"].items()}
+    return data
+
+
+def compare(results, baseline, tolerance):
+    """
+    One row per benchmark in both sets: (name, baseline median, current
+    median, relative change, regressed). A benchmark regresses when its
+    median per-call time grew by more than `tolerance` (0.15 = 15%).
+    """
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = result.median / before.median - 1
+        rows.append((name, before.median, result.median, change, change > tolerance))
+    return rows
@@ -1,8 +1,22 @@
 # project/custom_exception.py
+from rest_framework import status
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler as drf_exception_handler
 
+from apps.utils.db import is_statement_timeout
+
+
+class QueryDeadlineExceeded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The request took too long to complete. Please try again."
+    default_code = "query_deadline_exceeded"
+
 
 def custom_exception_handler(exc, context):
+    # A query outran the view's statement_timeout
+    if is_statement_timeout(exc):
+        exc = QueryDeadlineExceeded()
+
     # Get default DRF response
     response = drf_exception_handler(exc, context)
 
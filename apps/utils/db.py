@@ -0,0 +1,231 @@
+# utils/db.py
+
+import contextvars
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.signals import connection_created
+
+from apps.utils.metrics import DB_CONNECTIONS_CREATED, DB_POOL_CONNECTIONS, DB_POOL_REQUESTS_WAITING, DB_POOL_WAIT_SECONDS
+
+
+class ConnectionStats:
+    """
+    Counts Django-level connects per alias. With persistent connections
+    this stays flat; a count that tracks the request rate means every
+    request pays for TCP setup, auth and a backend fork. With a pool it
+    counts checkouts, and the pool's connections_num counts real opens.
+    """
+
+    def __init__(self):
+        self.created = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, sender, connection, **kwargs):
+        with self.lock:
+            self.created[connection.alias] += 1
+        DB_CONNECTIONS_CREATED.labels(connection.alias).inc()
+        # With a pool this runs on every checkout, which keeps the gauges fresh.
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            record_pool_metrics(connection.alias, pool_stats(pool))
+
+
+connection_stats = ConnectionStats()
+connection_created.connect(connection_stats.record, dispatch_uid="apps.utils.db.connection_stats")
+
+
+POOL_STATS = (
+    "pool_min", "pool_max", "pool_size", "pool_available",
+    "requests_num", "requests_waiting", "requests_wait_ms", "requests_errors",
+    "connections_num", "connections_lost",
+)
+
+
+def pool_stats(pool):
+    # get_stats() leaves out counters that are still zero.
+    stats = pool.get_stats()
+    return {name: stats.get(name, 0) for name in POOL_STATS}
+
+
+def record_pool_metrics(alias, stats):
+    """
+    Publish this process's pool state for `alias` to the shared metrics,
+    where /internal/metrics sums it over the workers.
+    """
+    DB_POOL_CONNECTIONS.labels(alias, "open").set(stats["pool_size"])
+    DB_POOL_CONNECTIONS.labels(alias, "idle").set(stats["pool_available"])
+    DB_POOL_REQUESTS_WAITING.labels(alias).set(stats["requests_waiting"])
+    DB_POOL_WAIT_SECONDS.labels(alias).set(stats["requests_wait_ms"] / 1000)
+
+
+def get_database_stats():
+    """
+    Per-alias connection churn, plus psycopg_pool counters when DATABASES
+    enables OPTIONS["pool"]. requests_wait_ms is the total time callers
+    waited for a pooled connection. Pool counters are also published as
+    metrics.
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        alias_stats = {"connections_created": connection_stats.created[alias]}
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            alias_stats.update(pool_stats(pool))
+            record_pool_metrics(alias, alias_stats)
+        stats[alias] = alias_stats
+    return stats
+
+
+class ReplicaState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_replica_state = contextvars.ContextVar("replica_state", default=None)
+
+
+@contextmanager
+def use_primary():
+    """
+    Send every read in this block to the primary, e.g. in job workers where
+    replica lag could hand out stale rows.
+    """
+    token = _replica_state.set(ReplicaState(pinned=True))
+    try:
+        yield
+    finally:
+        _replica_state.reset(token)
+
+
+@contextmanager
+def replica_request(pinned):
+    """
+    Track one request: `pinned` requests read from the primary, and so does
+    the rest of a request once it has written. Yields the state so the
+    caller can see whether a write happened.
+    """
+    state = ReplicaState(pinned=pinned)
+    token = _replica_state.set(state)
+    try:
+        yield state
+    finally:
+        _replica_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary and reads to a random alias from
+    DATABASE_REPLICAS, except inside a transaction on the primary, after
+    the current request has written, or while the client is pinned by
+    ReplicaStickinessMiddleware.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        state = _replica_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _replica_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class RequestBudget:
+    def __init__(self, milliseconds=None):
+        self.milliseconds = milliseconds
+
+
+_request_budget = contextvars.ContextVar("request_budget", default=None)
+
+
+def statement_timeout(milliseconds):
+    """
+    Give a function view its own database time budget. Class-based views
+    set a `statement_timeout` attribute instead; 0 means no limit.
+    """
+    def decorator(view_func):
+        view_func.statement_timeout = milliseconds
+        return view_func
+    return decorator
+
+
+@contextmanager
+def request_budget(milliseconds):
+    budget = RequestBudget(milliseconds)
+    token = _request_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _request_budget.reset(token)
+
+
+def apply_statement_timeout(execute, sql, params, many, context):
+    """
+    Execute wrapper for PostgreSQL connections: before a query, bring the
+    session's statement_timeout in line with the current request's budget
+    (or the server default outside requests).
+
+    The wrapper remembers what it last SET, so consecutive queries with the
+    same budget pay nothing. That memory is cleared whenever the wrapper
+    connects or checks a connection out of the pool (see
+    install_statement_timeout): a pooled or reused connection may carry
+    whatever timeout its previous user left, so the first query always
+    SETs. A SET inside a transaction is undone by a rollback, so one made
+    there is repeated after the transaction ends.
+    """
+    connection = context["connection"]
+    budget = _request_budget.get()
+    milliseconds = budget.milliseconds if budget is not None else None
+    applied = getattr(connection, "_statement_timeout", None)
+    if applied is None or applied[0] != milliseconds or (applied[1] and not connection.in_atomic_block):
+        value = "DEFAULT" if milliseconds is None else int(milliseconds)
+        context["cursor"].cursor.execute(f"SET statement_timeout TO {value}")
+        connection._statement_timeout = (milliseconds, connection.in_atomic_block)
+    return execute(sql, params, many, context)
+
+
+def install_statement_timeout(sender, connection, **kwargs):
+    if connection.vendor != "postgresql":
+        return
+    # Sent on every connect, including each pool checkout.
+    connection._statement_timeout = None
+    if apply_statement_timeout not in connection.execute_wrappers:
+        connection.execute_wrappers.append(apply_statement_timeout)
+
+
+connection_created.connect(install_statement_timeout, dispatch_uid="apps.utils.db.statement_timeout")
+
+
+def is_statement_timeout(exc):
+    """
+    True for PostgreSQL's query_canceled error, which is what an exceeded
+    statement_timeout raises.
+    """
+    if not isinstance(exc, OperationalError):
+        return False
+    cause = exc.__cause__
+    return "57014" in (getattr(cause, "pgcode", None), getattr(cause, "sqlstate", None))
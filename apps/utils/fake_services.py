@@ -0,0 +1,172 @@
+# utils/fake_services.py
+
+"""
+Local stand-ins for the external services the API talks to, so load
+tests run offline: an SMTP server that keeps what it receives, and a
+Google endpoint that accepts any access token.
+"""
+import email
+import json
+import re
+import socketserver
+import threading
+import time
+from email import policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+OTP_PATTERN = re.compile(r"Your OTP is (\d+)")
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough ESMTP for smtplib without TLS or AUTH.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost ESMTP stand-in")
+        recipients = []
+        while line := self.rfile.readline():
+            command = line.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.partition(":")[2].strip().strip("<>").lower())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.server.mailbox.deliver(recipients, self.read_data())
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:  # RSET, NOOP
+                self.reply("250 OK")
+
+    def read_data(self):
+        lines = []
+        while (line := self.rfile.readline()) not in (b".\r\n", b".\n", b""):
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+
+class Mailbox:
+    """
+    Messages received by the SMTP stand-in, by recipient.
+    """
+
+    def __init__(self):
+        self.messages = {}
+        self.condition = threading.Condition()
+
+    def deliver(self, recipients, data):
+        message = email.message_from_bytes(data, policy=policy.default)
+        with self.condition:
+            for recipient in recipients:
+                self.messages.setdefault(recipient, []).append(message)
+            self.condition.notify_all()
+
+    def count(self, recipient):
+        with self.condition:
+            return len(self.messages.get(recipient.lower(), []))
+
+    def wait_for_otp(self, recipient, seen=0, timeout=10):
+        """
+        The OTP in the first message to `recipient` after the first `seen`,
+        waiting up to `timeout` seconds for it to arrive.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                messages = self.messages.get(recipient.lower(), [])
+                for message in messages[seen:]:
+                    match = OTP_PATTERN.search(message.get_body(("plain",)).get_content())
+                    if match:
+                        return match.group(1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No OTP mail for {recipient} within {timeout}s")
+                self.condition.wait(remaining)
+
+
+class GoogleHandler(BaseHTTPRequestHandler):
+    """
+    Google's userinfo and JWKS endpoints. An access token of
+    `loadtest:<email>` signs in as that address.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/userinfo"):
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not token.startswith("loadtest:"):
+                return self.send_json(401, {"error": "invalid_token"})
+            address = token.removeprefix("loadtest:")
+            return self.send_json(200, {"email": address, "email_verified": True, "name": address.split("@")[0]})
+        if self.path.startswith("/certs"):
+            return self.send_json(200, {"keys": []})
+        self.send_json(404, {"error": "not_found"})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeServices:
+    """
+    Runs both stand-ins on free local ports for the life of the block.
+    """
+
+    def __init__(self, host="127.0.0.1"):
+        self.host = host
+        self.mailbox = Mailbox()
+
+    def __enter__(self):
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.smtp = socketserver.ThreadingTCPServer((self.host, 0), SMTPHandler)
+        self.smtp.daemon_threads = True
+        self.smtp.mailbox = self.mailbox
+        self.google = ThreadingHTTPServer((self.host, 0), GoogleHandler)
+        self.google.daemon_threads = True
+        for server in (self.smtp, self.google):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for server in (self.smtp, self.google):
+            server.shutdown()
+            server.server_close()
+
+    @property
+    def smtp_port(self):
+        return self.smtp.server_address[1]
+
+    @property
+    def google_url(self):
+        return f"http://{self.host}:{self.google.server_address[1]}"
+
+    def environ(self):
+        """
+        Settings, as environment variables, that point the API at these
+        stand-ins (see project.settings.loadtest).
+        """
+        return {
+            "LOADTEST_SMTP_HOST": self.host,
+            "LOADTEST_SMTP_PORT": str(self.smtp_port),
+            "GOOGLE_USERINFO_URL": f"{self.google_url}/userinfo",
+            "GOOGLE_JWKS_URL": f"{self.google_url}/certs",
+        }
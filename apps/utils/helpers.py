@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.core.mail import EmailMultiAlternatives
 
+from apps.utils.timing import span
+
 
 def success(data=None, message="Success", status_code=status.HTTP_200_OK):
     return Response({
@@ -39,4 +41,6 @@ def send_email(subject, body, to_emails, from_email=None, html_body=None, attach
     if html_body:
         email.attach_alternative(html_body, "text/html")    
     # Send the email
-    email.send()
\ No newline at end of file
+    with span("email"):
+        email.send()
+
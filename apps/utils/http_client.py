@@ -0,0 +1,180 @@
+# utils/http_client.py
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from apps.utils.metrics import HTTP_CLIENT_DURATION, HTTP_CLIENT_REQUESTS
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised without touching the network while a host's circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and lets a single
+    trial request through once `reset_timeout` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: push the deadline forward so only one trial goes out.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed, failed):
+        with self.lock:
+            self.requests += 1
+            self.failures += failed
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'avg_ms': round(self.total_seconds / self.requests * 1000, 2) if self.requests else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 2),
+        }
+
+
+class HTTPClient:
+    """
+    Shared outbound HTTP client: one keep-alive pool per host, default
+    connect/read timeouts, a circuit breaker per host and latency stats.
+    """
+
+    def __init__(self, connect_timeout=3.0, read_timeout=5.0, pool_maxsize=10,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.breakers = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self.stats[host] = HostStats()
+            return self.breakers[host], self.stats[host]
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).netloc
+        breaker, stats = self._host_state(host)
+        if not breaker.allow():
+            stats.reject()
+            HTTP_CLIENT_REQUESTS.labels(host, 'rejected').inc()
+            raise CircuitOpenError(f'Circuit open for {host}')
+
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            elapsed = time.perf_counter() - start
+            breaker.record_failure()
+            stats.record(elapsed, failed=True)
+            HTTP_CLIENT_REQUESTS.labels(host, 'error').inc()
+            HTTP_CLIENT_DURATION.labels(host).observe(elapsed)
+            raise
+
+        elapsed = time.perf_counter() - start
+        failed = response.status_code >= 500
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        stats.record(elapsed, failed)
+        HTTP_CLIENT_REQUESTS.labels(host, 'failed' if failed else 'ok').inc()
+        HTTP_CLIENT_DURATION.labels(host).observe(elapsed)
+
+        logger.debug('%s %s -> %s in %.1f ms', method, url, response.status_code, elapsed * 1000)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self):
+        with self.lock:
+            return {host: stats.as_dict() for host, stats in self.stats.items()}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Process-wide client configured from the HTTP_CLIENT_* settings.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient(
+                    connect_timeout=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+                    read_timeout=settings.HTTP_CLIENT_READ_TIMEOUT,
+                    pool_maxsize=settings.HTTP_CLIENT_POOL_MAXSIZE,
+                    failure_threshold=settings.HTTP_CLIENT_FAILURE_THRESHOLD,
+                    reset_timeout=settings.HTTP_CLIENT_RESET_TIMEOUT,
+                )
+    return _client
@@ -0,0 +1,174 @@
+# utils/images.py
+
+import io
+import logging
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from uuid import uuid4
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import router, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+FORMAT_EXTENSIONS = {
+    'WEBP': 'webp',
+    'PNG': 'png',
+    'JPEG': 'jpg',
+}
+
+
+def get_max_pixels():
+    return getattr(settings, 'IMAGE_MAX_PIXELS', 25_000_000)
+
+
+def _read_dimensions(file):
+    """
+    Read the image size from the header only, without decoding pixels.
+    """
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            return image.size
+    except Image.DecompressionBombError:
+        raise ValidationError('Image is too large.')
+    except (OSError, SyntaxError):
+        raise ValidationError('Upload a valid image.')
+    finally:
+        file.seek(0)
+
+
+def validate_image_pixels(value):
+    """
+    Model field validator rejecting decompression bombs before they are decoded.
+    Files already stored are skipped so unchanged admin forms stay cheap.
+    """
+    if not value or getattr(value, '_committed', False):
+        return
+
+    width, height = _read_dimensions(value)
+    if width * height > get_max_pixels():
+        raise ValidationError(f'Image is too large ({width}x{height} pixels).')
+
+
+def build_image_variants(field_file, sizes, image_format='WEBP', quality=82):
+    """
+    Decode an uncommitted upload once and store one resized copy per size.
+
+    The field is repointed at the largest variant, so the full-resolution
+    original is never written. Returns {"<size>": "<storage name>"}.
+    """
+    image_format = image_format.upper()
+    extension = FORMAT_EXTENSIONS[image_format]
+    sizes = sorted(set(sizes), reverse=True)
+
+    width, height = _read_dimensions(field_file)
+    if width * height > get_max_pixels():
+        raise ValidationError(f'Image is too large ({width}x{height} pixels).')
+
+    encoded = {}
+    with Image.open(field_file) as image:
+        # JPEG can decode straight at a reduced scale, bounding peak memory.
+        image.draft('RGB', (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha and image_format != 'JPEG' else 'RGB')
+
+        # Each size is downscaled from the previous, larger one.
+        for size in sizes:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format, quality=quality, optimize=True)
+            encoded[size] = buffer.getvalue()
+
+    instance, field = field_file.instance, field_file.field
+    stem = uuid4().hex
+    variants = {}
+    for size, data in encoded.items():
+        name = field.generate_filename(instance, f'{stem}_{size}.{extension}')
+        variants[str(size)] = field.storage.save(name, ContentFile(data))
+
+    setattr(instance, field.attname, variants[str(sizes[0])])
+    return variants
+
+
+def discard_image_variants(model, pk, field_name, variants, keep=()):
+    """
+    Delete stored variants that no longer back an image, except `keep`.
+
+    Content-addressed storage shares identical uploads between rows, so the
+    files stay while another row's field points at the largest variant; the
+    smaller ones were cut from the same bytes and are shared with it.
+    """
+    names = [name for name in variants.values() if name not in set(keep)]
+    if not names:
+        return
+    largest = variants[max(variants, key=int)]
+    if model._default_manager.filter(**{field_name: largest}).exclude(pk=pk).exists():
+        return
+    storage = model._meta.get_field(field_name).storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning("Could not delete image variant %s", name, exc_info=True)
+
+
+@contextmanager
+def replacing_image_variants(instance, replaced):
+    """
+    Wrap a model save after build_image_variants. `replaced` maps each image
+    field whose `<field>_variants` changed to the variants it had before.
+
+    If the save fails, the new variants are deleted; once it commits, the
+    replaced ones are.
+    """
+    replaced = {name: previous for name, previous in replaced.items() if previous or getattr(instance, f'{name}_variants')}
+    if not replaced:
+        yield
+        return
+
+    model = type(instance)
+    using = router.db_for_write(model, instance=instance)
+    # Inside a transaction a failed write aborts it; a savepoint keeps the
+    # cleanup's query possible. In autocommit there is nothing to protect.
+    guard = transaction.atomic(using=using) if transaction.get_connection(using).in_atomic_block else nullcontext()
+    try:
+        with guard:
+            yield
+    except Exception:
+        for name, previous in replaced.items():
+            discard_image_variants(model, instance.pk, name, getattr(instance, f'{name}_variants'), keep=previous.values())
+        raise
+
+    for name, previous in replaced.items():
+        current = getattr(instance, f'{name}_variants')
+        transaction.on_commit(partial(discard_image_variants, model, instance.pk, name, previous, keep=current.values()), robust=True)
+
+
+def image_variant_url(field_file, variants, size):
+    """
+    URL of the smallest stored variant at least `size` pixels wide.
+    Falls back to the field itself for images stored before variants existed.
+    """
+    if not field_file:
+        return None
+    if not variants:
+        return field_file.url
+
+    available = sorted(int(key) for key in variants)
+    chosen = next((s for s in available if s >= size), available[-1])
+    return field_file.storage.url(variants[str(chosen)])
+
+
+def image_variant_urls(field_file, variants):
+    if not field_file:
+        return None
+    if not variants:
+        return {'original': field_file.url}
+    return {key: field_file.storage.url(name) for key, name in variants.items()}
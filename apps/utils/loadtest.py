@@ -0,0 +1,318 @@
+# utils/loadtest.py
+
+"""
+Scenario load tests built from the Postman collection.
+
+Each Postman request becomes a template (method, path, headers, form
+fields). A scenario is a weighted list of steps that fill those templates
+from per-user variables, the way the collection's {{email}}/{{token}}
+variables are meant to be used. Virtual users pick scenarios by weight
+and run them back to back; every request is timed per endpoint.
+"""
+import io
+import json
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+import requests
+from PIL import Image
+
+
+VARIABLE = re.compile(r"\{\{(\w+)\}\}")
+
+# Virtual users are mobile clients (the collection's X-Client-Type header,
+# which it ships disabled): tokens come back in the body, not in Secure
+# cookies that a plain-HTTP local server could not round-trip.
+CLIENT_HEADERS = {"X-Client-Type": "mobile"}
+
+
+@dataclass
+class RequestTemplate:
+    name: str
+    method: str
+    path: str
+    headers: dict
+    fields: dict
+    files: list
+
+
+def load_collection(path):
+    """
+    The collection's requests by name, with `{{base_url}}` stripped from
+    their URLs and disabled form fields left out.
+    """
+    with open(path) as f:
+        collection = json.load(f)
+
+    templates = {}
+
+    def walk(items):
+        for item in items:
+            if "item" in item:
+                walk(item["item"])
+                continue
+            request = item["request"]
+            url = request["url"]["raw"] if isinstance(request["url"], dict) else request["url"]
+            formdata = [f for f in request.get("body", {}).get("formdata", []) if not f.get("disabled")]
+            templates[item["name"]] = RequestTemplate(
+                name=item["name"],
+                method=request["method"],
+                path=url.replace("{{base_url}}", ""),
+                headers={h["key"]: h["value"] for h in request.get("header", []) if not h.get("disabled")},
+                fields={f["key"]: f.get("value", "") for f in formdata if f.get("type", "text") == "text"},
+                files=[f["key"] for f in formdata if f.get("type") == "file"],
+            )
+
+    walk(collection["item"])
+    return templates
+
+
+def fill(value, variables):
+    return VARIABLE.sub(lambda m: str(variables.get(m.group(1), m.group(0))), value)
+
+
+@dataclass
+class Step:
+    """
+    One request from the collection. `fields` override its form fields
+    (None drops one) and `auth` sends the user's access token. `mail`
+    marks a request that sends an OTP mail; `otp_from_mail` waits for that
+    mail and sets {{otp}} from it. `sets` updates variables on success.
+    """
+    request: str
+    fields: dict = field(default_factory=dict)
+    auth: bool = False
+    mail: bool = False
+    otp_from_mail: bool = False
+    sets: dict = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    name: str
+    weight: int
+    steps: list
+    # "new" makes a fresh account, "existing" borrows one from the pool,
+    # "anonymous" needs none. With `pools`, the account goes (back) into
+    # the pool afterwards.
+    account: str = "anonymous"
+    pools: bool = False
+
+
+CREDENTIALS = {"email": "{{email}}", "password": "{{password}}"}
+
+SCENARIOS = [
+    Scenario("sign_up", weight=2, account="new", pools=True, steps=[
+        Step("Sign Up", {**CREDENTIALS, "full_name": "{{full_name}}", "role": None}, mail=True),
+        Step("verify-otp", {"email": "{{email}}", "otp": "{{otp}}", "purpose": "create_account"}, otp_from_mail=True),
+        Step("signin", CREDENTIALS),
+        Step("get-profile", auth=True),
+        Step("token/refresh", {"refresh": "{{refresh_token}}"}),
+        Step("signout", {"refresh_token": "{{refresh_token}}"}, auth=True),
+    ]),
+    Scenario("returning_user", weight=5, account="existing", pools=True, steps=[
+        Step("signin", CREDENTIALS),
+        Step("get-profile", auth=True),
+        Step("update-profile", {"full_name": "{{full_name}}"}, auth=True),
+        Step("token/verify", {"token": "{{token}}"}),
+        Step("token/refresh", {"refresh": "{{refresh_token}}"}),
+        Step("signout", {"refresh_token": "{{refresh_token}}"}, auth=True),
+    ]),
+    Scenario("password_reset", weight=1, account="existing", pools=True, steps=[
+        Step("send-otp", {"email": "{{email}}", "purpose": "reset_password"}, mail=True),
+        Step("verify-otp", {"email": "{{email}}", "otp": "{{otp}}", "purpose": "reset_password"}, otp_from_mail=True),
+        Step("reset-password", {"email": "{{email}}", "otp": "{{otp}}", "purpose": "reset_password", "new_password": "{{new_password}}", "confirm_password": "{{new_password}}"}, sets={"password": "{{new_password}}"}),
+        Step("signin", {"email": "{{email}}", "password": "{{new_password}}"}),
+    ]),
+    Scenario("google_sign_in", weight=1, account="new", steps=[
+        Step("google-auth", {"access_token": "loadtest:{{email}}", "role": None}),
+        Step("get-profile", auth=True),
+    ]),
+    Scenario("browse", weight=3, steps=[
+        Step("about-system"),
+    ]),
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[int(fraction * (len(sorted_values) - 1))]
+
+
+class Recorder:
+    """
+    Latencies and outcomes per endpoint and per scenario, shared by the
+    virtual users.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = Counter()
+        self.statuses = {}
+        self.scenarios = Counter()
+        self.failed_scenarios = Counter()
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def request(self, endpoint, status, seconds=None):
+        """
+        `status` is the HTTP status, or a label for requests that got no
+        response; those count as errors without a latency.
+        """
+        with self.lock:
+            if seconds is not None:
+                self.latencies.setdefault(endpoint, []).append(seconds)
+            self.statuses.setdefault(endpoint, Counter())[status] += 1
+            if not (isinstance(status, int) and 200 <= status < 300):
+                self.errors[endpoint] += 1
+
+    def scenario(self, name, ok):
+        with self.lock:
+            self.scenarios[name] += 1
+            if not ok:
+                self.failed_scenarios[name] += 1
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for endpoint, statuses in sorted(self.statuses.items()):
+            latencies = sorted(self.latencies.get(endpoint, [0.0]))
+            endpoints[endpoint] = {
+                "requests": sum(statuses.values()),
+                "errors": self.errors[endpoint],
+                "rps": sum(statuses.values()) / elapsed,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+                "statuses": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+            }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "duration_s": elapsed,
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": total / elapsed if elapsed else 0,
+            "scenarios": {name: {"runs": runs, "failed": self.failed_scenarios[name]} for name, runs in sorted(self.scenarios.items())},
+            "endpoints": endpoints,
+        }
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class LoadTest:
+    """
+    Runs `concurrency` virtual users against `base_url` (the API root, as
+    the collection's {{base_url}}) until `duration` seconds have passed or
+    each has run `iterations` scenarios.
+    """
+
+    def __init__(self, base_url, templates, mailbox, scenarios=SCENARIOS, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.templates = templates
+        self.mailbox = mailbox
+        self.scenarios = scenarios
+        self.timeout = timeout
+        self.accounts = queue.Queue()
+        self.recorder = Recorder()
+        # Runs instead of an "existing" scenario while the pool is empty,
+        # even when only scenarios that borrow accounts were picked.
+        self.sign_up = next((s for s in [*scenarios, *SCENARIOS] if s.account == "new" and s.pools), None)
+        missing = {step.request for scenario in [*scenarios, self.sign_up] for step in scenario.steps} - set(templates)
+        if missing:
+            raise ValueError(f"Scenario steps not in the collection: {', '.join(sorted(missing))}")
+
+    def run(self, concurrency, duration=None, iterations=None):
+        deadline = time.perf_counter() + duration if duration else None
+        users = [
+            threading.Thread(target=self.virtual_user, args=(deadline, iterations), daemon=True)
+            for _ in range(concurrency)
+        ]
+        self.recorder.started = time.perf_counter()
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        self.recorder.finished = time.perf_counter()
+        return self.recorder.summary()
+
+    def virtual_user(self, deadline, iterations):
+        session = requests.Session()
+        weights = [scenario.weight for scenario in self.scenarios]
+        runs = 0
+        while (deadline is None or time.perf_counter() < deadline) and (iterations is None or runs < iterations):
+            self.run_scenario(session, random.choices(self.scenarios, weights)[0])
+            runs += 1
+
+    def run_scenario(self, session, scenario):
+        variables = {}
+        if scenario.account == "existing":
+            try:
+                variables = self.accounts.get_nowait()
+            except queue.Empty:
+                scenario = self.sign_up
+        if scenario.account == "new":
+            variables = self.new_account()
+        variables["new_password"] = f"lt-{uuid.uuid4().hex}"
+
+        ok = all(self.run_step(session, step, variables) for step in scenario.steps)
+        self.recorder.scenario(scenario.name, ok)
+        # A borrowed account always goes back; a new one only once it works.
+        if scenario.pools and (ok or scenario.account == "existing"):
+            self.accounts.put({key: variables[key] for key in ("email", "password", "full_name")})
+
+    def new_account(self):
+        suffix = uuid.uuid4().hex[:12]
+        return {"email": f"lt-{suffix}@example.invalid", "password": f"pw-{uuid.uuid4().hex}", "full_name": f"Load Test {suffix[:4]}"}
+
+    def run_step(self, session, step, variables):
+        template = self.templates[step.request]
+        if step.mail:
+            variables["mail_seen"] = self.mailbox.count(variables["email"])
+        if step.otp_from_mail:
+            # Waiting for the worker to send the mail is not request time.
+            try:
+                variables["otp"] = self.mailbox.wait_for_otp(variables["email"], seen=variables["mail_seen"], timeout=self.timeout)
+            except TimeoutError:
+                self.recorder.request(step.request, "no-mail")
+                return False
+
+        fields = {**template.fields, **step.fields}
+        data = {key: fill(value, variables) for key, value in fields.items() if value is not None}
+        headers = {**template.headers, **CLIENT_HEADERS}
+        if step.auth and variables.get("token"):
+            headers["Authorization"] = f"Bearer {variables['token']}"
+        files = {name: ("avatar.png", png_bytes(), "image/png") for name in template.files} or None
+
+        start = time.perf_counter()
+        try:
+            response = session.request(template.method, self.base_url + template.path, data=data, headers=headers, files=files, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.recorder.request(step.request, type(e).__name__, time.perf_counter() - start)
+            return False
+        self.recorder.request(step.request, response.status_code, time.perf_counter() - start)
+
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        data = payload.get("data") if isinstance(payload, dict) else None
+        tokens = (data.get("tokens") if isinstance(data, dict) else None) or {}
+        if tokens.get("access"):
+            variables["token"] = tokens["access"]
+        if tokens.get("refresh"):
+            variables["refresh_token"] = tokens["refresh"]
+        if not 200 <= response.status_code < 300:
+            return False
+        variables.update({key: fill(value, variables) for key, value in step.sets.items()})
+        return True
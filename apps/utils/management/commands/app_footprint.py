@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def current_rss():
+    """
+    Resident set size of this process in bytes (Linux /proc, else peak RSS).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_startup():
+    """
+    Run django.setup() in this (fresh) process and attribute import time and
+    RSS growth to each installed app: its package, models, admin module and
+    ready(). Prints one JSON document.
+    """
+    import django
+    from django.apps import AppConfig
+    from django.conf import settings
+    from django.utils.module_loading import module_has_submodule
+
+    settings.INSTALLED_APPS  # load the settings module before measuring
+    rows = {}
+
+    def measured(label, func, *args):
+        start, rss = time.perf_counter(), current_rss()
+        result = func(*args)
+        row = rows.setdefault(label, {"app": label, "seconds": 0.0, "rss_bytes": 0})
+        row["seconds"] += time.perf_counter() - start
+        row["rss_bytes"] += current_rss() - rss
+        return result
+
+    def wrap(app_config):
+        import_models = app_config.import_models
+        ready = app_config.ready
+
+        def timed_ready():
+            # Import admin.py here so admin autodiscovery doesn't charge every
+            # app's admin module to django.contrib.admin.
+            if module_has_submodule(app_config.module, "admin"):
+                measured(app_config.name, import_module, f"{app_config.name}.admin")
+            measured(app_config.name, ready)
+
+        app_config.import_models = lambda: measured(app_config.name, import_models)
+        app_config.ready = timed_ready
+        return app_config
+
+    create = AppConfig.create.__func__
+    AppConfig.create = classmethod(lambda cls, entry: wrap(measured(entry, create, cls, entry)))
+
+    start, rss = time.perf_counter(), current_rss()
+    django.setup()
+    measured("ROOT_URLCONF", import_module, settings.ROOT_URLCONF)
+
+    json.dump({
+        "rows": list(rows.values()),
+        "total_seconds": time.perf_counter() - start,
+        "total_rss_bytes": current_rss() - rss,
+        "baseline_rss_bytes": rss,
+    }, sys.stdout)
+
+
+class Command(BaseCommand):
+    help = "Report import time and resident memory added by each installed app at startup."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print the raw measurements.")
+
+    def handle(self, *args, **options):
+        # Measure in a fresh interpreter (inheriting DJANGO_SETTINGS_MODULE):
+        # this one has already imported everything.
+        result = subprocess.run(
+            [sys.executable, "-c", f"from {__name__} import measure_startup; measure_startup()"],
+            capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        report = json.loads(result.stdout)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"settings: {os.environ['DJANGO_SETTINGS_MODULE']}")
+        self.stdout.write(f"{'app':<48} {'import ms':>10} {'RSS KiB':>10}")
+        for row in sorted(report["rows"], key=lambda row: row["seconds"], reverse=True):
+            self.stdout.write(f"{row['app']:<48} {row['seconds'] * 1000:>10.1f} {row['rss_bytes'] // 1024:>10}")
+        self.stdout.write(f"{'total (django.setup + URLconf)':<48} {report['total_seconds'] * 1000:>10.1f} {report['total_rss_bytes'] // 1024:>10}")
+        self.stdout.write(f"{'interpreter + settings baseline':<48} {'':>10} {report['baseline_rss_bytes'] // 1024:>10}")
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+
+from apps.utils.media import serve_media
+
+
+class Command(BaseCommand):
+    help = "Compare media requests/second per worker: django.views.static.serve vs serve_media."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--size-kb", type=int, default=64, help="Size of the benchmark file.")
+
+    def handle(self, *args, **options):
+        media_root = tempfile.mkdtemp()
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                self.run(options["requests"], options["size_kb"])
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def run(self, count, size_kb):
+        name = default_storage.save("bench/media.jpg", ContentFile(os.urandom(size_kb * 1024)))
+        factory = RequestFactory()
+
+        etag = serve_media(factory.get("/"), name)["ETag"]
+        cases = [
+            ("static.serve (full body)", lambda: serve(factory.get("/"), name, document_root=settings.MEDIA_ROOT), {}),
+            ("serve_media (full body)", lambda: serve_media(factory.get("/"), name), {}),
+            ("serve_media (If-None-Match -> 304)", lambda: serve_media(factory.get("/", HTTP_IF_NONE_MATCH=etag), name), {}),
+            ("serve_media (Range 4 KB -> 206)", lambda: serve_media(factory.get("/", HTTP_RANGE="bytes=0-4095"), name), {}),
+            ("serve_media (X-Accel-Redirect)", lambda: serve_media(factory.get("/"), name), {"MEDIA_ACCEL_REDIRECT": "x-accel-redirect"}),
+        ]
+        for label, call, overrides in cases:
+            with override_settings(**overrides):
+                rate = self.measure(call, count)
+            self.stdout.write(f"{label:<40} {rate:>10.0f} req/s")
+
+    def measure(self, call, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            response = call()
+            # Drain the body as the WSGI/ASGI server would.
+            for _chunk in (response if response.streaming else [response.content]):
+                pass
+            response.close()
+        return count / (time.perf_counter() - start)
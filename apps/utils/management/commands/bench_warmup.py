@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+REQUESTS = [
+    ("GET", "/api/about-system/"),
+    ("GET", "/api/get-profile/"),
+    ("POST", "/api/signin/"),
+    ("POST", "/api/token/verify/"),
+    ("GET", "/login/"),
+]
+
+
+def private_dirty_bytes():
+    """
+    Memory this process has written to since the fork (not shared with the
+    parent), from /proc/self/smaps_rollup.
+    """
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def run_worker(warm, rounds, workers):
+    """
+    Child-process entry point: import the WSGI app (optionally warmed),
+    fork `workers` workers and report their first-request latencies and
+    the memory each one stopped sharing with the parent.
+    """
+    os.environ["WARMUP_ON_IMPORT"] = "True" if warm else "False"
+    from django.test import RequestFactory
+    from project.wsgi import application
+
+    factory = RequestFactory()
+    results = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            latencies = []
+            for _round in range(rounds):
+                for method, path in REQUESTS:
+                    request = factory.generic(method, path, content_type="application/json", data="{}")
+                    start = time.perf_counter()
+                    response = application.get_response(request)
+                    response.close()
+                    latencies.append(time.perf_counter() - start)
+            import gc
+            gc.collect()  # a collection touches every tracked object that isn't frozen
+            with os.fdopen(write_fd, "w") as pipe:
+                json.dump({"latencies": latencies, "private_dirty": private_dirty_bytes()}, pipe)
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            results.append(json.load(pipe))
+        os.waitpid(pid, 0)
+    # Views may print; the report is the last line.
+    sys.stdout.write("\n" + json.dumps(results) + "\n")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Command(BaseCommand):
+    help = "Compare first-request latency and per-worker private memory with and without warm-up + gc.freeze()."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Workers forked per mode.")
+        parser.add_argument("--rounds", type=int, default=4, help="Passes over the request mix per worker.")
+
+    def handle(self, *args, **options):
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("bench_warmup needs Linux /proc/self/smaps_rollup and os.fork().")
+
+        for label, warm in [("cold", False), ("warm", True)]:
+            code = f"from {__name__} import run_worker; run_worker({warm}, {options['rounds']}, {options['workers']})"
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if result.returncode:
+                raise CommandError(result.stderr)
+            workers = json.loads(result.stdout.strip().splitlines()[-1])
+
+            first = [w["latencies"][0] for w in workers]
+            first_round = [latency for w in workers for latency in w["latencies"][:len(REQUESTS)]]
+            private = sum(w["private_dirty"] for w in workers) / len(workers)
+            self.stdout.write(
+                f"{label}: first request {sum(first) / len(first) * 1000:7.1f} ms, "
+                f"first-round p99 {percentile(first_round, 0.99) * 1000:7.1f} ms, "
+                f"private memory per worker {private / 1024 / 1024:6.1f} MiB"
+            )
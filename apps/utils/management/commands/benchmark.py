@@ -0,0 +1,73 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.utils.benchmark import compare, discover, load_baseline, machine_info, measure, save_baseline
+
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, "var", "benchmarks.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the microbenchmarks declared in the apps' benchmarks.py modules. "
+        "Save a baseline on the base branch with --save, then check a branch "
+        "against it with --compare; regressions beyond --tolerance fail."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="Only run benchmarks whose name starts with one of these.")
+        parser.add_argument("--rounds", type=int, default=7)
+        parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round.")
+        parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help=f"Write the results as a baseline (default {DEFAULT_BASELINE}).")
+        parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Compare against a saved baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown of the median, e.g. 0.15 for 15%%.")
+
+    def handle(self, *args, **options):
+        cases = {
+            name: setup for name, setup in sorted(discover().items())
+            if not options["names"] or name.startswith(tuple(options["names"]))
+        }
+        if not cases:
+            raise CommandError("No benchmarks match.")
+        baseline = load_baseline(options["compare"]) if options["compare"] else None
+
+        results = {}
+        # Cases that write (refresh tokens are recorded as outstanding)
+        # leave nothing behind.
+        with transaction.atomic():
+            for name, setup in cases.items():
+                results[name] = measure(setup(), rounds=options["rounds"], min_time=options["min_time"])
+                self.stdout.write(self.format_result(name, results[name]))
+            transaction.set_rollback(True)
+
+        if options["save"]:
+            save_baseline(options["save"], results)
+            self.stdout.write(f"Baseline written to {options['save']}")
+
+        if baseline is not None:
+            self.report(results, baseline, options["tolerance"])
+
+    def format_result(self, name, result):
+        spread = result.stddev / result.mean * 100 if result.mean else 0
+        return (
+            f"{name:<40} {result.median * 1e6:>10.2f} us/call  min {result.min * 1e6:>9.2f}  "
+            f"+/-{spread:>4.1f}%  ({result.rounds} x {result.number})"
+        )
+
+    def report(self, results, baseline, tolerance):
+        if baseline["machine"] != machine_info():
+            self.stderr.write(f"Baseline is from a different machine or runtime ({baseline['machine']}); comparisons are indicative only.")
+
+        rows = compare(results, baseline["benchmarks"], tolerance)
+        self.stdout.write("")
+        self.stdout.write(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+        for name, before, after, change, regressed in rows:
+            flag = "  REGRESSED" if regressed else ""
+            self.stdout.write(f"{name:<40} {before * 1e6:>10.2f} {after * 1e6:>10.2f} {change * 100:>+7.1f}%{flag}")
+
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark(s) slower than baseline by more than {tolerance:.0%}: {', '.join(regressions)}")
@@ -0,0 +1,134 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.fake_services import FakeServices
+from apps.utils.loadtest import SCENARIOS, LoadTest, load_collection
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive weighted scenarios built from starter-kit.postman_collection.json "
+        "against the API and report throughput and p50/p95/p99 per endpoint. "
+        "Without --base-url it starts the app (gunicorn + uvicorn, as in the "
+        "Dockerfile) and a job worker on the project.settings.loadtest profile, "
+        "with mail and Google served by local stand-ins, so it runs offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", help="API root of an already running server, e.g. http://127.0.0.1:8000/api. It must send mail and call Google through the stand-ins (printed at start).")
+        parser.add_argument("--concurrency", type=int, default=10, help="Virtual users.")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run.")
+        parser.add_argument("--iterations", type=int, default=None, help="Scenarios per virtual user (instead of --duration).")
+        parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS], help="Only run these scenarios (repeatable).")
+        parser.add_argument("--workers", type=int, default=2, help="Gunicorn workers for the server this command starts.")
+        parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for a response or an OTP mail.")
+        parser.add_argument("--collection", default=os.path.join(settings.BASE_DIR, "starter-kit.postman_collection.json"))
+        parser.add_argument("--json", help="Also write the report to this file.")
+
+    def handle(self, *args, **options):
+        templates = load_collection(options["collection"])
+        scenarios = [s for s in SCENARIOS if not options["scenario"] or s.name in options["scenario"]]
+
+        with FakeServices() as services:
+            processes = []
+            try:
+                if options["base_url"]:
+                    base_url = options["base_url"]
+                    self.stdout.write("Stand-ins: " + " ".join(f"{key}={value}" for key, value in services.environ().items()))
+                else:
+                    base_url, processes = self.start_stack(services, options["workers"])
+                try:
+                    load_test = LoadTest(base_url, templates, services.mailbox, scenarios, timeout=options["timeout"])
+                except ValueError as e:
+                    raise CommandError(e)
+                self.stdout.write(f"Running {options['concurrency']} virtual users against {base_url}...")
+                summary = load_test.run(
+                    options["concurrency"],
+                    duration=None if options["iterations"] else options["duration"],
+                    iterations=options["iterations"],
+                )
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    try:
+                        process.wait(10)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+
+        self.report(summary)
+        if options["json"]:
+            with open(options["json"], "w") as f:
+                json.dump(summary, f, indent=2)
+
+    def start_stack(self, services, workers):
+        var_dir = os.path.join(settings.BASE_DIR, "var")
+        os.makedirs(var_dir, exist_ok=True)
+        env = {**os.environ, **services.environ(), "DJANGO_SETTINGS_MODULE": "project.settings.loadtest"}
+        manage = [sys.executable, os.path.join(settings.BASE_DIR, "manage.py")]
+        log = open(os.path.join(var_dir, "loadtest-server.log"), "ab")
+
+        # A fresh database each run, so results do not depend on earlier ones.
+        database = os.path.join(var_dir, "loadtest.sqlite3")
+        if os.path.exists(database):
+            os.remove(database)
+        for command in (["migrate", "--noinput"], ["seed"]):
+            subprocess.run(manage + command, env=env, cwd=settings.BASE_DIR, stdout=log, stderr=log, check=True)
+
+        port = free_port()
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "project.asgi:application", "-k", "uvicorn.workers.UvicornWorker",
+                 "--workers", str(workers), "--bind", f"127.0.0.1:{port}"],
+                env=env, cwd=settings.BASE_DIR, stdout=log, stderr=log,
+            ),
+            subprocess.Popen(manage + ["runworker", "--concurrency", "2", "--poll-interval", "0.1"], env=env, cwd=settings.BASE_DIR, stdout=log, stderr=log),
+        ]
+        base_url = f"http://127.0.0.1:{port}/api"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                requests.get(f"{base_url}/about-system/", timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline or processes[0].poll() is not None:
+                    for process in processes:
+                        process.kill()
+                    raise CommandError(f"The server did not start; see {log.name}.")
+                time.sleep(0.2)
+        self.stdout.write(f"Server and worker started (logs in {log.name}).")
+        return base_url, processes
+
+    def report(self, summary):
+        self.stdout.write("")
+        self.stdout.write(f"{'scenario':<20} {'runs':>7} {'failed':>7}")
+        for name, counts in summary["scenarios"].items():
+            self.stdout.write(f"{name:<20} {counts['runs']:>7} {counts['failed']:>7}")
+
+        self.stdout.write("")
+        self.stdout.write(f"{'endpoint':<16} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name, row in summary["endpoints"].items():
+            self.stdout.write(
+                f"{name:<16} {row['requests']:>8} {row['errors']:>7} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"{summary['requests']} requests in {summary['duration_s']:.1f}s: {summary['rps']:.1f} req/s, {summary['errors']} errors")
+        for name, row in summary["endpoints"].items():
+            failures = {status: count for status, count in row["statuses"].items() if not status.startswith("2")}
+            if failures:
+                self.stdout.write(f"  {name}: {failures}")
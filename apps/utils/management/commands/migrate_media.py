@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from apps.utils.storage import ContentAddressedStorage, is_content_addressed
+
+
+class Command(BaseCommand):
+    help = "Move existing FileField/ImageField values into content-addressed storage, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Report what would move without writing anything.")
+        parser.add_argument("--delete-old", action="store_true", help="Delete the old files once every batch is committed.")
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not ContentAddressedStorage; check STORAGES['default'].")
+
+        self.batch_size = options["batch_size"]
+        self.dry_run = options["dry_run"]
+        self.moved = {}
+        self.missing = 0
+
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField) and field.storage is default_storage:
+                    self.migrate_field(model, field)
+
+        if options["delete_old"] and not self.dry_run:
+            for old_name in self.moved:
+                default_storage.delete(old_name)
+
+        verb = "Would move" if self.dry_run else "Moved"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(self.moved)} files ({self.missing} missing on disk)."))
+
+    def migrate_field(self, model, field):
+        # Image pipeline fields keep their resized copies in "<field>_variants".
+        variants_field = f"{field.name}_variants"
+        if not any(f.name == variants_field for f in model._meta.concrete_fields):
+            variants_field = None
+
+        columns = ["pk", field.attname] + ([variants_field] if variants_field else [])
+        queryset = (
+            model._default_manager
+            .exclude(**{field.attname: ""})
+            .exclude(**{f"{field.attname}__isnull": True})
+            .order_by("pk")
+        )
+
+        last_pk, updated = None, 0
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch.values_list(*columns)[:self.batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            changed = []
+            for row in rows:
+                pk, name = row[0], row[1]
+                values = {field.attname: self.move(name)}
+                if variants_field:
+                    variants = row[2] or {}
+                    values[variants_field] = {size: self.move(v) for size, v in variants.items()}
+                if values[field.attname] != name or (variants_field and values[variants_field] != (row[2] or {})):
+                    changed.append(model(pk=pk, **values))
+
+            if changed and not self.dry_run:
+                with transaction.atomic():
+                    model._default_manager.bulk_update(changed, columns[1:])
+            updated += len(changed)
+
+        if updated:
+            self.stdout.write(f"{model._meta.label}.{field.name}: {updated} rows")
+
+    def move(self, name):
+        if not name or is_content_addressed(name):
+            return name
+        if name in self.moved:
+            return self.moved[name]
+        if not default_storage.exists(name):
+            self.missing += 1
+            self.stderr.write(f"Missing file: {name}")
+            return name
+
+        with default_storage.open(name) as f:
+            if self.dry_run:
+                new_name = default_storage.hashed_name(name, default_storage.file_digest(f))
+            else:
+                new_name = default_storage.save(name, f)
+        self.moved[name] = new_name
+        return new_name
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.utils.profiler import make_profile_token
+
+
+class Command(BaseCommand):
+    help = "Print a signed token that makes matching requests store a profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Only profile request paths starting with this.")
+
+    def handle(self, *args, **options):
+        token = make_profile_token(options["path"])
+        self.stdout.write(
+            f"{settings.PROFILER_HEADER}: {token}\n"
+            f"Valid for {settings.PROFILER_TOKEN_MAX_AGE} s on paths under {options['path']}."
+        )
@@ -0,0 +1,148 @@
+# utils/media.py
+
+import mimetypes
+import os
+import posixpath
+import re
+from email.utils import formatdate
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from apps.utils.storage import is_content_addressed
+
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def media_etag(name, stat):
+    """
+    Strong validator: the content hash for content-addressed files,
+    otherwise size and mtime.
+    """
+    if is_content_addressed(name):
+        return '"%s"' % posixpath.splitext(posixpath.basename(name))[0]
+    return '"%x-%x"' % (stat.st_size, stat.st_mtime_ns)
+
+
+def parse_range(header, size):
+    """
+    Parse a single `bytes=` range. Returns (start, end) inclusive, None to
+    serve the whole file, or False when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with ETag/304, byte ranges and optional
+    X-Accel-Redirect / X-Sendfile hand-off to the front proxy.
+    """
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    etag = media_etag(name, stat)
+    immutable = getattr(default_storage, 'is_immutable', is_content_addressed)(name)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable else 'public, max-age=%d' % settings.MEDIA_CACHE_MAX_AGE,
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    # The proxy streams the bytes (and handles ranges) itself.
+    accel = settings.MEDIA_ACCEL_REDIRECT
+    if accel:
+        response = HttpResponse(content_type=content_type)
+        if accel == 'x-sendfile':
+            response['X-Sendfile'] = full_path
+        else:
+            response['X-Accel-Redirect'] = posixpath.join(settings.MEDIA_ACCEL_PREFIX, name)
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */%d' % stat.st_size
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_read_range(full_path, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, stat.st_size)
+        response['Content-Length'] = str(length)
+    else:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,425 @@
+# utils/metrics.py
+"""
+Counters, gauges and fixed-bucket histograms shared by all worker
+processes, exposed in the Prometheus text format.
+
+Each process writes its values into its own memory-mapped file,
+METRICS_DIR/<pid>.db; the worker serving a scrape reads and merges the
+files of every live process. Recording a value is a dict lookup and an
+8-byte store, with no syscalls or cross-process locking. Without
+METRICS_DIR the values live in anonymous memory and only this process is
+reported.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+HEADER = struct.Struct("Q")  # bytes in use
+KEY_LENGTH = struct.Struct("I")
+VALUE = struct.Struct("d")
+INITIAL_SIZE = 64 * 1024
+
+
+class MmapValues:
+    """
+    Float values keyed by strings in an mmap: an 8-byte header holding the
+    bytes in use, then entries of [u32 key length][key, padded to 8
+    bytes][f64 value]. Only the owning process writes; readers take a
+    plain copy of the file and parse up to the header's length.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.positions = {}
+        self.values = {}
+        self.lock = threading.Lock()
+        if path:
+            self.file = open(path, "w+b")
+            self.file.truncate(INITIAL_SIZE)
+            self.mm = mmap.mmap(self.file.fileno(), INITIAL_SIZE)
+        else:
+            self.file = None
+            self.mm = mmap.mmap(-1, INITIAL_SIZE)
+        self.used = HEADER.size
+        HEADER.pack_into(self.mm, 0, self.used)
+
+    def _position(self, key):
+        position = self.positions.get(key)
+        if position is None:
+            encoded = key.encode()
+            padded = len(encoded) + (-(KEY_LENGTH.size + len(encoded)) % 8)
+            size = KEY_LENGTH.size + padded + VALUE.size
+            if self.used + size > len(self.mm):
+                self.mm.resize(max(len(self.mm) * 2, self.used + size))
+            KEY_LENGTH.pack_into(self.mm, self.used, len(encoded))
+            self.mm[self.used + KEY_LENGTH.size:self.used + KEY_LENGTH.size + len(encoded)] = encoded
+            position = self.used + KEY_LENGTH.size + padded
+            VALUE.pack_into(self.mm, position, 0.0)
+            # Publish the entry only once it is complete.
+            self.used += size
+            HEADER.pack_into(self.mm, 0, self.used)
+            self.positions[key] = position
+            self.values[key] = 0.0
+        return position
+
+    def inc(self, key, amount):
+        with self.lock:
+            position = self._position(key)
+            value = self.values[key] + amount
+            self.values[key] = value
+            VALUE.pack_into(self.mm, position, value)
+
+    def set(self, key, value):
+        with self.lock:
+            position = self._position(key)
+            self.values[key] = value
+            VALUE.pack_into(self.mm, position, value)
+
+    def close(self):
+        self.mm.close()
+        if self.file is not None:
+            self.file.close()
+
+
+def read_values(data):
+    values = {}
+    used = min(HEADER.unpack_from(data, 0)[0], len(data))
+    offset = HEADER.size
+    while offset < used:
+        (length,) = KEY_LENGTH.unpack_from(data, offset)
+        key = data[offset + KEY_LENGTH.size:offset + KEY_LENGTH.size + length].decode()
+        padded = length + (-(KEY_LENGTH.size + length) % 8)
+        offset += KEY_LENGTH.size + padded
+        values[key] = VALUE.unpack_from(data, offset)[0]
+        offset += VALUE.size
+    return values
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = None
+                if settings.METRICS_DIR:
+                    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+                    path = os.path.join(settings.METRICS_DIR, f"{os.getpid()}.db")
+                _store = MmapValues(path)
+    return _store
+
+
+def _reset_after_fork():
+    # A forked worker must not write into its parent's file.
+    global _store, _store_lock
+    _store = None
+    _store_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def sample_key(name, labels):
+    return json.dumps([name, labels])
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            child = self.children.setdefault(values, self.make_child(dict(zip(self.labelnames, map(str, values)))))
+        return child
+
+    def make_child(self, labels):
+        raise NotImplementedError
+
+    def collect(self):
+        """
+        Extra samples computed at scrape time, as {labels: value}.
+        """
+        return {}
+
+
+class CounterChild:
+    def __init__(self, key):
+        self.key = key
+
+    def inc(self, amount=1):
+        get_store().inc(self.key, amount)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def make_child(self, labels):
+        return CounterChild(sample_key(f"{self.name}_total", labels))
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+
+class GaugeChild(CounterChild):
+    def set(self, value):
+        get_store().set(self.key, value)
+
+
+class Gauge(Metric):
+    """
+    Summed over live processes. With `collect`, a callable returning
+    {label values tuple: value}, the values are computed at scrape time
+    instead (e.g. queue depths read from the database).
+    """
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, collect=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.collector = collect
+
+    def make_child(self, labels):
+        return GaugeChild(sample_key(self.name, labels))
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def collect(self):
+        if self.collector is None:
+            return {}
+        return {
+            sample_key(self.name, dict(zip(self.labelnames, map(str, values)))): value
+            for values, value in self.collector().items()
+        }
+
+
+class HistogramChild:
+    def __init__(self, name, labels, buckets):
+        self.buckets = buckets
+        # Buckets are stored non-cumulative; exposition sums them up.
+        self.bucket_keys = [
+            sample_key(f"{name}_bucket", {**labels, "le": format_bound(bound)})
+            for bound in buckets + (float("inf"),)
+        ]
+        self.sum_key = sample_key(f"{name}_sum", labels)
+        self.count_key = sample_key(f"{name}_count", labels)
+
+    def observe(self, value):
+        store = get_store()
+        store.inc(self.bucket_keys[bisect_left(self.buckets, value)], 1)
+        store.inc(self.sum_key, value)
+        store.inc(self.count_key, 1)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def make_child(self, labels):
+        return HistogramChild(self.name, labels, self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+
+def format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def merged_values(self):
+        """
+        Stored samples summed over every live process sharing METRICS_DIR.
+        """
+        store = get_store()
+        if not settings.METRICS_DIR:
+            with store.lock:
+                return dict(store.values)
+
+        merged = {}
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.db")):
+            pid = int(os.path.basename(path)[:-3])
+            if pid != os.getpid() and not pid_alive(pid):
+                # A dead worker's counters drop out, which Prometheus
+                # treats as a counter reset.
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path, "rb") as f:
+                    values = read_values(f.read())
+            except (OSError, struct.error, UnicodeDecodeError, ValueError):
+                continue
+            for key, value in values.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def expose(self):
+        """
+        Every registered metric in the Prometheus text format (0.0.4).
+        """
+        samples = {}
+        for key, value in self.merged_values().items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for metric in self.metrics.values():
+            for key, value in metric.collect().items():
+                name, labels = json.loads(key)
+                samples.setdefault(name, []).append((labels, value))
+
+            lines.append(f"# HELP {metric.name} {escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if metric.kind == "histogram":
+                lines += self.histogram_lines(metric, samples)
+            else:
+                name = f"{metric.name}_total" if metric.kind == "counter" else metric.name
+                lines += [self.sample_line(name, labels, value) for labels, value in sorted(samples.get(name, []), key=sort_key)]
+        return "\n".join(lines) + "\n"
+
+    def histogram_lines(self, metric, samples):
+        lines = []
+        buckets = {}
+        for labels, value in samples.get(f"{metric.name}_bucket", []):
+            bound = labels.pop("le")
+            buckets.setdefault(json.dumps(labels, sort_keys=True), {})[bound] = value
+        sums = {json.dumps(labels, sort_keys=True): value for labels, value in samples.get(f"{metric.name}_sum", [])}
+        counts = {json.dumps(labels, sort_keys=True): value for labels, value in samples.get(f"{metric.name}_count", [])}
+
+        for label_key in sorted(counts):
+            parsed = json.loads(label_key)
+            labels = {name: parsed[name] for name in metric.labelnames if name in parsed}
+            cumulative = 0.0
+            for bound in metric.buckets + (float("inf"),):
+                cumulative += buckets.get(label_key, {}).get(format_bound(bound), 0.0)
+                lines.append(self.sample_line(f"{metric.name}_bucket", {**labels, "le": format_bound(bound)}, cumulative))
+            lines.append(self.sample_line(f"{metric.name}_sum", labels, sums.get(label_key, 0.0)))
+            lines.append(self.sample_line(f"{metric.name}_count", labels, counts[label_key]))
+        return lines
+
+    def sample_line(self, name, labels, value):
+        if labels:
+            rendered = ",".join(f'{label}="{escape(str(label_value))}"' for label, label_value in labels.items())
+            return f"{name}{{{rendered}}} {format_value(value)}"
+        return f"{name} {format_value(value)}"
+
+
+def sort_key(sample):
+    return sorted(sample[0].items())
+
+
+REGISTRY = Registry()
+
+
+def queued_jobs():
+    from django.db.models import Count
+
+    from apps.jobs.models import Job
+
+    rows = Job.objects.filter(status=Job.Status.QUEUED).values_list("name").annotate(count=Count("id"))
+    return {(name,): count for name, count in rows}
+
+
+def queued_emails():
+    from apps.jobs.queue import EMAIL_TASKS
+
+    return {(): sum(count for (name,), count in queued_jobs().items() if name in EMAIL_TASKS)}
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to serve a request, by URL name.", ["view", "method"],
+)
+HTTP_REQUESTS = Counter("http_requests", "Responses by URL name and status code.", ["view", "method", "status"])
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Database queries run while serving a request.", ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Password hashing and validation time per request that does any.",
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+CACHE_LOOKUPS = Counter("cache_lookups", "Cache reads by cached value and result (hit/miss).", ["cache", "result"])
+DB_CONNECTIONS_CREATED = Counter("db_connections_created", "New database connections by alias.", ["alias"])
+DB_POOL_CONNECTIONS = Gauge("db_pool_connections", "Pooled database connections by alias and state (open, idle).", ["alias", "state"])
+DB_POOL_REQUESTS_WAITING = Gauge("db_pool_requests_waiting", "Callers waiting for a pooled connection.", ["alias"])
+DB_POOL_WAIT_SECONDS = Gauge("db_pool_wait_seconds", "Time callers waited for a pooled connection since each worker started.", ["alias"])
+HTTP_CLIENT_REQUESTS = Counter("http_client_requests", "Outbound HTTP requests by host and outcome.", ["host", "outcome"])
+HTTP_CLIENT_DURATION = Histogram("http_client_request_duration_seconds", "Outbound HTTP request time by host.", ["host"])
+JOBS_QUEUED = Gauge("jobs_queued", "Queued background jobs by job name.", ["job"], collect=queued_jobs)
+EMAIL_QUEUE_DEPTH = Gauge("email_queue_depth", "Queued background jobs that send email.", collect=queued_emails)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# Any other verb is reported as "other", so clients can't mint new series.
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+
+
+def observe_request(request, record):
+    """
+    Feed a finished request's TimingRecord (apps.utils.timing) into the
+    request metrics, so no extra timers run on the hot path.
+    """
+    match = getattr(request, "resolver_match", None)
+    view = match.view_name if match is not None else "unmatched"
+    method = record.method if record.method in HTTP_METHODS else "other"
+    HTTP_REQUEST_DURATION.labels(view, method).observe(record.duration)
+    HTTP_REQUESTS.labels(view, method, record.status_code).inc()
+    DB_QUERIES_PER_REQUEST.labels(view).observe(record.spans.get("db", (0.0, 0))[1])
+    if "password" in record.spans:
+        PASSWORD_HASH_DURATION.observe(record.spans["password"][0])
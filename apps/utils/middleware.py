@@ -0,0 +1,340 @@
+# utils/middleware.py
+
+import logging
+import secrets
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import HttpResponse
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+from apps.utils.db import is_statement_timeout, replica_request, request_budget
+from apps.utils.metrics import observe_request
+from apps.utils.profiler import RequestProfiler, choose_trigger, save_profile
+from apps.utils.timing import maybe_log_sample, timing_request
+
+
+logger = logging.getLogger(__name__)
+
+
+class MiddlewareChain(BaseHandler):
+    """
+    A second request handler built from its own middleware list, ending in
+    the usual URL resolution and view call.
+    """
+
+    def __init__(self, middleware, is_async=False):
+        self.middleware = list(middleware)
+        self.load_middleware(is_async=is_async)
+
+    def load_middleware(self, is_async=False):
+        """
+        BaseHandler.load_middleware(), reading self.middleware instead of
+        settings.MIDDLEWARE.
+        """
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(self.middleware):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    "Middleware %s must have at least one of sync_capable/async_capable set to True." % middleware_path
+                )
+            elif not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async, handler, handler_is_async,
+                    debug=settings.DEBUG, name="middleware %s" % middleware_path,
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed as exc:
+                if settings.DEBUG:
+                    logger.debug("MiddlewareNotUsed(%r): %s", middleware_path, exc)
+                continue
+            else:
+                handler = adapted_handler
+
+            if mw_instance is None:
+                raise ImproperlyConfigured("Middleware factory %s returned None." % middleware_path)
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(0, self.adapt_method_mode(is_async, mw_instance.process_view))
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response),
+                )
+            if hasattr(mw_instance, "process_exception"):
+                # Django runs the exception stack synchronously.
+                self._exception_middleware.append(self.adapt_method_mode(False, mw_instance.process_exception))
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        self._middleware_chain = self.adapt_method_mode(is_async, handler, handler_is_async)
+
+    def __call__(self, request):
+        return self._middleware_chain(request)
+
+
+class PathScopedMiddleware:
+    """
+    Sends requests under API_PATH_PREFIXES through the API_MIDDLEWARE chain
+    instead of the rest of MIDDLEWARE.
+
+    Sessions, CSRF, messages and the debug tooling are only needed by the
+    admin; stateless token-authenticated API requests skip them. Must be
+    first in MIDDLEWARE.
+
+    Async-only: the sync-only WhiteNoiseMiddleware further down would
+    otherwise make Django run this, and so the API chain, in a thread
+    under ASGI. Django wraps the full chain in sync_to_async instead, so
+    only admin and static requests leave the event loop. Under WSGI the
+    handler runs it through async_to_sync.
+    """
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefixes = tuple(settings.API_PATH_PREFIXES)
+        self.api_chain = MiddlewareChain(settings.API_MIDDLEWARE, is_async=True)
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        if request.path_info.startswith(self.prefixes):
+            return await self.api_chain(request)
+        return await self.get_response(request)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for PrimaryReplicaRouter: a request that writes gets a
+    signed cookie, and the client's reads go to the primary until it
+    expires (DATABASE_PRIMARY_STICKY_SECONDS), by which time the replicas
+    have caught up.
+    """
+    sync_capable = True
+    async_capable = True
+    salt = "replica-stickiness"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = settings.DATABASE_PRIMARY_STICKY_COOKIE
+        self.window = settings.DATABASE_PRIMARY_STICKY_SECONDS
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_request(self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        with replica_request(self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(request, response, state)
+
+    def is_pinned(self, request):
+        return request.get_signed_cookie(
+            self.cookie_name, default=None, salt=self.salt, max_age=self.window,
+        ) is not None
+
+    def process_response(self, request, response, state):
+        if state.wrote and self.window:
+            response.set_signed_cookie(
+                self.cookie_name, "1", salt=self.salt, max_age=self.window,
+                httponly=True, samesite="Lax", secure=request.is_secure(),
+            )
+        return response
+
+
+class StatementTimeoutMiddleware:
+    """
+    Puts a database time budget on each request, enforced on PostgreSQL as
+    statement_timeout (see apps.utils.db.apply_statement_timeout).
+
+    The budget comes from DATABASE_STATEMENT_TIMEOUTS by URL name, then a
+    `statement_timeout` on the view, then DATABASE_STATEMENT_TIMEOUT_API or
+    _ADMIN by path. API views turn the resulting error into a 503 in
+    custom_exception_handler; this middleware does the same for the admin.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.api_prefixes = tuple(settings.API_PATH_PREFIXES)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_budget(self.default_budget(request)) as budget:
+            request.database_budget = budget
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with request_budget(self.default_budget(request)) as budget:
+            request.database_budget = budget
+            return await self.get_response(request)
+
+    def default_budget(self, request):
+        if request.path_info.startswith(self.api_prefixes):
+            return settings.DATABASE_STATEMENT_TIMEOUT_API
+        return settings.DATABASE_STATEMENT_TIMEOUT_ADMIN
+
+    def budget_for(self, request, view_func):
+        match = request.resolver_match
+        if match is not None and match.view_name in settings.DATABASE_STATEMENT_TIMEOUTS:
+            return settings.DATABASE_STATEMENT_TIMEOUTS[match.view_name]
+        view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+        for owner in (view_func, view_class):
+            milliseconds = getattr(owner, "statement_timeout", None)
+            if milliseconds is not None:
+                return milliseconds
+        return self.default_budget(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.database_budget.milliseconds = self.budget_for(request, view_func)
+
+    def process_exception(self, request, exception):
+        if is_statement_timeout(exception):
+            return HttpResponse("The request took too long to complete. Please try again.", status=503, content_type="text/plain")
+
+
+class ServerTimingMiddleware:
+    """
+    Records where each request's time goes (the DB, auth, password hashing,
+    JWT encoding, templates, email; see apps.utils.timing.span) on
+    `request.timing` and feeds it to the request metrics. A
+    SERVER_TIMING_SAMPLE_RATE share is logged, and staff users or requests
+    carrying the SERVER_TIMING_SECRET in SERVER_TIMING_HEADER get the
+    breakdown back as a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.secret = settings.SERVER_TIMING_SECRET
+        self.header = "HTTP_" + settings.SERVER_TIMING_HEADER.upper().replace("-", "_")
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with timing_request(request.method, request.path) as record:
+            request.timing = record
+            response = self.get_response(request)
+        return self.process_response(request, response, record)
+
+    async def __acall__(self, request):
+        with timing_request(request.method, request.path) as record:
+            request.timing = record
+            response = await self.get_response(request)
+        return self.process_response(request, response, record)
+
+    def may_see_timings(self, request):
+        if self.secret and secrets.compare_digest(request.META.get(self.header, ""), self.secret):
+            return True
+        # Only a user something else already loaded: DRF sets request.user
+        # once it authenticates, and AuthenticationMiddleware's lazy user is
+        # cached in request._cached_user once read. Resolving it here would
+        # cost a session and user query on every admin and media response.
+        user = getattr(request, "user", None)
+        if isinstance(user, SimpleLazyObject):
+            user = getattr(request, "_cached_user", None)
+        return bool(user is not None and user.is_staff)
+
+    def process_response(self, request, response, record):
+        record.finish(response.status_code)
+        observe_request(request, record)
+        maybe_log_sample(record, self.sample_rate)
+        if self.may_see_timings(request):
+            response["Server-Timing"] = record.header()
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Runs cProfile over the rest of the chain and the view for requests
+    carrying a signed PROFILER_HEADER token (`manage.py profile_token`) or
+    picked by the admin's ProfilerSetting sample, and stores the result as
+    a RequestProfile. The setting is re-read every PROFILER_SETTING_TTL
+    seconds, so unprofiled requests only pay a header lookup. A request
+    that arrives while another is being profiled is served unprofiled.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = "HTTP_" + settings.PROFILER_HEADER.upper().replace("-", "_")
+        self.setting = None
+        self.setting_expires = 0.0
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def setting_is_stale(self):
+        return time.monotonic() >= self.setting_expires
+
+    def load_setting(self):
+        from apps.system_setting.models import ProfilerSetting
+
+        self.setting = ProfilerSetting.get_cached()
+        self.setting_expires = time.monotonic() + settings.PROFILER_SETTING_TTL
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.setting_is_stale():
+            self.load_setting()
+        trigger = choose_trigger(request, self.header, self.setting)
+        if trigger is None:
+            return self.get_response(request)
+        with RequestProfiler(trigger) as profiler:
+            response = self.get_response(request)
+        if not profiler.active:
+            return response
+        return self.store(request, response, profiler)
+
+    async def __acall__(self, request):
+        if self.setting_is_stale():
+            await sync_to_async(self.load_setting)()
+        trigger = choose_trigger(request, self.header, self.setting)
+        if trigger is None:
+            return await self.get_response(request)
+        with RequestProfiler(trigger) as profiler:
+            response = await self.get_response(request)
+        if not profiler.active:
+            return response
+        return await sync_to_async(self.store)(request, response, profiler)
+
+    def store(self, request, response, profiler):
+        try:
+            profile = save_profile(request, response, profiler)
+        except Exception:
+            logger.exception("Could not store the profile of %s %s", request.method, request.path)
+            return response
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
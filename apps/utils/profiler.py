@@ -0,0 +1,172 @@
+# utils/profiler.py
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+
+TOKEN_SALT = "apps.utils.profiler"
+
+# Python allows one active profiler per process (3.12+ raises otherwise),
+# so overlapping requests take turns and the loser runs unprofiled.
+_profiling = threading.Lock()
+
+
+def make_profile_token(path_prefix="/"):
+    """
+    A value for PROFILER_HEADER that profiles requests under `path_prefix`
+    until it is PROFILER_TOKEN_MAX_AGE seconds old.
+    """
+    return signing.dumps({"path": path_prefix}, salt=TOKEN_SALT)
+
+
+def token_allows(token, path):
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return path.startswith(payload.get("path", "/"))
+
+
+class ProfileStorage(FileSystemStorage):
+    """
+    Private storage under PROFILER_DIR, outside MEDIA_ROOT; profiles are
+    only served through the admin. Reads the setting on each use.
+    """
+
+    @property
+    def base_location(self):
+        return settings.PROFILER_DIR
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+class RequestProfiler:
+    """
+    cProfile around one request, if no other profile is running in the
+    process; `active` says whether it got to run. Under ASGI it only sees
+    the event-loop thread, including any other coroutine that runs while
+    it is active; work handed to sync_to_async shows up as time spent
+    awaiting.
+    """
+
+    def __init__(self, trigger):
+        self.trigger = trigger
+        self.profile = cProfile.Profile()
+        self.started = None
+        self.active = False
+
+    def __enter__(self):
+        if not _profiling.acquire(blocking=False):
+            return self
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Another profiling tool (sys.monitoring, a debugger) holds it.
+            _profiling.release()
+            return self
+        self.active = True
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.active:
+            return
+        self.profile.disable()
+        self.duration = time.perf_counter() - self.started
+        _profiling.release()
+
+    def dump(self):
+        """
+        The profile in the pstats/cProfile dump format, as read by
+        pstats.Stats, snakeviz and friends.
+        """
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+def save_profile(request, response, profiler):
+    from apps.system_setting.models import RequestProfile
+
+    data = profiler.dump()
+    match = getattr(request, "resolver_match", None)
+    profile = RequestProfile(
+        method=request.method,
+        path=request.path[:2048],
+        view_name=match.view_name if match is not None else "",
+        status_code=response.status_code,
+        duration_ms=profiler.duration * 1000,
+        trigger=profiler.trigger,
+        size=len(data),
+    )
+    profile.file.save(f"{timezone.now():%H%M%S}-{request.method.lower()}.prof", ContentFile(data), save=False)
+    # An explicit alias skips the router, so a profiled request is not
+    # pinned to the primary as if the user had written something.
+    profile.save(using=DEFAULT_DB_ALIAS)
+    prune_profiles()
+    return profile
+
+
+def prune_profiles(now=None):
+    """
+    Keep at most PROFILER_MAX_PROFILES profiles, none older than
+    PROFILER_RETENTION_DAYS. Returns the number deleted.
+    """
+    from apps.system_setting.models import RequestProfile
+
+    profiles = RequestProfile.objects.using(DEFAULT_DB_ALIAS)
+    cutoff = (now or timezone.now()) - timedelta(days=settings.PROFILER_RETENTION_DAYS)
+    expired = list(profiles.filter(created_at__lt=cutoff))
+    expired += profiles.filter(created_at__gte=cutoff).order_by("-created_at")[settings.PROFILER_MAX_PROFILES:]
+    for profile in expired:
+        profile.delete(using=DEFAULT_DB_ALIAS)
+    return len(expired)
+
+
+def render_stats(file, sort="cumulative", limit=40):
+    stream = io.StringIO()
+    stats = pstats.Stats(StoredStats(file), stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+class StoredStats:
+    """
+    Lets pstats.Stats load a profile from a stored file rather than a path.
+    """
+
+    def __init__(self, file):
+        with file.open("rb") as f:
+            self.stats = marshal.loads(f.read())
+
+    def create_stats(self):
+        pass
+
+
+def choose_trigger(request, header, setting):
+    """
+    "header" for a valid signed PROFILER_HEADER, "sampled" when the admin
+    toggle picks this request, otherwise None.
+    """
+    token = request.META.get(header)
+    if token and token_allows(token, request.path):
+        return "header"
+    if setting.enabled and request.path.startswith(setting.path_prefix or "/"):
+        if random.random() * 100 < float(setting.sample_percent):
+            return "sampled"
+    return None
@@ -0,0 +1,122 @@
+# utils/query_budget.py
+
+import os
+import traceback
+from collections import namedtuple
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+QueryBudget = namedtuple("QueryBudget", ["max_queries", "max_duplicates"])
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries, max_duplicates=0):
+    """
+    Declare how many queries a view may issue per request, and how many of
+    them may repeat an earlier statement. Works on function views and on
+    view classes; QUERY_BUDGETS maps URL names to budgets and wins over it.
+    """
+    def decorator(view):
+        view.query_budget = QueryBudget(max_queries, max_duplicates)
+        return view
+    return decorator
+
+
+def budget_for(match):
+    """
+    The budget for a resolved URL, or None when nothing declares one.
+    """
+    if match.view_name in settings.QUERY_BUDGETS:
+        return QueryBudget(*settings.QUERY_BUDGETS[match.view_name])
+    view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    for owner in (match.func, view_class):
+        budget = getattr(owner, "query_budget", None)
+        if budget is not None:
+            return budget
+    return None
+
+
+def project_stack(limit=10):
+    """
+    The project frames that issued the current query, innermost last,
+    without the execute wrappers below Django's cursor.
+    """
+    apps_dir = os.path.join(str(settings.BASE_DIR), "apps") + os.sep
+    backends_dir = os.path.join("django", "db", "backends") + os.sep
+    stack = traceback.extract_stack()
+    for i, frame in enumerate(stack):
+        if backends_dir in frame.filename:
+            stack = stack[:i]
+            break
+    frames = [frame for frame in stack if frame.filename.startswith(apps_dir)]
+    return "".join(traceback.format_list(frames[-limit:]))
+
+
+class QueryRecorder:
+    """
+    Records every query run on any connection inside the block, with the
+    project frames that issued it.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self.record))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def record(self, execute, sql, params, many, context):
+        self.queries.append({
+            "alias": context["connection"].alias,
+            "sql": sql,
+            "stack": project_stack(),
+        })
+        return execute(sql, params, many, context)
+
+    def duplicates(self):
+        """
+        Statements run more than once, as {(alias, sql): [entries]}. The SQL
+        still has its placeholders, so an N+1 loop shows up here however
+        its parameters differ.
+        """
+        groups = {}
+        for entry in self.queries:
+            groups.setdefault((entry["alias"], entry["sql"]), []).append(entry)
+        return {key: entries for key, entries in groups.items() if len(entries) > 1}
+
+    def duplicate_count(self):
+        return sum(len(entries) - 1 for entries in self.duplicates().values())
+
+
+def check_budget(name, budget, recorder):
+    """
+    Raise QueryBudgetExceeded, with every query and the stack behind each
+    repeated one, when `recorder` went over `budget`.
+    """
+    count, duplicates = len(recorder.queries), recorder.duplicate_count()
+    if count <= budget.max_queries and duplicates <= budget.max_duplicates:
+        return
+
+    lines = [
+        f"{name}: {count} queries (budget {budget.max_queries}), "
+        f"{duplicates} duplicates (budget {budget.max_duplicates}).",
+        "",
+    ]
+    lines += [f"{i}. [{entry['alias']}] {entry['sql']}" for i, entry in enumerate(recorder.queries, 1)]
+    for (alias, sql), entries in recorder.duplicates().items():
+        lines += ["", f"Run {len(entries)} times on {alias}: {sql}"]
+        for i, entry in enumerate(entries, 1):
+            lines += [f"  Call {i}:", entry["stack"].rstrip() or "  (no project frames)"]
+    raise QueryBudgetExceeded("\n".join(lines))
@@ -0,0 +1,167 @@
+# utils/slow_queries.py
+
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+import traceback
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:''|[^'])*'")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+EXPLAINABLE = ("select", "with", "update", "delete", "insert")
+
+_buffer = deque(maxlen=1000)
+_local = threading.local()
+
+
+def normalize_sql(sql):
+    """
+    The query with literals and placeholders replaced by `?` and IN lists
+    collapsed, so calls that differ only in values share a fingerprint.
+    """
+    sql = STRING_LITERAL.sub("?", sql).replace("%s", "?")
+    sql = NUMBER.sub("?", sql)
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def params_fingerprint(params):
+    # Values are never stored; the hash shows whether calls repeat them.
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:12] if params else ""
+
+
+def call_site(limit=8):
+    """
+    The project-code frames that led to the query, innermost last.
+    """
+    apps_dir = os.path.join(str(settings.BASE_DIR), "apps") + os.sep
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(apps_dir) and not frame.filename.endswith(os.path.join("utils", "slow_queries.py"))
+    ]
+    return "".join(traceback.format_list(frames[-limit:]))
+
+
+def capture_slow_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold and duration * 1000 >= threshold and not getattr(_local, "flushing", False):
+            _buffer.append({
+                "alias": context["connection"].alias,
+                "sql": sql,
+                "params": None if many else params,
+                "duration_ms": duration * 1000,
+                "stack": call_site(),
+                "seen_at": timezone.now(),
+            })
+
+
+def install_slow_query_capture(sender, connection, **kwargs):
+    if settings.SLOW_QUERY_THRESHOLD_MS and capture_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_slow_query)
+
+
+connection_created.connect(install_slow_query_capture, dispatch_uid="apps.utils.slow_queries.capture")
+
+
+def explain(alias, sql, params):
+    """
+    The plan for a captured query, without running it: EXPLAIN (ANALYZE
+    false) on PostgreSQL, EXPLAIN QUERY PLAN on SQLite.
+    """
+    if not sql.lstrip().lower().startswith(EXPLAINABLE):
+        return ""
+    connection = connections[alias]
+    options = {"analyze": False} if connection.vendor == "postgresql" else {}
+    prefix = connection.ops.explain_query_prefix(**options)
+    # In its own savepoint: a failed EXPLAIN must not abort a transaction.
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def flush_slow_queries():
+    """
+    Write the queries captured in this process since the last flush into
+    SlowQuery, one row per fingerprint. Runs after each request and job,
+    outside the work it measured, so a rollback there cannot lose them.
+    A failed write is logged and the batch dropped rather than raised into
+    the response or the worker.
+    """
+    if not _buffer or getattr(_local, "flushing", False):
+        return 0
+    from apps.system_setting.models import SlowQuery
+
+    captured = []
+    while _buffer:
+        try:
+            captured.append(_buffer.popleft())
+        except IndexError:
+            break
+
+    _local.flushing = True
+    try:
+        queries = SlowQuery.objects.using(DEFAULT_DB_ALIAS)
+        for entry in captured:
+            normalized = normalize_sql(entry["sql"])
+            key = fingerprint(normalized)
+            query, created = queries.get_or_create(fingerprint=key, defaults={
+                "normalized_sql": normalized,
+                "alias": entry["alias"],
+                "first_seen": entry["seen_at"],
+            })
+            queries.filter(pk=query.pk).update(
+                calls=F("calls") + 1,
+                total_ms=F("total_ms") + entry["duration_ms"],
+                max_ms=Greatest("max_ms", entry["duration_ms"]),
+                last_ms=entry["duration_ms"],
+                example_sql=entry["sql"][:10000],
+                params_fingerprint=params_fingerprint(entry["params"]),
+                call_site=entry["stack"],
+                last_seen=entry["seen_at"],
+            )
+            if created or random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+                try:
+                    plan = explain(entry["alias"], entry["sql"], entry["params"])
+                except Exception as e:
+                    plan = f"EXPLAIN failed: {e}"
+                if plan:
+                    queries.filter(pk=query.pk).update(explain=plan, explained_at=timezone.now())
+    except Exception:
+        logger.warning("Could not record %d slow queries", len(captured), exc_info=True)
+        return 0
+    finally:
+        _local.flushing = False
+    return len(captured)
+
+
+def flush_after_request(sender, **kwargs):
+    flush_slow_queries()
+
+
+request_finished.connect(flush_after_request, dispatch_uid="apps.utils.slow_queries.flush")
@@ -0,0 +1,90 @@
+# utils/storage.py
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+
+
+CONTENT_ADDRESSED_NAME = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$')
+
+
+def is_content_addressed(name):
+    return bool(name and CONTENT_ADDRESSED_NAME.search(name))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names files by the SHA-256 of their content.
+
+    `avatars/me.jpg` is stored as `avatars/ab/cd/abcd…ef.jpg`, so identical
+    uploads share one file, each directory stays small, and a URL never
+    changes meaning (safe to cache forever).
+    """
+
+    def hashed_name(self, name, digest):
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def file_digest(self, content):
+        sha = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha.update(chunk.encode() if isinstance(chunk, str) else chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return sha.hexdigest()
+
+    def is_immutable(self, name):
+        return is_content_addressed(name)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        validate_file_name(name, allow_relative_path=True)
+        name = self.hashed_name(name, self.file_digest(content))
+        validate_file_name(name, allow_relative_path=True)
+        # The name is fixed by the content, so unlike get_available_name
+        # there is nothing shorter to fall back to.
+        if max_length is not None and len(name) > max_length:
+            raise SuspiciousFileOperation(
+                'Storage can not find an available filename for "%s". '
+                'Please make sure that the corresponding file field '
+                'allows sufficient "max_length".' % name
+            )
+
+        # Identical bytes are already stored under this name.
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file and rename, so concurrent uploads of the same
+        # content never expose a half-written file.
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    temp_file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return name
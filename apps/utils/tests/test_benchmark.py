@@ -0,0 +1,42 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.utils.benchmark import Result, compare
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.path = os.path.join(self.root, "baseline.json")
+
+    def test_compare_flags_slowdowns_beyond_tolerance(self):
+        baseline = {"a": Result(1.0, 1.0, 1.0, 0, 7, 1), "b": Result(1.0, 1.0, 1.0, 0, 7, 1)}
+        results = {"a": Result(1.1, 1.1, 1.1, 0, 7, 1), "b": Result(1.2, 1.2, 1.2, 0, 7, 1), "new": Result(1.0, 1.0, 1.0, 0, 7, 1)}
+
+        rows = compare(results, baseline, tolerance=0.15)
+
+        self.assertEqual([(name, regressed) for name, _, _, _, regressed in rows], [("a", False), ("b", True)])
+
+    def test_save_and_compare_baseline(self):
+        call_command("benchmark", "envelope", "exception_handler", rounds=2, min_time=0, save=self.path, stdout=StringIO())
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual(set(data["benchmarks"]), {
+            "envelope.success", "envelope.error",
+            "exception_handler.validation", "exception_handler.not_authenticated", "exception_handler.unhandled",
+        })
+
+        data["benchmarks"]["envelope.success"]["median"] = 1e-9
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "envelope.success"):
+            call_command("benchmark", "envelope", rounds=2, min_time=0, compare=self.path, stdout=out)
+        self.assertIn("REGRESSED", out.getvalue())
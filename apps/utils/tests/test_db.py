@@ -0,0 +1,160 @@
+from django.db import OperationalError, connection
+from django.db.backends.signals import connection_created
+from django.urls import resolve, reverse
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from apps.user.models import User
+from apps.utils.custom_exception import custom_exception_handler
+from apps.utils.db import PrimaryReplicaRouter, apply_statement_timeout, connection_stats, install_statement_timeout, request_budget, statement_timeout, use_primary
+from apps.utils.middleware import ReplicaStickinessMiddleware, StatementTimeoutMiddleware
+
+
+class DatabaseStatsTests(APITestCase):
+    def test_counts_new_connections_for_admins_only(self):
+        before = connection_stats.created[connection.alias]
+        connection_created.send(sender=connection.__class__, connection=connection)
+
+        user = User.objects.create_user(email="ops@example.com", password="password123", term_and_condition_accepted=True)
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(reverse("db_stats")).status_code, 403)
+
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+        user.refresh_from_db()
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse("db_stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["default"]["connections_created"], before + 1)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_PRIMARY_STICKY_SECONDS=30)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def serve(self, view, cookies=None):
+        request = self.factory.get("/api/get-profile/")
+        request.COOKIES.update(cookies or {})
+        return ReplicaStickinessMiddleware(view)(request)
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(User), "replica")
+        self.assertEqual(self.router.db_for_write(User), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "user"))
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_writer_reads_from_primary_for_the_sticky_window(self):
+        reads = []
+
+        def write_then_read(request):
+            reads.append(self.router.db_for_read(User))
+            self.router.db_for_write(User)
+            reads.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        response = self.serve(write_then_read)
+        self.assertEqual(reads, ["replica", "default"])
+        cookie = response.cookies["use_primary"]
+        self.assertEqual(cookie["max-age"], 30)
+
+        def read(request):
+            reads.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        self.serve(read, {"use_primary": cookie.value})
+        self.serve(read, {"use_primary": "1"})  # unsigned
+        self.assertEqual(reads[2:], ["default", "replica"])
+        self.assertNotIn("use_primary", self.serve(read).cookies)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+        self.cursor = self
+
+    def execute(self, sql):
+        self.executed.append(sql)
+
+
+class FakeConnection:
+    vendor = "postgresql"
+    in_atomic_block = False
+
+    def __init__(self):
+        self.execute_wrappers = []
+
+
+@override_settings(
+    DATABASE_STATEMENT_TIMEOUT_API=2000,
+    DATABASE_STATEMENT_TIMEOUT_ADMIN=20000,
+    DATABASE_STATEMENT_TIMEOUTS={"about_system": 500},
+)
+class StatementTimeoutTests(SimpleTestCase):
+    def budget(self, path, view_func):
+        request = RequestFactory().get(path)
+        request.resolver_match = resolve(path)
+        return StatementTimeoutMiddleware(lambda request: None).budget_for(request, view_func)
+
+    def test_budget_precedence(self):
+        @statement_timeout(100)
+        def quick(request):
+            pass
+
+        def plain(request):
+            pass
+
+        self.assertEqual(self.budget("/api/about-system/", plain), 500)
+        self.assertEqual(self.budget("/api/get-profile/", quick), 100)
+        self.assertEqual(self.budget("/api/get-profile/", plain), 2000)
+        self.assertEqual(self.budget("/admin/", plain), 20000)
+
+    def test_set_is_sent_only_when_the_budget_changes(self):
+        connection, cursor = FakeConnection(), FakeCursor()
+        context = {"connection": connection, "cursor": cursor}
+
+        def execute(sql, params, many, context):
+            cursor.executed.append(sql)
+
+        for milliseconds in (2000, 2000, 0):
+            with request_budget(milliseconds):
+                apply_statement_timeout(execute, "SELECT 1", None, False, context)
+        apply_statement_timeout(execute, "SELECT 1", None, False, context)
+
+        self.assertEqual(cursor.executed, [
+            "SET statement_timeout TO 2000", "SELECT 1", "SELECT 1",
+            "SET statement_timeout TO 0", "SELECT 1",
+            "SET statement_timeout TO DEFAULT", "SELECT 1",
+        ])
+
+    def test_set_is_repeated_after_each_checkout(self):
+        connection, cursor = FakeConnection(), FakeCursor()
+        context = {"connection": connection, "cursor": cursor}
+
+        def execute(sql, params, many, context):
+            cursor.executed.append(sql)
+
+        with request_budget(2000):
+            for _ in range(2):
+                # The pool may hand back a connection another user SET.
+                install_statement_timeout(None, connection)
+                apply_statement_timeout(execute, "SELECT 1", None, False, context)
+                apply_statement_timeout(execute, "SELECT 1", None, False, context)
+
+        self.assertEqual(connection.execute_wrappers, [apply_statement_timeout])
+        self.assertEqual(cursor.executed, ["SET statement_timeout TO 2000", "SELECT 1", "SELECT 1"] * 2)
+
+    def test_deadline_errors_become_503(self):
+        class QueryCanceled(Exception):
+            pgcode = "57014"
+
+        exc = OperationalError("canceling statement due to statement timeout")
+        exc.__cause__ = QueryCanceled()
+
+        response = custom_exception_handler(exc, {})
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.data["success"])
+        self.assertIsNone(custom_exception_handler(OperationalError("database is locked"), {}))
@@ -0,0 +1,49 @@
+import os
+
+import requests
+from django.conf import settings
+from django.core.mail import send_mail
+from django.test import SimpleTestCase, override_settings
+
+from apps.utils.fake_services import FakeServices
+from apps.utils.loadtest import SCENARIOS, LoadTest, Recorder, load_collection
+
+
+class LoadTestTests(SimpleTestCase):
+    def test_scenarios_only_use_collection_requests(self):
+        templates = load_collection(os.path.join(settings.BASE_DIR, "starter-kit.postman_collection.json"))
+
+        self.assertEqual(templates["signin"].method, "POST")
+        self.assertEqual(templates["signin"].path, "/signin/")
+        self.assertNotIn("refresh_token", templates["signout"].fields)  # disabled in the collection
+        self.assertEqual(templates["update-avatar"].files, ["avatar"])
+        LoadTest("http://127.0.0.1:1/api", templates, None, SCENARIOS)
+
+    def test_stand_ins(self):
+        with FakeServices() as services:
+            with override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend", EMAIL_HOST="127.0.0.1",
+                                   EMAIL_PORT=services.smtp_port, EMAIL_USE_TLS=False, EMAIL_HOST_USER="", EMAIL_HOST_PASSWORD=""):
+                send_mail("Verification OTP", "Your OTP is 123456. Expire in 3 minutes.", "from@example.com", ["User@Example.com"])
+            self.assertEqual(services.mailbox.wait_for_otp("user@example.com", timeout=5), "123456")
+            with self.assertRaises(TimeoutError):
+                services.mailbox.wait_for_otp("user@example.com", seen=1, timeout=0.1)
+
+            userinfo = services.environ()["GOOGLE_USERINFO_URL"]
+            response = requests.get(userinfo, headers={"Authorization": "Bearer loadtest:g@example.com"}, timeout=5)
+            self.assertEqual(response.json()["email"], "g@example.com")
+            self.assertEqual(requests.get(userinfo, headers={"Authorization": "Bearer real-token"}, timeout=5).status_code, 401)
+
+    def test_summary_percentiles(self):
+        recorder = Recorder()
+        for ms in range(1, 101):
+            recorder.request("signin", 200, ms / 1000)
+        recorder.request("signin", 500, 0.5)
+        recorder.request("verify-otp", "no-mail")
+
+        summary = recorder.summary()
+        signin = summary["endpoints"]["signin"]
+        self.assertEqual((signin["requests"], signin["errors"]), (101, 1))
+        self.assertEqual((round(signin["p50_ms"]), round(signin["p95_ms"]), round(signin["p99_ms"])), (51, 96, 100))
+        self.assertEqual(signin["statuses"], {"200": 100, "500": 1})
+        self.assertEqual(summary["endpoints"]["verify-otp"]["errors"], 1)
+        self.assertEqual(summary["errors"], 2)
@@ -0,0 +1,53 @@
+import hashlib
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from apps.utils.storage import ContentAddressedStorage
+
+
+class ServeMediaTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.name = ContentAddressedStorage(location=self.root).save("avatars/a.png", ContentFile(b"0123456789"))
+        self.url = f"/media/{self.name}"
+
+    def test_content_addressed_file_is_immutable_with_strong_etag(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["ETag"], '"%s"' % hashlib.sha256(b"0123456789").hexdigest())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT="x-accel-redirect")
+    def test_accel_redirect_hands_off_to_proxy(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_path_traversal_is_rejected(self):
+        self.assertEqual(self.client.get("/media/../manage.py").status_code, 404)
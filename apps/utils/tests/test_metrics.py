@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.utils import metrics
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        self.addCleanup(setattr, metrics, "_store", metrics._store)
+        metrics._store = None
+        cache.clear()
+
+    def test_values_are_summed_across_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        registry = metrics.Registry()
+        logins = metrics.Counter("test_logins", "Logins.", ["method"], registry=registry)
+        latency = metrics.Histogram("test_latency_seconds", "Latency.", registry=registry, buckets=(0.1, 1.0))
+
+        with override_settings(METRICS_DIR=directory):
+            logins.labels("password").inc()
+            latency.observe(0.05)
+            ready_read, ready_write = os.pipe()
+            done_read, done_write = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                logins.labels("password").inc(2)
+                latency.observe(0.5)
+                os.write(ready_write, b"1")
+                os.read(done_read, 1)  # stay alive until the parent has scraped
+                os._exit(0)
+            os.read(ready_read, 1)
+            try:
+                text = registry.expose()
+            finally:
+                os.write(done_write, b"1")
+                os.waitpid(pid, 0)
+
+        self.assertIn('test_logins_total{method="password"} 3', text)
+        self.assertIn('test_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('test_latency_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn("test_latency_seconds_count 2", text)
+        self.assertEqual(len(os.listdir(directory)), 2)
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_endpoint_reports_request_metrics_to_token_holders(self):
+        self.client.get(reverse("about_system"))
+        self.client.generic("BREW", reverse("about_system"))
+
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-token")
+        text = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_requests_total{view="about_system",method="GET",status="404"} 1', text)
+        self.assertIn('http_request_duration_seconds_count{view="about_system",method="GET"} 1', text)
+        self.assertIn('http_request_duration_seconds_count{view="about_system",method="other"} 1', text)
+        self.assertNotIn("BREW", text)
+        self.assertIn('cache_lookups_total{cache="about_system",result="miss"} 1', text)
+        self.assertIn("email_queue_depth 0", text)
+
+        # Loopback peers are not trusted; a same-host proxy makes every request one.
+        self.assertEqual(self.client.get(reverse("metrics"), REMOTE_ADDR="127.0.0.1").status_code, 403)
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_endpoint_reports_connection_pool_state(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {"pool_size": 4, "pool_available": 1, "requests_waiting": 2, "requests_wait_ms": 1500}
+
+        with mock.patch.object(connection, "pool", pool, create=True):
+            text = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-token").content.decode()
+
+        self.assertIn('db_pool_connections{alias="default",state="open"} 4', text)
+        self.assertIn('db_pool_connections{alias="default",state="idle"} 1', text)
+        self.assertIn('db_pool_requests_waiting{alias="default"} 2', text)
+        self.assertIn('db_pool_wait_seconds{alias="default"} 1.5', text)
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.system_setting.models import AboutSystem, ProfilerSetting, RequestProfile
+from apps.user.models import User
+from apps.utils.middleware import ProfilerMiddleware
+from apps.utils.profiler import make_profile_token
+
+
+class ProfilerTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        override = override_settings(PROFILER_DIR=directory, PROFILER_MAX_PROFILES=2, PROFILER_SETTING_TTL=0)
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_signed_header_stores_a_browsable_profile(self):
+        self.client.get(reverse("about_system"), HTTP_X_PROFILE_TOKEN="forged")
+        self.client.get(reverse("about_system"), HTTP_X_PROFILE_TOKEN=make_profile_token("/admin/"))
+        self.assertFalse(RequestProfile.objects.exists())
+
+        response = self.client.get(reverse("about_system"), HTTP_X_PROFILE_TOKEN=make_profile_token("/api/"))
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual((profile.view_name, profile.trigger, profile.status_code), ("about_system", "header", 404))
+
+        AboutSystem.objects.create(name="Kit", title="Kit", email="kit@example.com", copyright="Kit", description="Kit")
+        admin_user = User.objects.create_superuser(email="admin@example.com", password="password123", term_and_condition_accepted=True)
+        self.client.force_login(admin_user)
+        download = self.client.get(reverse("admin:system_setting_requestprofile_download", args=[profile.pk]))
+        self.assertEqual(b"".join(download.streaming_content), profile.file.open("rb").read())
+        self.assertIn('attachment; filename="profile-', download["Content-Disposition"])
+        page = self.client.get(reverse("admin:system_setting_requestprofile_change", args=[profile.pk]))
+        self.assertContains(page, "function calls")
+
+    def test_admin_sampling_keeps_newest_profiles(self):
+        ProfilerSetting.objects.create(enabled=True, sample_percent=100, path_prefix="/api/about-system/")
+
+        for _ in range(3):
+            self.client.get(reverse("about_system"))
+        self.client.get(reverse("get-profile"))
+
+        profiles = list(RequestProfile.objects.all())
+        self.assertEqual([p.trigger for p in profiles], ["sampled", "sampled"])
+        self.assertEqual(sorted(os.listdir(os.path.dirname(profiles[0].file.path))), sorted(os.path.basename(p.file.name) for p in profiles))
+
+    def test_overlapping_profiled_requests_are_served(self):
+        factory = RequestFactory()
+        token = make_profile_token("/api/")
+        inner = []
+
+        def view(request):
+            if request.path == "/api/outer/":
+                # A second thread is served while this request is profiled.
+                thread = threading.Thread(target=lambda: inner.append(middleware(factory.get("/api/inner/", HTTP_X_PROFILE_TOKEN=token))))
+                thread.start()
+                thread.join()
+            return HttpResponse("ok")
+
+        middleware = ProfilerMiddleware(view)
+        outer = middleware(factory.get("/api/outer/", HTTP_X_PROFILE_TOKEN=token))
+
+        self.assertEqual((outer.status_code, inner[0].status_code), (200, 200))
+        self.assertTrue(RequestProfile.objects.filter(pk=outer["X-Profile-Id"]).exists())
+        self.assertFalse(inner[0].has_header("X-Profile-Id"))
+        self.assertEqual(RequestProfile.objects.count(), 1)
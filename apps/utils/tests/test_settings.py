@@ -0,0 +1,39 @@
+import json
+import os
+from importlib import import_module, reload
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class SettingsProfileTests(SimpleTestCase):
+    def test_prod_profile_excludes_dev_tooling(self):
+        prod = import_module("project.settings.prod")
+        dev = import_module("project.settings.dev")
+
+        for app in ["debug_toolbar", "import_export", "unfold.contrib.guardian", "unfold.contrib.simple_history"]:
+            self.assertNotIn(app, prod.INSTALLED_APPS)
+            self.assertIn(app, dev.INSTALLED_APPS)
+        self.assertNotIn("debug_toolbar.middleware.DebugToolbarMiddleware", prod.MIDDLEWARE)
+        self.assertFalse(prod.DEBUG)
+        self.assertLess(dev.INSTALLED_APPS.index("unfold.contrib.filters"), dev.INSTALLED_APPS.index("django.contrib.admin"))
+
+    @mock.patch.dict(os.environ, {"DEBUG": "True"})
+    def test_prod_profile_ignores_debug_in_environment(self):
+        prod = reload(import_module("project.settings.prod"))
+
+        self.assertFalse(prod.DEBUG)
+        self.assertEqual(prod.DATABASES["default"]["ENGINE"], "django.db.backends.postgresql")
+        self.assertTrue(prod.SESSION_COOKIE_SECURE)
+        self.assertTrue(prod.CSRF_COOKIE_SECURE)
+
+    def test_app_footprint_reports_each_app(self):
+        out = StringIO()
+        call_command("app_footprint", json=True, stdout=out)
+
+        report = json.loads(out.getvalue())
+        apps = {row["app"] for row in report["rows"]}
+        self.assertIn("apps.user", apps)
+        self.assertIn("ROOT_URLCONF", apps)
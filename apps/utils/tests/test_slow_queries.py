@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from apps.system_setting.models import SlowQuery
+from apps.user.models import User
+from apps.utils import slow_queries
+
+
+class SlowQueryTests(TestCase):
+    def test_normalized_sql_ignores_values(self):
+        self.assertEqual(
+            slow_queries.normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s)\n LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=1e-6, SLOW_QUERY_EXPLAIN_SAMPLE_RATE=0)
+    def test_slow_queries_are_aggregated_with_a_plan_and_call_site(self):
+        slow_queries._buffer.clear()
+        list(User.objects.filter(email__in=["a@example.com", "b@example.com"]))
+        list(User.objects.filter(email__in=["c@example.com"]))
+        slow_queries.flush_slow_queries()
+
+        query = SlowQuery.objects.get(normalized_sql__contains='"email" IN (...)')
+        self.assertEqual(query.calls, 2)
+        self.assertGreater(query.total_ms, 0)
+        self.assertIn("user_user", query.explain)
+        self.assertIn("test_slow_queries_are_aggregated", query.call_site)
+        self.assertFalse(SlowQuery.objects.filter(normalized_sql__contains="system_setting_slowquery").exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=1e-6)
+    def test_failed_flush_is_logged_not_raised(self):
+        slow_queries._buffer.clear()
+        list(User.objects.all())
+        with mock.patch.object(SlowQuery.objects, "using", side_effect=OperationalError("database is locked")), \
+                self.assertLogs("apps.utils.slow_queries", "WARNING"):
+            slow_queries.flush_after_request(sender=None)
+        self.assertFalse(slow_queries._buffer)
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.system_setting.models import AboutSystem, SocialMedia
+from apps.user.models import User
+from apps.utils.storage import ContentAddressedStorage, is_content_addressed
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.root)
+
+    def test_names_are_sharded_by_content_hash(self):
+        digest = hashlib.sha256(b"hello").hexdigest()
+        name = self.storage.save("avatars/Me.JPG", ContentFile(b"hello"))
+
+        self.assertEqual(name, f"avatars/{digest[:2]}/{digest[2:4]}/{digest}.jpg")
+        self.assertTrue(is_content_addressed(name))
+        with self.storage.open(name) as f:
+            self.assertEqual(f.read(), b"hello")
+
+    def test_identical_uploads_are_deduplicated(self):
+        first = self.storage.save("avatars/a.png", ContentFile(b"same"))
+        second = self.storage.save("avatars/b.png", ContentFile(b"same"))
+        other = self.storage.save("avatars/c.png", ContentFile(b"different"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        shard = os.path.dirname(self.storage.path(first))
+        self.assertEqual(os.listdir(shard), [os.path.basename(first)])
+
+    def test_max_length_is_enforced_at_the_boundary(self):
+        name = self.storage.hashed_name("about_system/social_media/x.jpeg", hashlib.sha256(b"icon").hexdigest())
+        self.assertEqual(len(name), 101)
+
+        with self.assertRaises(SuspiciousFileOperation):
+            self.storage.save("about_system/social_media/x.jpeg", ContentFile(b"icon"), max_length=100)
+        self.assertEqual(self.storage.save("about_system/social_media/x.jpeg", ContentFile(b"icon"), max_length=101), name)
+
+    def test_media_fields_fit_hashed_names(self):
+        for model, field_name in [(User, "avatar"), (AboutSystem, "logo"), (AboutSystem, "favicon"), (SocialMedia, "icon")]:
+            field = model._meta.get_field(field_name)
+            name = self.storage.hashed_name(f"{field.upload_to}x.jpeg", "0" * 64)
+            self.assertLessEqual(len(name), field.max_length, f"{model.__name__}.{field_name}")
+
+
+class MigrateMediaCommandTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_moves_flat_files_into_hashed_names(self):
+        FileSystemStorage(location=self.root).save("avatars/1.jpg", ContentFile(b"legacy"))
+        users = [
+            User.objects.create_user(email=f"u{i}@example.com", password="x", term_and_condition_accepted=True)
+            for i in range(3)
+        ]
+        User.objects.filter(pk__in=[u.pk for u in users]).update(avatar="avatars/1.jpg")
+
+        call_command("migrate_media", batch_size=2, stdout=open(os.devnull, "w"))
+
+        names = set(User.objects.filter(pk__in=[u.pk for u in users]).values_list("avatar", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(is_content_addressed(names.pop()))
@@ -0,0 +1,53 @@
+from django.urls import reverse
+from django.http import HttpResponse
+from django.utils.functional import SimpleLazyObject
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APITestCase
+
+from apps.user.models import User
+from apps.utils.middleware import ServerTimingMiddleware
+from apps.utils.timing import span, timing_request
+
+
+@override_settings(SERVER_TIMING_SECRET="timing-secret")
+class ServerTimingTests(APITestCase):
+    def test_breakdown_needs_secret_header_or_staff(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("about_system")))
+
+        response = self.client.get(reverse("about_system"), HTTP_X_SERVER_TIMING_SECRET="timing-secret")
+        self.assertRegex(response["Server-Timing"], r"total;dur=[\d.]+$")
+
+        user = User.objects.create_user(
+            email="staff@example.com", password="password123", term_and_condition_accepted=True, is_staff=True,
+        )
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse("get-profile"))
+        self.assertIn('db;dur=', response["Server-Timing"])
+
+    def test_unresolved_session_user_is_not_loaded(self):
+        def load_user():
+            raise AssertionError("user loaded just to decide on the header")
+
+        request = RequestFactory().get("/media/avatars/a.webp")
+        request.user = SimpleLazyObject(load_user)
+        middleware = ServerTimingMiddleware(lambda request: HttpResponse("ok"))
+
+        self.assertNotIn("Server-Timing", middleware(request))
+
+        staff = User(email="staff@example.com", is_staff=True)
+        request.user = SimpleLazyObject(lambda: staff)
+        request._cached_user = staff
+        self.assertIn("Server-Timing", middleware(request))
+
+    def test_spans_accumulate_per_request_only(self):
+        with span("email"):
+            pass  # no request: nothing to record
+
+        with timing_request("GET", "/api/x/") as record:
+            for _ in range(2):
+                with span("password"):
+                    pass
+        record.finish(200)
+
+        self.assertEqual(record.as_dict()["spans"]["password"]["count"], 2)
+        self.assertNotIn("email", record.spans)
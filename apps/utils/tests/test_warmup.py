@@ -0,0 +1,36 @@
+import gc
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from apps.utils import warmup
+
+
+class WarmupTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(gc.unfreeze)
+        self.addCleanup(setattr, warmup, "_warmed", warmup._warmed)
+        warmup._warmed = False
+
+    def test_warm_up_freezes_loaded_objects_once(self):
+        warmup.warm_up()
+        frozen = gc.get_freeze_count()
+        warmup.warm_up()
+
+        self.assertGreater(frozen, 0)
+        self.assertEqual(gc.get_freeze_count(), frozen)
+
+    def test_lifespan_startup_warms_up(self):
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async_to_sync(warmup.LifespanMiddleware(None))({"type": "lifespan"}, receive, send)
+
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertTrue(warmup._warmed)
@@ -0,0 +1,114 @@
+# utils/timing.py
+
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.db.backends.signals import connection_created
+
+
+logger = logging.getLogger(__name__)
+
+_current_record = contextvars.ContextVar("timing_record", default=None)
+
+
+class TimingRecord:
+    """
+    Where one request's time went: total seconds and call count per span
+    name, plus the request's overall duration once it is finished.
+    """
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.duration = None
+        self.status_code = None
+        self.spans = {}
+
+    def add(self, name, seconds):
+        entry = self.spans.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def finish(self, status_code):
+        self.duration = time.perf_counter() - self.started
+        self.status_code = status_code
+
+    def as_dict(self):
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status_code,
+            "duration_ms": round(self.duration * 1000, 2),
+            "spans": {
+                name: {"duration_ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in self.spans.items()
+            },
+        }
+
+    def header(self):
+        """
+        The record as a Server-Timing header value, e.g.
+        `db;dur=4.1;desc="3 calls", total;dur=12.9`.
+        """
+        metrics = [
+            f'{name};dur={seconds * 1000:.1f};desc="{count} calls"'
+            for name, (seconds, count) in self.spans.items()
+        ]
+        metrics.append(f"total;dur={self.duration * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+@contextmanager
+def timing_request(method, path):
+    record = TimingRecord(method, path)
+    token = _current_record.set(record)
+    try:
+        yield record
+    finally:
+        _current_record.reset(token)
+
+
+@contextmanager
+def span(name):
+    """
+    Time the block into the current request's record. Outside a request
+    (workers, management commands) it does nothing.
+    """
+    record = _current_record.get()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.add(name, time.perf_counter() - start)
+
+
+def time_query(execute, sql, params, many, context):
+    record = _current_record.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.add("db", time.perf_counter() - start)
+
+
+def install_query_timing(sender, connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+connection_created.connect(install_query_timing, dispatch_uid="apps.utils.timing.query_timing")
+
+
+def maybe_log_sample(record, rate):
+    if rate and random.random() < rate:
+        logger.info("request timing %s", json.dumps(record.as_dict()))
@@ -13,4 +13,12 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from apps.utils.warmup import LifespanMiddleware, warm_up  # noqa: E402
+
+if settings.WARMUP_ON_IMPORT:
+    warm_up()
+
+application = LifespanMiddleware(django_application)
@@ -0,0 +1,19 @@
+"""
+Settings profiles:
+
+    base      everything production and development share
+    dev       base + debug toolbar, query counting, optional Unfold apps
+              and SQLite
+    prod      base + PostgreSQL, CORS and secure cookies
+    bench     prod on a local SQLite database, for benchmarks
+    loadtest  bench with mail and Google served by local stand-ins
+
+Select one with DJANGO_SETTINGS_MODULE=project.settings.<profile>. The
+default, project.settings, picks dev or prod from DEBUG.
+"""
+from decouple import config
+
+if config('DEBUG', default=False, cast=bool):
+    from .dev import *  # noqa: F401,F403
+else:
+    from .prod import *  # noqa: F401,F403
@@ -0,0 +1,373 @@
+import datetime
+import os
+from pathlib import Path
+from decouple import config
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+SECRET_KEY = config('SECRET_KEY', default="django-insecure-_(4sk(m(!$$xxvz)-7!b7ibkz&2sotl0#=hv8+e*_^__qzgs18")
+
+# DEBUG, ALLOWED_HOSTS, CORS, cookie security and DATABASES are set by the
+# profile (dev.py or prod.py), never from the environment here.
+DEBUG = False
+
+
+
+# Application definition
+
+# Only what every profile uses. Development tooling and the optional Unfold
+# integrations are added in dev.py; move an app here once production code
+# depends on it.
+INSTALLED_APPS = [
+    # unfold packages
+    "unfold",
+
+    # django packages
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+
+    # external packages
+    "rest_framework",
+    "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
+    "corsheaders",
+    # "channels",
+
+    # internal apps
+    "apps.seeders",
+    "apps.user",
+    "apps.system_setting",
+    "apps.cms",
+    "apps.jobs",
+    "apps.dashboard",
+    "apps.utils",
+
+]
+
+MIDDLEWARE = [
+    "apps.utils.middleware.PathScopedMiddleware",  # routes API_PATH_PREFIXES to API_MIDDLEWARE
+    "apps.utils.middleware.ServerTimingMiddleware",
+    "apps.utils.middleware.ReplicaStickinessMiddleware",
+    "apps.utils.middleware.StatementTimeoutMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.user.middleware.ClientTypeMiddleware",  # Hybrid auth middleware
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.utils.middleware.ProfilerMiddleware",
+]
+
+# Stateless JWT API requests skip the session/CSRF/messages/debug middleware
+# the admin needs (see apps/utils/middleware.py).
+API_PATH_PREFIXES = ["/api/"]
+API_MIDDLEWARE = [
+    "apps.utils.middleware.ServerTimingMiddleware",
+    "apps.utils.middleware.ReplicaStickinessMiddleware",
+    "apps.utils.middleware.StatementTimeoutMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "apps.user.middleware.ClientTypeMiddleware",
+    "apps.utils.middleware.ProfilerMiddleware",
+]
+
+ROOT_URLCONF = "project.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [BASE_DIR / "templates"],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+# ASGI_APPLICATION = 'project.asgi.application'
+WSGI_APPLICATION = "project.wsgi.application"
+
+# Worker warm-up (apps/utils/warmup.py). project.wsgi/asgi run it at import,
+# so `gunicorn --preload` warms once in the master and workers share it.
+WARMUP_ON_IMPORT = config('WARMUP_ON_IMPORT', default=True, cast=bool)
+WARMUP_TEMPLATES = [
+    "admin/login.html",
+    "admin/change_list.html",
+    "admin/change_form.html",
+]
+
+
+# Channels configuration
+
+# CHANNEL_LAYERS = {
+#     "default": {
+#         "BACKEND": "channels_redis.core.RedisChannelLayer",
+#         "CONFIG": {
+#             "hosts": [(os.environ.get("REDIS_HOST", "127.0.0.1"), int(os.environ.get("REDIS_PORT", 6379)))],
+#         },
+#     },
+# }
+
+#master user
+
+AUTHENTICATION_BACKENDS = [
+    "apps.user.backends.MasterUserBackend",  
+    "django.contrib.auth.backends.ModelBackend",
+]
+MASTER_USER_EMAIL = "rafi.cse.ahmed@gmail.com"
+
+
+
+# Safe reads go to a random replica, writes to the primary. A client that
+# wrote keeps reading from the primary for DATABASE_PRIMARY_STICKY_SECONDS
+# (tracked in a signed cookie) so it sees its own changes despite replica lag.
+# Each profile lists its replicas in DATABASE_REPLICAS.
+DATABASE_ROUTERS = ["apps.utils.db.PrimaryReplicaRouter"]
+DATABASE_PRIMARY_STICKY_SECONDS = config('DATABASE_PRIMARY_STICKY_SECONDS', default=15, cast=int)
+DATABASE_PRIMARY_STICKY_COOKIE = "use_primary"
+
+# Database time budget per request in ms, enforced on PostgreSQL as
+# statement_timeout (0 = no limit). Views can set `statement_timeout`
+# (or use apps.utils.db.statement_timeout); DATABASE_STATEMENT_TIMEOUTS
+# maps URL names to budgets and wins over both.
+DATABASE_STATEMENT_TIMEOUT_API = config('DATABASE_STATEMENT_TIMEOUT_API', default=5000, cast=int)
+DATABASE_STATEMENT_TIMEOUT_ADMIN = config('DATABASE_STATEMENT_TIMEOUT_ADMIN', default=30000, cast=int)
+DATABASE_STATEMENT_TIMEOUTS = {}
+
+# Per-request timing breakdown (apps/utils/timing.py). Staff, or requests
+# sending SERVER_TIMING_SECRET in the SERVER_TIMING_HEADER header, get it
+# back as a Server-Timing header; a SERVER_TIMING_SAMPLE_RATE share of all
+# requests is logged to apps.utils.timing.
+SERVER_TIMING_SECRET = config('SERVER_TIMING_SECRET', default='')
+SERVER_TIMING_HEADER = "X-Server-Timing-Secret"
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=0.0, cast=float)
+
+# Prometheus metrics at /internal/metrics (apps/utils/metrics.py). Workers
+# sharing METRICS_DIR are reported together; without it each process only
+# reports itself. Scrapers authenticate with METRICS_TOKEN as a bearer
+# token; with it unset only staff sessions can read the endpoint.
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# On-demand request profiling (apps/utils/profiler.py): requests sending a
+# token from `manage.py profile_token` in PROFILER_HEADER, or sampled via
+# the admin's Profiler setting. Profiles are kept on disk in PROFILER_DIR,
+# at most PROFILER_MAX_PROFILES of them and none older than
+# PROFILER_RETENTION_DAYS.
+PROFILER_HEADER = "X-Profile-Token"
+PROFILER_TOKEN_MAX_AGE = config('PROFILER_TOKEN_MAX_AGE', default=3600, cast=int)
+PROFILER_SETTING_TTL = 10
+PROFILER_DIR = config('PROFILER_DIR', default=os.path.join(BASE_DIR, "var", "profiles"))
+PROFILER_MAX_PROFILES = config('PROFILER_MAX_PROFILES', default=200, cast=int)
+PROFILER_RETENTION_DAYS = config('PROFILER_RETENTION_DAYS', default=7, cast=int)
+
+# Slow-query log (apps/utils/slow_queries.py): queries at or over the
+# threshold (0 = off) are aggregated by fingerprint in the admin's Slow
+# Queries, with an EXPLAIN plan for new fingerprints and a sampled share
+# of repeats.
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=100, cast=int)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = config('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', default=0.1, cast=float)
+
+# Query budgets checked by apps/system_setting/tests_query_budget.py:
+# (max queries, max duplicate queries) per URL name. Views declare their
+# own with apps.utils.query_budget.query_budget; this covers views from
+# elsewhere (the admin) and overrides.
+QUERY_BUDGETS = {
+    'admin:index': (8, 0),
+}
+
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        # Memory-mapped index built by `manage.py build_password_index`
+        "NAME": "apps.user.password_validation.CompactCommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+COMMON_PASSWORD_INDEX = config('COMMON_PASSWORD_INDEX', default=os.path.join(BASE_DIR, "var", "common-passwords.idx"))
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STATIC_URL = "/static/"
+
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+
+MEDIA_URL = "/media/"
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Media serving (apps/utils/media.py). In production set MEDIA_ACCEL_REDIRECT to
+# "x-accel-redirect" (nginx, internal location at MEDIA_ACCEL_PREFIX) or
+# "x-sendfile" (Apache/lighttpd) so no file bytes pass through Python.
+SERVE_MEDIA = config('SERVE_MEDIA', default=True, cast=bool)
+MEDIA_ACCEL_REDIRECT = config('MEDIA_ACCEL_REDIRECT', default='')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=3600, cast=int)
+
+# Uploaded media is stored under content-hash names (see apps/utils/storage.py).
+STORAGES = {
+    "default": {
+        "BACKEND": config('MEDIA_STORAGE_BACKEND', default='apps.utils.storage.ContentAddressedStorage'),
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Image pipeline: uploads are decoded once and stored as resized variants.
+IMAGE_MAX_PIXELS = config('IMAGE_MAX_PIXELS', default=25_000_000, cast=int)
+AVATAR_VARIANT_SIZES = (48, 128, 512)
+LOGO_VARIANT_SIZES = (64, 256)
+FAVICON_VARIANT_SIZES = (32, 180)
+
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# auth user model
+AUTH_USER_MODEL = "user.User"
+
+
+# Rest framework
+REST_FRAMEWORK = {
+    "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "apps.user.authentication.HybridJWTAuthentication",  # Hybrid auth for Web + Mobile
+    ),
+    "EXCEPTION_HANDLER": "apps.utils.custom_exception.custom_exception_handler",
+}
+
+
+# ============================================
+# JWT Settings (Production-Ready)
+# ============================================
+SIMPLE_JWT = {
+    # Token Lifetimes
+    "ACCESS_TOKEN_LIFETIME": datetime.timedelta(minutes=60),  
+    "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=7),  
+}
+
+# CSRF check for web clients authenticating with the access_token cookie
+# (apps/user/authentication.py). Off by default: /api/ skips
+# CsrfViewMiddleware, so the front-end must obtain and send a CSRF token
+# itself before this can be turned on.
+ENABLE_CSRF_FOR_COOKIES = config('ENABLE_CSRF_FOR_COOKIES', default=False, cast=bool)
+
+
+
+
+# email settings
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = 'smtp.hostinger.com'
+EMAIL_PORT = 587  # Or 465 if using SSL
+EMAIL_USE_TLS = True  # If you use port 587
+
+EMAIL_HOST_USER = 'hello@clever-cv.de'
+EMAIL_HOST_PASSWORD = 'Poseidon2301!'
+DEFAULT_FROM_EMAIL = 'hello@clever-cv.de'
+
+
+
+# social auth settings
+
+GOOGLE_CLIENT_ID = config('GOOGLE_CLIENT_ID')
+GOOGLE_SECRET_KEY = config('GOOGLE_SECRET_KEY')
+GOOGLE_USERINFO_URL = config('GOOGLE_USERINFO_URL', default='https://www.googleapis.com/oauth2/v3/userinfo')
+GOOGLE_JWKS_URL = config('GOOGLE_JWKS_URL', default='https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_JWKS_REFRESH_MARGIN = config('GOOGLE_JWKS_REFRESH_MARGIN', default=300, cast=int)
+SOCIAL_AVATAR_MAX_BYTES = config('SOCIAL_AVATAR_MAX_BYTES', default=5 * 1024 * 1024, cast=int)
+
+
+# outbound http client (apps/utils/http_client.py)
+HTTP_CLIENT_CONNECT_TIMEOUT = config('HTTP_CLIENT_CONNECT_TIMEOUT', default=3.0, cast=float)
+HTTP_CLIENT_READ_TIMEOUT = config('HTTP_CLIENT_READ_TIMEOUT', default=5.0, cast=float)
+HTTP_CLIENT_POOL_MAXSIZE = config('HTTP_CLIENT_POOL_MAXSIZE', default=10, cast=int)
+HTTP_CLIENT_FAILURE_THRESHOLD = config('HTTP_CLIENT_FAILURE_THRESHOLD', default=5, cast=int)
+HTTP_CLIENT_RESET_TIMEOUT = config('HTTP_CLIENT_RESET_TIMEOUT', default=30.0, cast=float)
+
+
+# background jobs (apps/jobs), run with `python manage.py runworker`
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_VISIBILITY_TIMEOUT = config('JOBS_VISIBILITY_TIMEOUT', default=300, cast=int)
+JOBS_RETRY_BASE_DELAY = config('JOBS_RETRY_BASE_DELAY', default=10, cast=int)
+JOBS_RETRY_MAX_DELAY = config('JOBS_RETRY_MAX_DELAY', default=3600, cast=int)
+JOBS_KEEP_SUCCEEDED = config('JOBS_KEEP_SUCCEEDED', default=False, cast=bool)
+
+# periodic tasks (apps/<app>/schedules.py), run with `python manage.py runscheduler`
+# or `runworker --with-scheduler`
+SCHEDULER_TICK = config('SCHEDULER_TICK', default=5.0, cast=float)
+JOBS_FAILED_RETENTION_DAYS = config('JOBS_FAILED_RETENTION_DAYS', default=14, cast=int)
+
+# The scheduler warms shared caches, so use a cross-process backend in
+# production, e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+CACHES = {
+    "default": {
+        "BACKEND": config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        "LOCATION": config('CACHE_LOCATION', default=''),
+    },
+}
+
+
+# unfold settings
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from project import unfold_config
+UNFOLD = unfold_config.get_unfold_settings()
+
+
+
+
+
+# Stripe Settings
+
+STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY')
+STRIPE_PUBLISHABLE_KEY = config('STRIPE_PUBLISHABLE_KEY')
+STRIPE_WEBHOOK_SECRET = config('STRIPE_WEBHOOK_SECRET')
\ No newline at end of file
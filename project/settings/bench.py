@@ -0,0 +1,17 @@
+import os
+
+from .prod import *  # noqa: F401,F403
+from .base import BASE_DIR
+
+
+# Production apps and middleware on a throwaway local database, so
+# benchmarks measure the deployed stack without a PostgreSQL server.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "bench.sqlite3"),
+    }
+}
+DATABASE_REPLICAS = []
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
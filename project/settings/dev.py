@@ -0,0 +1,110 @@
+import os
+
+from decouple import config
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, INSTALLED_APPS, MIDDLEWARE
+
+
+DEBUG = True
+
+
+INSTALLED_APPS = [
+    *INSTALLED_APPS[:1],
+    # optional Unfold integrations, kept available while building the admin
+    "unfold.contrib.filters",
+    "unfold.contrib.forms",
+    "unfold.contrib.inlines",
+    "unfold.contrib.import_export",
+    "unfold.contrib.guardian",
+    "unfold.contrib.simple_history",
+    *INSTALLED_APPS[1:],
+    "debug_toolbar",
+    "import_export",
+]
+
+MIDDLEWARE = [
+    *MIDDLEWARE,
+    "querycount.middleware.QueryCountMiddleware",
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+]
+
+# internal ips for debug toolbar settings
+INTERNAL_IPS = [
+    "127.0.0.1",
+    "localhost",
+]
+
+
+# CORS for local front-ends and tunnels
+ALLOWED_HOSTS = ['*']
+CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_CREDENTIALS = True
+
+CORS_ALLOW_HEADERS = [
+    'accept',
+    'accept-encoding',
+    'authorization',
+    'content-type',
+    'dnt',
+    'origin',
+    'user-agent',
+    'x-csrftoken',
+    'x-requested-with',
+    'x-client-type',
+    'ngrok-skip-browser-warning',
+]
+
+CSRF_TRUSTED_ORIGINS = [
+    'https://localhost',
+    'https://127.0.0.1',
+    'http://127.0.0.1:5173',
+    'http://127.0.0.1:5173',
+    'http://localhost:5173',
+    'https://localhost:5173',
+    'https://*.ngrok-free.app',
+    'https://*.ngrok-free.dev',
+    "http://172.16.200.94:8000",
+    "http://172.16.200.94:9000",
+]
+
+# ============================================
+# Cookie SameSite and Secure Configuration
+# ============================================
+CROSS_ORIGIN_DEVELOPMENT = config('CROSS_ORIGIN_DEVELOPMENT', default=False, cast=bool)
+
+if CROSS_ORIGIN_DEVELOPMENT:
+
+    SESSION_COOKIE_SAMESITE = 'None'
+    CSRF_COOKIE_SAMESITE = 'None'
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+
+else:
+    # SESSION_COOKIE_SAMESITE = 'Lax'
+    # CSRF_COOKIE_SAMESITE = 'Lax'
+    # SESSION_COOKIE_SECURE = True
+    # CSRF_COOKIE_SECURE = True
+
+    SESSION_COOKIE_SAMESITE = 'None'
+    CSRF_COOKIE_SAMESITE = 'None'
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+
+# SQLite
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+    }
+}
+# A second SQLite file as a stand-in replica. Nothing replicates into
+# it: copy db.sqlite3 over to get a "lagging" replica. Under the test
+# runner it mirrors "default".
+if config('DATABASE_SQLITE_REPLICA', default=False, cast=bool):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db-replica.sqlite3"),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
@@ -0,0 +1,26 @@
+import os
+
+from decouple import config
+
+from .bench import *  # noqa: F401,F403
+from .base import BASE_DIR
+
+
+# bench on its own database, with mail and Google pointed at the local
+# stand-ins `manage.py loadtest` starts (apps/utils/fake_services.py).
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "var", "loadtest.sqlite3"),
+        # Concurrent writers wait for the lock instead of failing at once.
+        "OPTIONS": {"timeout": 30},
+    }
+}
+
+EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_HOST = config("LOADTEST_SMTP_HOST", default="127.0.0.1")
+EMAIL_PORT = config("LOADTEST_SMTP_PORT", default=1025, cast=int)
+EMAIL_USE_TLS = False
+EMAIL_HOST_USER = "loadtest@example.invalid"
+EMAIL_HOST_PASSWORD = ""
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
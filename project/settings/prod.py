@@ -0,0 +1,76 @@
+from decouple import Csv, config
+
+from .base import *  # noqa: F401,F403
+
+
+# Everything below is decided by this profile alone; a DEBUG left in the
+# environment does not switch prod to the development database or cookies.
+DEBUG = False
+
+ALLOWED_HOSTS = ['*']
+CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = [
+    'accept',
+    'accept-encoding',
+    'authorization',
+    'content-type',
+    'dnt',
+    'origin',
+    'user-agent',
+    'x-csrftoken',
+    'x-requested-with',
+    'x-client-type',
+    'ngrok-skip-browser-warning',
+]
+CSRF_TRUSTED_ORIGINS = [
+    'https://localhost',
+    'https://127.0.0.1',
+    'http://127.0.0.1:5173',
+    'http://127.0.0.1:5173',
+    'http://localhost:5173',
+    'https://localhost:5173',
+    'https://*.ngrok-free.app',
+    'https://*.ngrok-free.dev',
+    "http://172.16.200.94:8000",
+    "http://172.16.200.94:9000",
+]
+
+# Auth cookies are only ever sent over HTTPS.
+SESSION_COOKIE_SAMESITE = 'None'
+CSRF_COOKIE_SAMESITE = 'None'
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+# PostgreSQL, configured from the environment.
+#
+# Connections are persistent (CONN_MAX_AGE) and checked before reuse.
+# Under ASGI, where each request may run on a different thread, set
+# DATABASE_POOL=True for a psycopg_pool pool per worker instead; that
+# needs `psycopg[pool]` (psycopg 3) and turns CONN_MAX_AGE off.
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+DATABASES = {
+    "default": {
+        "ENGINE": config('DATABASE_ENGINE', default='django.db.backends.postgresql'),
+        "NAME": config('DATABASE_NAME', default='django_db'),
+        "USER": config('DATABASE_USER', default='django_user'),
+        "PASSWORD": config('DATABASE_PASSWORD', default='django_password'),
+        "HOST": config('DATABASE_HOST', default='db'),
+        "PORT": config('DATABASE_PORT', default='5432'),
+        "CONN_MAX_AGE": 0 if DATABASE_POOL else config('DATABASE_CONN_MAX_AGE', default=60, cast=int),
+        "CONN_HEALTH_CHECKS": config('DATABASE_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        "OPTIONS": {
+            "connect_timeout": config('DATABASE_CONNECT_TIMEOUT', default=5, cast=int),
+        },
+    }
+}
+if DATABASE_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+        "max_size": config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+        "timeout": config('DATABASE_POOL_TIMEOUT', default=10.0, cast=float),
+    }
+# Streaming replicas of the primary, same credentials.
+for number, host in enumerate(config('DATABASE_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    DATABASES[f"replica{number}"] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
@@ -5,7 +5,17 @@ from django.utils.translation import gettext_lazy as _
 
 def get_about_system():
     from apps.system_setting.models import AboutSystem
-    return AboutSystem.objects.first()
+    return AboutSystem.get_cached()
+
+def get_logo_url(size):
+    from apps.utils.images import image_variant_url
+    about_system = get_about_system()
+    return image_variant_url(about_system.logo, about_system.logo_variants, size)
+
+def get_favicon_url(size):
+    from apps.utils.images import image_variant_url
+    about_system = get_about_system()
+    return image_variant_url(about_system.favicon, about_system.favicon_variants, size)
 
 def get_unfold_settings():
     return {
@@ -14,16 +24,16 @@ def get_unfold_settings():
         "SITE_SUBHEADER": lambda request: get_about_system().title,
         "SITE_URL": "/",
         "SITE_ICON": {
-            "light": lambda request: get_about_system().logo.url,  # light mode
-            "dark": lambda request: get_about_system().logo.url,  # dark mode
+            "light": lambda request: get_logo_url(64),  # light mode
+            "dark": lambda request: get_logo_url(64),  # dark mode
         },
         "SITE_SYMBOL": "speed",  # symbol from icon set
         "SITE_FAVICONS": [
             {
             "rel": "icon",
             "sizes": "32x32",
-            "type": "image/svg+xml",
-            "href": lambda request: get_about_system().favicon.url,
+            "type": "image/png",
+            "href": lambda request: get_favicon_url(32),
             },
         ],
         "DASHBOARD_CALLBACK": "apps.dashboard.views.dashboard_callback",
@@ -96,9 +106,47 @@ def get_unfold_settings():
                             "link": reverse_lazy(
                                 "admin:system_setting_systemcolor_changelist"
                             ),
+                        },
+                        {
+                            "title": _("Profiler"),
+                            "icon": "speed",
+                            "link": reverse_lazy(
+                                "admin:system_setting_profilersetting_changelist"
+                            ),
+                        },
+                        {
+                            "title": _("Request Profiles"),
+                            "icon": "query_stats",
+                            "link": reverse_lazy(
+                                "admin:system_setting_requestprofile_changelist"
+                            ),
+                        },
+                        {
+                            "title": _("Slow Queries"),
+                            "icon": "hourglass_bottom",
+                            "link": reverse_lazy(
+                                "admin:system_setting_slowquery_changelist"
+                            ),
                         }
                     ],
                 },
+                {
+                    "title": _("Background Jobs"),
+                    "separator": True,
+                    "collapsible": True,
+                    "items": [
+                        {
+                            "title": _("Jobs"),
+                            "icon": "work_history",
+                            "link": reverse_lazy("admin:jobs_job_changelist"),
+                        },
+                        {
+                            "title": _("Scheduled Tasks"),
+                            "icon": "schedule",
+                            "link": reverse_lazy("admin:jobs_scheduledtask_changelist"),
+                        },
+                    ],
+                },
                 {
                     "title": _("Page Management"),
                     "separator": True,
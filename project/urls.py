@@ -17,21 +17,26 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path , include, re_path
 from django.conf.urls.static import static
-from project import settings
-from django.views.static import serve
+from django.conf import settings
+from apps.utils.media import serve_media
+from apps.system_setting.views import metrics_view
 
 
 urlpatterns = [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
     path('api/', include('apps.user.urls')),
     path('api/', include('apps.system_setting.urls')),
     path('api/', include('apps.social_auth.urls')),
+    path('internal/metrics', metrics_view, name='metrics'),
 ]
 
+if settings.SERVE_MEDIA:
+    urlpatterns += [re_path(r'^media/(?P<path>.*)$', serve_media, name='media')]
+
 if settings.DEBUG:
-    import debug_toolbar
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    import debug_toolbar
     urlpatterns += [path("__debug__/", include(debug_toolbar.urls))]
 
 